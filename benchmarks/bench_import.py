@@ -0,0 +1,142 @@
+"""
+Uygulama açılışındaki import süresi raporu (python -X importtime)
+
+Kullanım:
+    python -m benchmarks.bench_import                  # raporu yazdır
+    python -m benchmarks.bench_import --kontrol        # kayıtlı temel ile karşılaştır
+    python -m benchmarks.bench_import --kaydet         # temeli (import_baseline.json) güncelle
+
+main.py'nin modül seviyesindeki import'ları ayrı bir Python sürecinde
+-X importtime ile çalıştırılır ve üst seviye paket başına kümülatif süreler
+toplanır. --kontrol, açılışta import edilmemesi gereken ağır bir paket
+(ACILISTA_YASAK) yüklendiğinde veya toplam süre temelin tolerans kadar
+üzerine çıktığında 1 ile çıkar.
+
+Süreler makineye göre değişir; kesin denetim yasak paket listesidir, toplam
+süre yalnızca kaba bir üst sınırdır.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Dict, Set, Tuple
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMEL_DOSYASI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_baseline.json")
+
+# Yalnızca ilgili modül sayfasında (rapor, kazıyıcı, dosya okuma) import edilmesi gereken paketler
+ACILISTA_YASAK = ("matplotlib", "fpdf", "fontTools", "requests", "bs4", "lxml", "docx", "openpyxl")
+
+
+def acilis_importlari(yol: str = os.path.join(KOK_DIZIN, "main.py")) -> str:
+    """main.py'nin modül seviyesindeki import ifadelerini tek bir kaynak metin olarak döndürür"""
+    with open(yol, "r", encoding="utf-8") as f:
+        agac = ast.parse(f.read())
+    return "\n".join(ast.unparse(dugum) for dugum in agac.body
+                     if isinstance(dugum, (ast.Import, ast.ImportFrom)))
+
+
+def importtime_calistir(kaynak: str) -> Tuple[Dict[str, float], Set[str]]:
+    """
+    Kaynağı yeni bir süreçte -X importtime ile çalıştırır
+
+    Dönüş:
+        (en dıştaki import'lar için modül adı -> kümülatif süre (ms),
+         iç içe olanlar dahil yüklenen tüm modüllerin üst seviye paket adları)
+    """
+    sonuc = subprocess.run([sys.executable, "-X", "importtime", "-c", kaynak],
+                           cwd=KOK_DIZIN, capture_output=True, text=True, check=True)
+    sureler = {}
+    paketler = set()
+    for satir in sonuc.stderr.splitlines():
+        if not satir.startswith("import time:") or "cumulative" in satir:
+            continue
+        _, kumulatif, ad = satir[len("import time:"):].split("|")
+        paketler.add(ad.strip().split(".")[0])
+        # İç içe import'lar iki boşlukla girintilenir; süre yalnızca en dıştakiler için toplanır
+        if not ad.startswith("  "):
+            sureler[ad.strip()] = int(kumulatif) / 1000
+    return sureler, paketler
+
+
+def olc(tekrar: int) -> dict:
+    kaynak = acilis_importlari()
+    # Yorumlayıcının kendi açılışında yüklenenler (site, encodings vb.) sayılmaz
+    yorumlayici = set(importtime_calistir("pass")[0])
+    olcumler = []
+    yuklenenler = set()
+    for _ in range(tekrar):
+        sureler, tum_paketler = importtime_calistir(kaynak)
+        olcumler.append({ad: sure for ad, sure in sureler.items() if ad not in yorumlayici})
+        yuklenenler |= tum_paketler
+    paketler = {}
+    for olcum in olcumler:
+        for ad, sure in olcum.items():
+            paketler.setdefault(ad.split(".")[0], []).append(sure)
+    paket_sureleri = {ad: round(statistics.median(s), 1) for ad, s in paketler.items()}
+    return {
+        "python": platform.python_version(),
+        "tekrar": tekrar,
+        "toplam_ms": round(statistics.median(sum(olcum.values()) for olcum in olcumler), 1),
+        "paketler": dict(sorted(paket_sureleri.items(), key=lambda p: -p[1])),
+        "yasak_yuklenenler": sorted(yuklenenler & set(ACILISTA_YASAK)),
+    }
+
+
+def karsilastir(rapor: dict, temel: dict, tolerans: float) -> list:
+    """Rapordaki gerilemeleri (açıklama listesi) döndürür; boşsa gerileme yoktur"""
+    sorunlar = [f"açılışta import edilmemesi gereken paket yüklendi: {ad}"
+                for ad in rapor["yasak_yuklenenler"]]
+    sinir = temel["toplam_ms"] * (1 + tolerans)
+    if rapor["toplam_ms"] > sinir:
+        sorunlar.append(f"toplam import süresi {rapor['toplam_ms']:.0f} ms, "
+                        f"temel {temel['toplam_ms']:.0f} ms (+%{tolerans * 100:.0f} sınırı {sinir:.0f} ms)")
+    return sorunlar
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tekrar", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Raporu JSON olarak yazdır")
+    parser.add_argument("--kaydet", action="store_true", help=f"Raporu temel olarak {TEMEL_DOSYASI} dosyasına yaz")
+    parser.add_argument("--kontrol", action="store_true", help="Kayıtlı temele göre gerileme varsa 1 ile çık")
+    parser.add_argument("--tolerans", type=float, default=0.5, help="Toplam süre için izin verilen artış oranı")
+    parser.add_argument("--ilk", type=int, default=12, help="Listelenecek paket sayısı")
+    args = parser.parse_args(argv)
+
+    rapor = olc(args.tekrar)
+
+    if args.json:
+        json.dump(rapor, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print(f"main.py açılış import'ları (Python {rapor['python']}, {rapor['tekrar']} tekrarın medyanı)")
+        print(f"  {'paket':<28}{'kümülatif ms':>14}")
+        for ad, sure in list(rapor["paketler"].items())[:args.ilk]:
+            print(f"  {ad:<28}{sure:>14.1f}")
+        print(f"  {'toplam':<28}{rapor['toplam_ms']:>14.1f}")
+
+    if args.kaydet:
+        with open(TEMEL_DOSYASI, "w", encoding="utf-8") as f:
+            json.dump(rapor, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Temel kaydedildi: {TEMEL_DOSYASI}")
+
+    if args.kontrol:
+        with open(TEMEL_DOSYASI, "r", encoding="utf-8") as f:
+            temel = json.load(f)
+        sorunlar = karsilastir(rapor, temel, args.tolerans)
+        for sorun in sorunlar:
+            print(f"GERİLEME: {sorun}")
+        if sorunlar:
+            return 1
+        print("Gerileme yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
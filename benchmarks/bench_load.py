@@ -0,0 +1,384 @@
+"""
+Çok oturumlu yük testi (Streamlit AppTest ile, tamamen çevrimdışı)
+
+Kullanım:
+    python -m benchmarks.bench_load                       # 4 eşzamanlı oturum
+    python -m benchmarks.bench_load --oturum 8 --json
+    python -m benchmarks.bench_load --sirali -o yuk.jsonl # oturumlar tek tek, sonuç satırı eklenir
+
+Her oturum sentetik bir bilanço / gelir tablosu (.docx veya .xlsx) yükler ve
+dört modülü sırayla açar: Çarpan (Hesapla dahil), DCF, Rasyolar, Grafik
+(PDF raporu dahil). DCF sayfasının yıllık tahmin tablosu, yüklenen dosyanın
+faaliyet karından türetilen pozitif FCF'li değerlerle doldurulur; böylece
+grafik ve rapor adımları gerçek verilerle çalışır. Herhangi bir oturumda
+istisna veya st.error mesajı olursa çıkış kodu 1'dir. Her etkileşimin (betiğin yeniden çalıştırılması) süresi
+kaydedilir ve etkileşim başına p50 / p95 raporlanır.
+
+AppTest her çalıştırmada süreç geneli Runtime örneğini ve yapılandırmayı
+değiştirdiği için aynı süreçte iki betik çalıştırması örtüşemez. Oturumlar
+eşzamanlı açık kalır ve etkileşimleri sıraya girer: "gecikme" kullanıcının
+gördüğü süreyi (sıra beklemesi dahil), "servis" yalnızca betiğin çalışma
+süresini verir. Tek çekirdekli, GIL'li bir sunucuda eşzamanlı oturumlar da
+işlemciyi bu şekilde paylaşır.
+
+Lot kazıyıcısı yerel bir HTTP sunucusuna yönlendirilir (LOT_SAYFASI_URL);
+lot disk önbelleği geçici bir dizindedir. Ağa hiç çıkılmaz.
+
+Bellek, Streamlit sunucusunda olduğu gibi tüm oturumların paylaştığı bu
+sürecin RSS'idir. Oturum başına artış, oturum açıkken (tüm adımları bitip
+nesnesi tutulurken) ölçülen RSS farkıdır; eşzamanlı çalıştırmada diğer
+oturumların ayırmaları da bu farka karışır, temiz oturum başına değer için
+--sirali kullanılır. Grafik süreç havuzunun işçileri ayrı süreçlerdir ve
+ayrıca (cocuk_rss_mib) raporlanır.
+"""
+import argparse
+import datetime
+import gc
+import hashlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks import sentetik
+from benchmarks.bench_pipeline import KOK_DIZIN, _git_surumu
+
+MODULLER = [
+    ("carpan", "Çarpan Hesaplama Modülü"),
+    ("dcf", "DCF / İNA Hesaplama"),
+    ("rasyo", "Finansal Rasyolar ve Analiz"),
+    ("grafik", "Grafik ve Raporlama Modülü"),
+]
+
+MIME_TURLERI = {
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# AppTest çalıştırmaları aynı süreçte örtüşemez (bkz. modül açıklaması)
+_calistirma_kilidi = threading.Lock()
+
+
+class _LotSayfasi(BaseHTTPRequestHandler):
+    """Sentetik halka arz sayfasını ETag ile sunan yerel lot kaynağı"""
+
+    sayfa = b""
+    etag = ""
+    gecikme = 0.0
+    istek_sayisi = 0
+    _kilit = threading.Lock()
+
+    def do_GET(self):
+        with _LotSayfasi._kilit:
+            _LotSayfasi.istek_sayisi += 1
+        time.sleep(self.gecikme)
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.sayfa)))
+        self.send_header("ETag", self.etag)
+        self.end_headers()
+        self.wfile.write(self.sayfa)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def lot_sunucusu_baslat(gecikme: float) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Yerel lot sunucusunu başlatır ve uygulamayı ona yönlendirir
+
+    Uygulama modülleri URL'yi import sırasında okuduğu için bu fonksiyon
+    modules.* paketlerinden webScrapping / lot_cache import edilmeden önce
+    çağrılmalıdır.
+    """
+    sunucu = ThreadingHTTPServer(("127.0.0.1", 0), _LotSayfasi)
+    url = f"http://127.0.0.1:{sunucu.server_address[1]}/halka-arz/test/1"
+    os.environ["LOT_SAYFASI_URL"] = url
+    os.environ["LOT_ONBELLEK_DIZINI"] = tempfile.mkdtemp(prefix="lot_yuk_testi_")
+
+    from benchmarks.bench_scraper import sentetik_sayfa
+    _LotSayfasi.sayfa = sentetik_sayfa().encode("utf-8")
+    _LotSayfasi.etag = '"' + hashlib.sha1(_LotSayfasi.sayfa).hexdigest()[:16] + '"'
+    _LotSayfasi.gecikme = gecikme
+    threading.Thread(target=sunucu.serve_forever, name="lot-sunucusu", daemon=True).start()
+    return sunucu, url
+
+
+def _statm_mib(pid: str) -> float:
+    with open(f"/proc/{pid}/statm", "r") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def rss_mib() -> Optional[float]:
+    """Bu sürecin anlık RSS'i (MiB); /proc yoksa None"""
+    try:
+        return round(_statm_mib("self"), 1)
+    except OSError:
+        return None
+
+
+def cocuk_rss_mib() -> Optional[float]:
+    """Alt süreçlerin (grafik süreç havuzu işçileri) toplam RSS'i (MiB)"""
+    toplam = 0.0
+    try:
+        for gorev in os.listdir("/proc/self/task"):
+            with open(f"/proc/self/task/{gorev}/children", "r") as f:
+                for pid in f.read().split():
+                    try:
+                        toplam += _statm_mib(pid)
+                    except OSError:
+                        pass
+    except OSError:
+        return None
+    return round(toplam, 1)
+
+
+class _RssOrnekleyici:
+    """Arka planda RSS örnekleyip tepe değeri tutar"""
+
+    def __init__(self, aralik: float = 0.05):
+        self.aralik = aralik
+        self.tepe = rss_mib() or 0.0
+        self._dur = threading.Event()
+        self._thread = threading.Thread(target=self._calis, name="rss-ornekleyici", daemon=True)
+        self._thread.start()
+
+    def _calis(self):
+        while not self._dur.wait(self.aralik):
+            self.tepe = max(self.tepe, rss_mib() or 0.0)
+
+    def durdur(self) -> float:
+        self._dur.set()
+        self._thread.join()
+        return round(max(self.tepe, rss_mib() or 0.0), 1)
+
+
+def yuklemeleri_uret(oturum: int, satir: int, donem: int, tablo: int,
+                     ayni_dosya: bool) -> List[Tuple[str, bytes, np.ndarray]]:
+    """Oturum başına (dosya adı, içerik, DCF tahmin matrisi); oturumlar sırayla .docx / .xlsx yükler"""
+    yuklemeler = []
+    for no in range(oturum):
+        tohum = 0 if ayni_dosya else no
+        tablolar = sentetik.tablolari_uret(satir, donem, tablo, seed=tohum)
+        projeksiyon = sentetik.projeksiyon_degerleri(tablolar)
+        if no % 2 == 0:
+            yuklemeler.append((f"rapor_{tohum}.docx", sentetik.docx_baytlari(tablolar), projeksiyon))
+        else:
+            yuklemeler.append((f"rapor_{tohum}.xlsx", sentetik.xlsx_baytlari(tablolar), projeksiyon))
+    return yuklemeler
+
+
+def oturumu_calistir(no: int, yukleme: Tuple[str, bytes, np.ndarray], zaman_asimi: float,
+                     bariyer: Optional[threading.Barrier]) -> Dict:
+    """
+    Bir oturumu baştan sona yürütür
+
+    Dönüş:
+        Adım süreleri, RSS farkı, istisnalar / st.error mesajları ve (oturumu açık tutmak için) AppTest nesnesi
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(KOK_DIZIN, "main.py"), default_timeout=zaman_asimi)
+    ad, veri, projeksiyon = yukleme
+    adimlar = []
+    istisnalar = set()
+    hata_mesajlari = set()
+
+    def adim(ad, islem):
+        baslangic = time.perf_counter()
+        with _calistirma_kilidi:
+            servis_baslangici = time.perf_counter()
+            islem()
+            bitis = time.perf_counter()
+        adimlar.append((ad, bitis - baslangic, bitis - servis_baslangici))
+        istisnalar.update(f"{ad}: {e.value}" for e in at.exception)
+        hata_mesajlari.update(f"{ad}: {e.value}" for e in at.error)
+
+    if bariyer is not None:
+        bariyer.wait()
+    rss_once = rss_mib()
+    baslangic = time.perf_counter()
+
+    adim("acilis", at.run)
+    adim("yukleme", lambda: at.file_uploader[0].set_value((ad, veri, MIME_TURLERI[os.path.splitext(ad)[1]])).run())
+    for kisa, modul in MODULLER:
+        adim(f"{kisa}.sec", lambda: at.selectbox(key="module_select").set_value(modul).run())
+        if kisa == "dcf":
+            # st.data_editor AppTest'ten düzenlenemez; tablonun kurulduğu taban matris verilir
+            at.session_state["projeksiyon_tabani"] = projeksiyon
+        adim(f"{kisa}.getir", lambda: at.button(key="getir_button").click().run())
+        if kisa == "carpan":
+            adim("carpan.hesapla", lambda: at.button(key="hesapla_button").click().run())
+        elif kisa == "grafik":
+            adim("grafik.pdf", lambda: next(b for b in at.button if "PDF" in b.label).click().run())
+
+    rss_sonra = rss_mib()
+    return {
+        "oturum": no,
+        "dosya": yukleme[0],
+        "toplam_s": round(time.perf_counter() - baslangic, 3),
+        "rss_artisi_mib": round(rss_sonra - rss_once, 1) if rss_once is not None else None,
+        "adimlar": adimlar,
+        "istisnalar": sorted(istisnalar),
+        "hata_mesajlari": sorted(hata_mesajlari),
+        "at": at,
+    }
+
+
+def yuzdelikler(sureler: List[float]) -> Dict:
+    ms = np.array(sureler) * 1000
+    return {
+        "n": len(sureler),
+        "p50_ms": round(float(np.percentile(ms, 50)), 1),
+        "p95_ms": round(float(np.percentile(ms, 95)), 1),
+        "max_ms": round(float(ms.max()), 1),
+    }
+
+
+def calistir(oturum: int, sirali: bool, satir: int, donem: int, tablo: int, ayni_dosya: bool,
+             lot_gecikme: float, zaman_asimi: float) -> Dict:
+    sunucu, url = lot_sunucusu_baslat(lot_gecikme)
+    try:
+        yuklemeler = yuklemeleri_uret(oturum, satir, donem, tablo, ayni_dosya)
+        gc.collect()
+        rss_baslangic = rss_mib()
+        ornekleyici = _RssOrnekleyici()
+        baslangic = time.perf_counter()
+
+        if sirali:
+            sonuclar = [oturumu_calistir(no, yukleme, zaman_asimi, None) for no, yukleme in enumerate(yuklemeler)]
+        else:
+            bariyer = threading.Barrier(oturum)
+            with ThreadPoolExecutor(max_workers=oturum, thread_name_prefix="oturum") as havuz:
+                gorevler = [havuz.submit(oturumu_calistir, no, yukleme, zaman_asimi, bariyer)
+                            for no, yukleme in enumerate(yuklemeler)]
+                sonuclar = [gorev.result() for gorev in gorevler]
+
+        sure = time.perf_counter() - baslangic
+        # Tüm oturumlar hâlâ açıkken (durumları bellekte) ölçülür
+        rss_acik = rss_mib()
+        cocuk_rss = cocuk_rss_mib()
+        rss_tepe = ornekleyici.durdur()
+        for sonuc in sonuclar:
+            del sonuc["at"]
+        gc.collect()
+        rss_kapali = rss_mib()
+    finally:
+        sunucu.shutdown()
+
+    gecikmeler, servisler = {}, {}
+    for sonuc in sonuclar:
+        for ad, gecikme, servis in sonuc.pop("adimlar"):
+            gecikmeler.setdefault(ad, []).append(gecikme)
+            servisler.setdefault(ad, []).append(servis)
+    sayilar = {"istisnalar": {}, "hata_mesajlari": {}}
+    for sonuc in sonuclar:
+        for tur, sayac in sayilar.items():
+            for mesaj in sonuc[tur]:
+                sayac[mesaj] = sayac.get(mesaj, 0) + 1
+
+    return {
+        "zaman": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_surumu(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": os.cpu_count(),
+        "ayarlar": {"oturum": oturum, "sirali": sirali, "satir": satir, "donem": donem, "tablo": tablo,
+                    "ayni_dosya": ayni_dosya, "lot_gecikme": lot_gecikme},
+        "sure_s": round(sure, 2),
+        "lot_istekleri": _LotSayfasi.istek_sayisi,
+        "gecikme": {ad: yuzdelikler(s) for ad, s in gecikmeler.items()},
+        "servis": {ad: yuzdelikler(s) for ad, s in servisler.items()},
+        "tum_etkilesimler": {
+            "gecikme": yuzdelikler([s for sureler in gecikmeler.values() for s in sureler]),
+            "servis": yuzdelikler([s for sureler in servisler.values() for s in sureler]),
+        },
+        "bellek": {
+            "rss_baslangic_mib": rss_baslangic,
+            "rss_tepe_mib": rss_tepe,
+            "rss_oturumlar_acikken_mib": rss_acik,
+            "rss_oturumlar_kapandiktan_sonra_mib": rss_kapali,
+            "oturum_basina_artis_mib": round((rss_acik - rss_baslangic) / oturum, 1) if rss_baslangic else None,
+            "cocuk_rss_mib": cocuk_rss,
+        },
+        "oturumlar": sonuclar,
+        **sayilar,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--oturum", type=int, default=4, help="Oturum sayısı")
+    parser.add_argument("--sirali", action="store_true", help="Oturumları eşzamanlı değil tek tek çalıştır")
+    parser.add_argument("--satir", type=int, default=40, help="Yüklenen tablolardaki satır sayısı")
+    parser.add_argument("--donem", type=int, default=2, help="Dönem sütunu sayısı")
+    parser.add_argument("--tablo", type=int, default=3, help="Tablo sayısı (en az 3)")
+    parser.add_argument("--ayni-dosya", action="store_true", help="Tüm oturumlar aynı içeriği yüklesin")
+    parser.add_argument("--lot-gecikme", type=float, default=0.2, help="Yerel lot sunucusunun yanıt gecikmesi (sn)")
+    parser.add_argument("--zaman-asimi", type=float, default=300, help="Tek etkileşim için AppTest zaman aşımı (sn)")
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yazdır")
+    parser.add_argument("-o", "--cikti", help="Sonuç dosyası (.json yazılır, .jsonl sonuna eklenir)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, KOK_DIZIN)
+    # Bare modda her session_state erişimindeki ve kullanımdan kalkma uyarıları çıktıyı boğar;
+    # yapılandırma ilk okunduğunda log seviyesi logger.level değerine geri döndüğü için ikisi de ayarlanır
+    from streamlit import config, logger
+    config.set_option("logger.level", "error")
+    logger.set_log_level("error")
+    sonuc = calistir(args.oturum, args.sirali, args.satir, args.donem, args.tablo, args.ayni_dosya,
+                     args.lot_gecikme, args.zaman_asimi)
+
+    if args.cikti:
+        if args.cikti.endswith(".jsonl"):
+            with open(args.cikti, "a", encoding="utf-8") as f:
+                f.write(json.dumps(sonuc, ensure_ascii=False) + "\n")
+        else:
+            with open(args.cikti, "w", encoding="utf-8") as f:
+                json.dump(sonuc, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+
+    if args.json:
+        json.dump(sonuc, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    a = sonuc["ayarlar"]
+    print(f"{a['oturum']} oturum ({'sıralı' if a['sirali'] else 'eşzamanlı'}), "
+          f"{a['tablo']} tablo x {a['satir']} satır x {a['donem']} dönem, {sonuc['sure_s']} sn, "
+          f"{sonuc['lot_istekleri']} lot isteği")
+    print(f"  {'':<20}{'':>5}{'gecikme (sıra dahil)':>30}{'servis':>20}")
+    print(f"  {'etkileşim':<20}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    satirlar = [(ad, s, sonuc["servis"][ad]) for ad, s in sonuc["gecikme"].items()]
+    satirlar.append(("tümü", sonuc["tum_etkilesimler"]["gecikme"], sonuc["tum_etkilesimler"]["servis"]))
+    for ad, g, s in satirlar:
+        print(f"  {ad:<20}{g['n']:>5}{g['p50_ms']:>10.1f}{g['p95_ms']:>10.1f}{g['max_ms']:>10.1f}"
+              f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}")
+    b = sonuc["bellek"]
+    print(f"  RSS: başlangıç {b['rss_baslangic_mib']} MiB, tepe {b['rss_tepe_mib']} MiB, "
+          f"oturumlar açıkken {b['rss_oturumlar_acikken_mib']} MiB, kapandıktan sonra "
+          f"{b['rss_oturumlar_kapandiktan_sonra_mib']} MiB, oturum başına +{b['oturum_basina_artis_mib']} MiB, "
+          f"grafik işçileri {b['cocuk_rss_mib']} MiB")
+    print("  oturum başına RSS artışı (MiB): " + ", ".join(
+        f"{s['oturum']}:{s['rss_artisi_mib']}" for s in sonuc["oturumlar"]))
+    for mesaj, sayi in sonuc["hata_mesajlari"].items():
+        print(f"  st.error ({sayi} oturum): {mesaj[:200]}")
+    for mesaj, sayi in sonuc["istisnalar"].items():
+        print(f"  İSTİSNA ({sayi} oturum): {mesaj[:200]}")
+    return 1 if sonuc["istisnalar"] or sonuc["hata_mesajlari"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Uçtan uca işlem hattı kıyaslaması (sentetik bilanço / gelir tablosu ile)
+
+Kullanım:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --satir 1000 --donem 10 --tablo 6 --json
+    python -m benchmarks.bench_pipeline -o sonuclar.jsonl     # her çalıştırma bir satır eklenir
+
+benchmarks.sentetik ile üretilen .docx / .xlsx dosyaları üzerinde her aşama
+ayrı ayrı ölçülür: dosya okuma (Word, Excel), kalem çözümleme, rasyolar, DCF
+(duyarlılık ızgarası dahil), Monte Carlo, her rapor grafiği ve PDF raporu.
+Sonuçlar eğilim takibi için JSON olarak yazılabilir; .jsonl çıktısına her
+çalıştırma tek satır olarak eklenir.
+"""
+import argparse
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from benchmarks import sentetik
+from modules.data_extractor import extract_tables_from_docx, extract_tables_from_excel, parse_tables
+from modules.financial_statement import FinancialStatement
+from modules.ratio_calculator import (
+    RatioEngine, aktifkarlilik, alacakdevirhizi, asittestorani, borctoplamvarlik, carioran,
+    fd_divide_favok, fk_orani, netkarmarji, ozsermayekarliligi, pd_divide_dd, stokdevirhizi,
+)
+from modules.dcf_model import (
+    bes_yillik_fcf, bes_yillik_indirgeme, duyarlilik_izgarasi, fcf, nwcdegisim, terminal_degeri, vergiorani,
+)
+from modules.monte_carlo import monte_carlo_dcf
+from modules.projection import Projeksiyon
+
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sayfadaki varsayılanlar
+PIYASA_FIYATI = 10.0
+TOPLAM_HISSE = 1_000_000
+WACC = 0.1318
+TERMINAL_BUYUME = 0.025
+DUYARLILIK_NOKTASI = 50
+DUYARLILIK_FK_DEGISIMLERI = [-30, -20, -10, 0, 10, 20, 30]
+
+RAPOR_GRAFIKLERI = ["carpanlar", "fcf", "dcf", "terminal_deger", "likidite", "borcluluk",
+                    "karlilik", "faaliyet", "finansal_metrikler"]
+
+
+def olc(fonksiyon: Callable, tekrar: int) -> Dict:
+    """Fonksiyonu bir kez ısındırıp tekrar kez çalıştırır; sonuç ve süre özetini döndürür"""
+    sonuc = fonksiyon()
+    sureler = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        fonksiyon()
+        sureler.append(time.perf_counter() - baslangic)
+    return {
+        "sonuc": sonuc,
+        "medyan_ms": round(statistics.median(sureler) * 1000, 3),
+        "en_iyi_ms": round(min(sureler) * 1000, 3),
+        "tekrar": tekrar,
+    }
+
+
+def kalemleri_coz(tablolar) -> Dict:
+    """main.py'deki gibi tabloları indeksler ve kalemleri son / önceki dönem için çözer"""
+    varliklar, kaynaklar, gelir = [FinancialStatement.from_parsed(t) for t in parse_tables(tablolar[:3])]
+    son, onceki = varliklar.periods[-1], varliklar.periods[-2] if len(varliklar.periods) > 1 else varliklar.periods[-1]
+    gelir_son = gelir.periods[-1]
+    k = {ad: varliklar.get(ad, son) for ad in sentetik.VARLIK_KALEMLERI}
+    k.update({ad: kaynaklar.get(ad, son) for ad in sentetik.KAYNAK_KALEMLERI})
+    k.update({ad: gelir.get(ad, gelir_son) for ad in sentetik.GELIR_KALEMLERI})
+    # DCF sayfası dönem başı / sonu değerlerini tek seferde alır
+    k["dcf_varliklar"] = varliklar.get_many(["TOTAL CURRENT ASSETS", "Property, plant and equipment",
+                                             "Intangible assets"], [son, onceki])
+    k["dcf_kaynaklar"] = kaynaklar.get_many(["TOTAL CURRENT LIABILITIES"], [son, onceki])
+    return {"tablolar": (varliklar, kaynaklar, gelir), "kalemler": k}
+
+
+def rasyolari_hesapla(cozum: Dict) -> Dict:
+    k = cozum["kalemler"]
+    sonuc = {
+        "fk": fk_orani(PIYASA_FIYATI, k["Earnings per share from continuing operations"] / 10),
+        "fd_divide_favok": fd_divide_favok(
+            k["Short term borrowings"], k["Short term portion of long term borrowings"], k["Lease liabilities"],
+            k["Long term borrowings"], k["Long term lease liabilities"], k["Profit / (loss) for the period"],
+            k["Financial expense (-)"], k["Operating profit / (loss)"], k["Current tax expense for the year"],
+            PIYASA_FIYATI, TOPLAM_HISSE, k["Cash and cash equivalents"], k["Financial investments"]),
+        "pd_divide_dd": pd_divide_dd(TOPLAM_HISSE, 0, PIYASA_FIYATI, k["TOTAL EQUITY"]),
+        "cariOran": carioran(k["TOTAL CURRENT ASSETS"], k["TOTAL CURRENT LIABILITIES"]),
+        "asitTestOrani": asittestorani(
+            k["TOTAL CURRENT ASSETS"], k["Inventories"], k["Short term borrowings"],
+            k["Short term portion of long term borrowings"], k["Trade payables"],
+            k["Liabilities for employee benefits"], k["Other payables"], k["Deferred income to third parties"],
+            k["Short term provisions"]),
+        "borcToplamVarlik": borctoplamvarlik(k["TOTAL CURRENT ASSETS"], k["TOTAL NON CURRENT ASSETS"],
+                                             k["TOTAL CURRENT LIABILITIES"], k["TOTAL NON CURRENT LIABILITIES"]),
+        "netKarMarji": netkarmarji(k["Profit / (loss) for the period"], k["Revenue"]),
+        "aktifKarlilikOrani": aktifkarlilik(k["Profit / (loss) for the period"], k["TOTAL CURRENT ASSETS"],
+                                            k["TOTAL NON CURRENT ASSETS"]),
+        "ozSermayeKarliligi": ozsermayekarliligi(k["Profit / (loss) for the period"], k["TOTAL EQUITY"]),
+        "alacakDevirHizi": alacakdevirhizi(k["Revenue"], k["Trade receivables"]),
+        "stokDevirHizi": stokdevirhizi(k["Cost of sales (-)"], k["Inventories"]),
+    }
+    sonuc["rasyoTrendleri"] = RatioEngine(*cozum["tablolar"]).hesapla()
+    return sonuc
+
+
+def dcf_hesapla(cozum: Dict, yil_sayisi: int = 5) -> Dict:
+    """DCF sayfasının hesapları: ΔNWC, FCF, projeksiyon, terminal değer ve duyarlılık ızgarası"""
+    k = cozum["kalemler"]
+    donen, _, _ = k["dcf_varliklar"]
+    (kisa_vadeli_yukumlulukler,) = k["dcf_kaynaklar"]
+    nwc_degisim = nwcdegisim(donen[0], kisa_vadeli_yukumlulukler[0]) - nwcdegisim(donen[1], kisa_vadeli_yukumlulukler[1])
+    ebit = k["Gross profit / (loss)"] + (k["General and administrative expenses (-)"]
+                                        + k["Selling, marketing and distribution expenses (-)"]
+                                        + k["Research and development expenses (-)"])
+    vergiorani(k["Current tax expense for the year"], k["Profit / (loss) before tax"])
+    fcf(nwc_degisim, 2846728, ebit, 913657, k["Current tax expense for the year"])
+
+    projeksiyon = Projeksiyon.bos(yil_sayisi, indirgeme=1 / (1 + WACC))
+    buyume = 1.08 ** np.arange(1, yil_sayisi + 1)
+    projeksiyon.kalem("faaliyet_kari")[:] = ebit * buyume
+    projeksiyon.kalem("amortisman")[:] = 913657 * buyume
+    projeksiyon.kalem("odenen_vergi")[:] = ebit * 0.25 * buyume
+    projeksiyon.kalem("delta_nwc")[:] = abs(nwc_degisim) * 0.1
+    projeksiyon.kalem("capex")[:] = 2846728
+    projeksiyon.kalem("indirgeme")[:] = (1 + WACC) ** -np.arange(1, yil_sayisi + 1)
+
+    besYillikfcf = bes_yillik_fcf(*(projeksiyon.kalem(ad).tolist() for ad in
+                                    ("faaliyet_kari", "amortisman", "odenen_vergi", "delta_nwc", "capex")))
+    indirgeme = projeksiyon.kalem("indirgeme").tolist()
+    besYillikIndirgemeliDegerler = bes_yillik_indirgeme(besYillikfcf, indirgeme)
+    terminalDegeri = terminal_degeri(besYillikfcf, TERMINAL_BUYUME, WACC)
+    netBorc = (k["Short term borrowings"] + k["Short term portion of long term borrowings"] + k["Lease liabilities"]
+               + k["Long term borrowings"] + k["Long term lease liabilities"]
+               - k["Cash and cash equivalents"] - k["Financial investments"])
+
+    dt_wacc = np.linspace(0.08, 0.18, DUYARLILIK_NOKTASI)
+    dt_buyume = np.linspace(0.0, 0.06, DUYARLILIK_NOKTASI)
+    dt_farklar = [besYillikfcf[0] * degisim / 100 for degisim in DUYARLILIK_FK_DEGISIMLERI]
+    dt_sonuc = duyarlilik_izgarasi(besYillikfcf, dt_wacc, dt_buyume, indirgeme,
+                                   net_borc=netBorc, ilk_yil_farklari=dt_farklar)
+    return {
+        "besYillikfcf": besYillikfcf,
+        "besYillikIndirgemeliDegerler": besYillikIndirgemeliDegerler,
+        "indirgeme_degerleri": indirgeme,
+        "terminalDegeri": terminalDegeri,
+        "netBorc": netBorc,
+        "toplamSirketDegeri": sum(besYillikIndirgemeliDegerler) + terminalDegeri,
+        "toplamFirmaDegeri": sum(besYillikIndirgemeliDegerler) + terminalDegeri - netBorc,
+        "duyarlilik": {"wacc": dt_wacc, "buyume": dt_buyume, "secili": (WACC, TERMINAL_BUYUME),
+                       "firma_degeri": dt_sonuc["firma_degeri"][DUYARLILIK_FK_DEGISIMLERI.index(0)]},
+    }
+
+
+def monte_carlo_calistir(dcf: Dict, cekilis: int) -> Dict:
+    sonuc = monte_carlo_dcf(
+        dcf["besYillikfcf"],
+        {"tur": "normal", "ortalama": WACC, "std": 0.01},
+        {"tur": "uniform", "alt": TERMINAL_BUYUME - 0.01, "ust": TERMINAL_BUYUME + 0.01},
+        {"tur": "normal", "ortalama": 0.0, "std": 0.1},
+        net_borc=dcf["netBorc"],
+        indirgeme_degerleri=dcf["indirgeme_degerleri"],
+        cekilis_sayisi=cekilis,
+        seed=42,
+    )
+    return {k: v for k, v in sonuc.items() if k != "degerler"}
+
+
+def _git_surumu() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=KOK_DIZIN,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def calistir(satir: int, donem: int, tablo: int, tekrar: int, cekilis: int, grafik_tekrar: int) -> Dict:
+    # Rapor modülleri (matplotlib, fpdf, streamlit) yalnızca bu aşamalar için yüklenir
+    from modules.charts import GRAFIKLER, grafik_baytlari, grafik_verileri
+    from modules.visualization import create_pdf_report
+
+    # Streamlit bare modda (sunucusuz) her session_state erişiminde uyarı yazar;
+    # alt logger'ların seviyesi ayrı ayarlandığından hepsi tek tek susturulur
+    for ad in list(logging.root.manager.loggerDict):
+        if ad.startswith("streamlit"):
+            logging.getLogger(ad).setLevel(logging.ERROR)
+
+    uretilen = sentetik.tablolari_uret(satir, donem, tablo)
+    docx = sentetik.docx_baytlari(uretilen)
+    xlsx = sentetik.xlsx_baytlari(uretilen)
+
+    asamalar = {}
+    asamalar["docx_okuma"] = olc(lambda: extract_tables_from_docx(io.BytesIO(docx)), tekrar)
+    asamalar["xlsx_okuma"] = olc(lambda: extract_tables_from_excel(io.BytesIO(xlsx)), tekrar)
+    tablolar = asamalar["docx_okuma"]["sonuc"]
+    asamalar["kalem_cozumleme"] = olc(lambda: kalemleri_coz(tablolar), tekrar)
+    cozum = asamalar["kalem_cozumleme"]["sonuc"]
+    asamalar["rasyolar"] = olc(lambda: rasyolari_hesapla(cozum), tekrar)
+    asamalar["dcf"] = olc(lambda: dcf_hesapla(cozum), tekrar)
+    dcf = asamalar["dcf"]["sonuc"]
+    asamalar["monte_carlo"] = olc(lambda: monte_carlo_calistir(dcf, cekilis), max(1, tekrar // 5))
+
+    durum = {**asamalar["rasyolar"]["sonuc"], **dcf, "monteCarlo": asamalar["monte_carlo"]["sonuc"]}
+    veri = grafik_verileri(durum)
+    # Arayüzün grafikleri_ciz ile çizdiği grafikler (önbelleğe uğramadan, PNG'ye kadar)
+    for ad in GRAFIKLER:
+        asamalar[f"grafik.{ad}"] = olc(lambda ad=ad: grafik_baytlari(ad, veri)[0], grafik_tekrar)
+
+    rapor = [(ad, asamalar[f"grafik.{ad}"]["sonuc"]) for ad in RAPOR_GRAFIKLERI]
+    asamalar["pdf_raporu"] = olc(lambda: create_pdf_report(rapor), grafik_tekrar)
+
+    return {
+        "zaman": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git": _git_surumu(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu": os.cpu_count(),
+        "ayarlar": {"satir": satir, "donem": donem, "tablo": tablo, "tekrar": tekrar,
+                    "cekilis": cekilis, "grafik_tekrar": grafik_tekrar},
+        "girdi": {"docx_kib": round(len(docx) / 1024, 1), "xlsx_kib": round(len(xlsx) / 1024, 1),
+                  "pdf_kib": round(len(asamalar["pdf_raporu"]["sonuc"] or b"") / 1024, 1)},
+        "asamalar": {ad: {k: v for k, v in s.items() if k != "sonuc"} for ad, s in asamalar.items()},
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--satir", type=int, default=40, help="Tablo başına satır sayısı")
+    parser.add_argument("--donem", type=int, default=2, help="Dönem sütunu sayısı")
+    parser.add_argument("--tablo", type=int, default=3, help="Tablo sayısı (en az 3)")
+    parser.add_argument("--tekrar", type=int, default=10, help="Hesap aşamalarının tekrar sayısı")
+    parser.add_argument("--grafik-tekrar", type=int, default=3, help="Grafik ve PDF aşamalarının tekrar sayısı")
+    parser.add_argument("--cekilis", type=int, default=100_000, help="Monte Carlo çekiliş sayısı")
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yazdır")
+    parser.add_argument("-o", "--cikti", help="Sonuç dosyası (.json yazılır, .jsonl sonuna eklenir)")
+    args = parser.parse_args(argv)
+
+    sonuc = calistir(args.satir, args.donem, args.tablo, args.tekrar, args.cekilis, args.grafik_tekrar)
+
+    if args.cikti:
+        if args.cikti.endswith(".jsonl"):
+            with open(args.cikti, "a", encoding="utf-8") as f:
+                f.write(json.dumps(sonuc, ensure_ascii=False) + "\n")
+        else:
+            with open(args.cikti, "w", encoding="utf-8") as f:
+                json.dump(sonuc, f, indent=2, ensure_ascii=False)
+                f.write("\n")
+
+    if args.json:
+        json.dump(sonuc, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    a = sonuc["ayarlar"]
+    print(f"{a['tablo']} tablo x {a['satir']} satır x {a['donem']} dönem "
+          f"(docx {sonuc['girdi']['docx_kib']} KiB, xlsx {sonuc['girdi']['xlsx_kib']} KiB)")
+    print(f"  {'aşama':<30}{'medyan ms':>12}{'en iyi ms':>12}")
+    for ad, s in sonuc["asamalar"].items():
+        print(f"  {ad:<30}{s['medyan_ms']:>12.2f}{s['en_iyi_ms']:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
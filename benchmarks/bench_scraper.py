@@ -0,0 +1,145 @@
+"""
+Lot kazıyıcısının HTML ayrıştırma süresi ve bellek kullanımı karşılaştırması
+
+Kullanım:
+    python -m benchmarks.bench_scraper                 # sentetik sayfa ile
+    python -m benchmarks.bench_scraper kayitli.html    # kaydedilmiş sayfa(lar) ile
+
+Yöntemler:
+    eski_bs4_tam: Önceki uygulama (tüm sayfa için html.parser ağacı)
+    soupstrainer: lxml yokken kullanılan yol (yalnızca ilgili div'ler)
+    lxml_xpath:   Varsayılan yol (lxml + XPath)
+
+Bellek tracemalloc tepe değeri olarak ölçülür. Bu yalnızca Python yığınını
+kapsar; lxml'in C tarafında (libxml2) kurduğu geçici ağaç bu sayıya dahil
+değildir.
+"""
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from modules import webScrapping
+
+
+def eski_bs4_tam(html):
+    soup = BeautifulSoup(html, "html.parser")
+    sonuc = []
+    for etiket in ("Pay", "Ek Pay"):
+        deger = None
+        baslik_div = soup.find("div", class_=webScrapping.ETIKET_SINIFI, string=etiket)
+        if baslik_div:
+            deger_div = baslik_div.find_next("div", class_=webScrapping.DEGER_SINIFI)
+            if deger_div:
+                eslesme = re.search(r'(\d{1,3}(?:\.\d{3})*)', deger_div.get_text(strip=True))
+                if eslesme:
+                    deger = int(eslesme.group(1).replace(".", ""))
+        sonuc.append(deger)
+    return tuple(sonuc)
+
+
+def soupstrainer(html):
+    alanlar = webScrapping._alanlar_soup(html, webScrapping.LOT_KURALLARI)
+    return alanlar["pay_lot"], alanlar["ek_pay_lot"]
+
+
+def lxml_xpath(html):
+    alanlar = webScrapping._alanlar_lxml(html, webScrapping.LOT_KURALLARI)
+    return alanlar["pay_lot"], alanlar["ek_pay_lot"]
+
+
+YONTEMLER = {"eski_bs4_tam": eski_bs4_tam, "soupstrainer": soupstrainer, "lxml_xpath": lxml_xpath}
+
+
+def sentetik_sayfa(kart_sayisi: int = 1500) -> str:
+    """Gerçek halka arz sayfasına benzeyen (menüler, script'ler, çok sayıda kart) büyük bir sayfa"""
+    parcalar = ["<!DOCTYPE html><html><head><meta charset='utf-8'><title>Halka Arz</title>"]
+    parcalar += [f"<script>var veri{i} = {{a: {i}, b: '{'x' * 200}'}};</script>" for i in range(50)]
+    parcalar.append("<style>" + ".c{color:red}" * 2000 + "</style></head><body><nav>")
+    parcalar += [f"<a href='/hisse/{i}' class='menu-link'>Hisse {i}</a>" for i in range(500)]
+    parcalar.append("</nav><main>")
+    for i in range(kart_sayisi):
+        parcalar.append(
+            f"<div class='card'><div class='text-xs text-blue-gray-2'>Alan {i}</div>"
+            f"<div class='text-md font-semibold text-white mt-4'>{i}.000 TL</div>"
+            f"<span class='x'>açıklama {i}</span><!-- yorum {i} --></div>"
+        )
+    parcalar.append(
+        "<div class='card'><div class='text-xs text-blue-gray-2'>Pay</div>"
+        "<div class='text-md font-semibold text-white mt-4'>12.500.000 Lot</div></div>"
+        "<div class='card'><div class='text-xs text-blue-gray-2'>Ek Pay</div>"
+        "<div class='text-md font-semibold text-white mt-4'>2.500.000 Lot</div></div>"
+    )
+    parcalar.append("</main></body></html>")
+    return "".join(parcalar)
+
+
+def olc(html: str, tekrar: int) -> dict:
+    sonuclar = {}
+    beklenen = None
+    for ad, yontem in YONTEMLER.items():
+        deger = yontem(html)
+        if beklenen is None:
+            beklenen = deger
+        elif deger != beklenen:
+            raise AssertionError(f"{ad} farklı sonuç verdi: {deger} != {beklenen}")
+
+        sureler = []
+        for _ in range(tekrar):
+            baslangic = time.perf_counter()
+            yontem(html)
+            sureler.append(time.perf_counter() - baslangic)
+
+        tracemalloc.start()
+        yontem(html)
+        _, tepe = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        sonuclar[ad] = {
+            "sonuc": list(deger),
+            "medyan_ms": statistics.median(sureler) * 1000,
+            "en_iyi_ms": min(sureler) * 1000,
+            "tracemalloc_tepe_mib": tepe / 2**20,
+        }
+    return sonuclar
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sayfalar", nargs="*", help="Kaydedilmiş HTML sayfaları (yoksa sentetik sayfa)")
+    parser.add_argument("--tekrar", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSON olarak yazdır")
+    args = parser.parse_args(argv)
+
+    if args.sayfalar:
+        sayfalar = {}
+        for yol in args.sayfalar:
+            with open(yol, "r", encoding="utf-8", errors="replace") as f:
+                sayfalar[yol] = f.read()
+    else:
+        sayfalar = {"sentetik": sentetik_sayfa()}
+
+    rapor = {ad: {"boyut_kib": len(html.encode("utf-8")) / 1024, "yontemler": olc(html, args.tekrar)}
+             for ad, html in sayfalar.items()}
+
+    if args.json:
+        json.dump(rapor, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    for ad, sayfa in rapor.items():
+        print(f"{ad} ({sayfa['boyut_kib']:.0f} KiB)")
+        print(f"  {'yöntem':<14}{'medyan ms':>11}{'en iyi ms':>11}{'tracemalloc MiB':>17}")
+        for yontem, s in sayfa["yontemler"].items():
+            print(f"  {yontem:<14}{s['medyan_ms']:>11.2f}{s['en_iyi_ms']:>11.2f}"
+                  f"{s['tracemalloc_tepe_mib']:>17.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
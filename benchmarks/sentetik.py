@@ -0,0 +1,265 @@
+"""
+Kıyaslama için sentetik bilanço / gelir tablosu dosyaları (.docx / .xlsx)
+
+Kullanım:
+    python -m benchmarks.sentetik -o ornek.docx
+    python -m benchmarks.sentetik -o ornek.xlsx --satir 500 --donem 8 --tablo 6
+
+İlk üç tablo main.py'nin sırasıyla okuduğu varlıklar, kaynaklar ve gelir
+tablosudur; kalem adları main.py'de aranan adların birebir aynısıdır. Her
+tablo satir satıra kadar "Other item N" kalemleriyle doldurulur, tablo
+sayısı üçü aşarsa kalanlar aynı biçimde dipnot tablolarıdır. Dönemler en
+yenisi 2025 olmak üzere geriye doğru yıllardır (gelir tablosu dönem seçimi
+2023-2025 yıllarını arar).
+"""
+import argparse
+import io
+import sys
+import zipfile
+from typing import List, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from modules.projection import PROJEKSIYON_KALEMLERI
+
+VARLIK_KALEMLERI = [
+    "Cash and cash equivalents", "Financial investments", "Trade receivables", "Inventories",
+    "Prepaid expenses", "Other current assests", "TOTAL CURRENT ASSETS",
+    "Property, plant and equipment", "Intangible assets", "TOTAL NON CURRENT ASSETS", "TOTAL ASSETS",
+]
+
+KAYNAK_KALEMLERI = [
+    "Short term borrowings", "Short term portion of long term borrowings", "Lease liabilities",
+    "Trade payables", "Liabilities for employee benefits", "Other payables",
+    "Deferred income to third parties", "Short term provisions", "TOTAL CURRENT LIABILITIES",
+    "Long term borrowings", "Long term lease liabilities", "TOTAL NON CURRENT LIABILITIES",
+    "TOTAL EQUITY",
+]
+
+GELIR_KALEMLERI = [
+    "Revenue", "Cost of sales (-)", "Gross profit / (loss)", "General and administrative expenses (-)",
+    "Selling, marketing and distribution expenses (-)", "Research and development expenses (-)",
+    "Operating profit / (loss)", "Financial income", "Financial expense (-)", "Profit / (loss) before tax",
+    "Current tax expense for the year", "Profit / (loss) for the period",
+    "Earnings per share from continuing operations",
+]
+
+SON_YIL = 2025
+
+# (başlık satırı, [kalem adı, değer, değer, ...] satırları)
+Tablo = Tuple[List[str], List[list]]
+
+
+def bilanco_donemleri(donem: int) -> List[str]:
+    return [f"31.12.{yil}" for yil in range(SON_YIL - donem + 1, SON_YIL + 1)]
+
+
+def gelir_donemleri(donem: int) -> List[str]:
+    return [f"1 January - 31 December {yil}" for yil in range(SON_YIL - donem + 1, SON_YIL + 1)]
+
+
+def _varliklar(rng: np.random.Generator, donem: int) -> dict:
+    k = {ad: rng.uniform(1e5, 5e6, donem) for ad in VARLIK_KALEMLERI}
+    k["TOTAL CURRENT ASSETS"] = sum(k[ad] for ad in VARLIK_KALEMLERI[:6])
+    k["TOTAL NON CURRENT ASSETS"] = k["Property, plant and equipment"] + k["Intangible assets"]
+    k["TOTAL ASSETS"] = k["TOTAL CURRENT ASSETS"] + k["TOTAL NON CURRENT ASSETS"]
+    return k
+
+
+def _kaynaklar(rng: np.random.Generator, donem: int, toplam_varlik: np.ndarray) -> dict:
+    k = {ad: rng.uniform(5e4, 2e6, donem) for ad in KAYNAK_KALEMLERI}
+    k["TOTAL CURRENT LIABILITIES"] = sum(k[ad] for ad in KAYNAK_KALEMLERI[:8])
+    k["TOTAL NON CURRENT LIABILITIES"] = k["Long term borrowings"] + k["Long term lease liabilities"]
+    k["TOTAL EQUITY"] = toplam_varlik - k["TOTAL CURRENT LIABILITIES"] - k["TOTAL NON CURRENT LIABILITIES"]
+    return k
+
+
+def _gelir(rng: np.random.Generator, donem: int) -> dict:
+    k = {"Revenue": rng.uniform(1e7, 5e7, donem)}
+    k["Cost of sales (-)"] = -k["Revenue"] * rng.uniform(0.5, 0.7, donem)
+    k["Gross profit / (loss)"] = k["Revenue"] + k["Cost of sales (-)"]
+    for ad in GELIR_KALEMLERI[3:6]:
+        k[ad] = -k["Revenue"] * rng.uniform(0.02, 0.08, donem)
+    k["Operating profit / (loss)"] = k["Gross profit / (loss)"] + sum(k[ad] for ad in GELIR_KALEMLERI[3:6])
+    k["Financial income"] = rng.uniform(1e5, 1e6, donem)
+    k["Financial expense (-)"] = -rng.uniform(1e5, 1e6, donem)
+    k["Profit / (loss) before tax"] = (k["Operating profit / (loss)"] + k["Financial income"]
+                                       + k["Financial expense (-)"])
+    k["Current tax expense for the year"] = -k["Profit / (loss) before tax"] * 0.25
+    k["Profit / (loss) for the period"] = k["Profit / (loss) before tax"] + k["Current tax expense for the year"]
+    k["Earnings per share from continuing operations"] = rng.uniform(0.5, 5, donem).round(2)
+    return k
+
+
+def _doldur(rng: np.random.Generator, kalemler: dict, satir: int, donem: int) -> List[list]:
+    """Kalemleri sırasıyla, aralarına rastgele yerleştirilmiş dolgu kalemleriyle satir satıra tamamlar"""
+    satirlar = [[ad, *degerler] for ad, degerler in kalemler.items()]
+    for i in range(max(0, satir - len(satirlar))):
+        yer = int(rng.integers(0, len(satirlar) + 1))
+        satirlar.insert(yer, [f"Other item {i + 1}", *rng.uniform(-1e6, 1e6, donem)])
+    return satirlar
+
+
+def tablolari_uret(satir: int = 40, donem: int = 2, tablo: int = 3, seed: int = 0) -> List[Tuple[str, Tablo]]:
+    """
+    Sentetik tabloları üretir
+
+    Parametreler:
+        satir: Tablo başına en az satır sayısı (zorunlu kalemler her zaman yer alır)
+        donem: Dönem (değer sütunu) sayısı
+        tablo: Tablo sayısı (en az 3: varlıklar, kaynaklar, gelir tablosu)
+        seed: Rastgele sayı üreteci tohumu
+
+    Dönüş:
+        (tablo adı, (başlık, satırlar)) listesi; değerler float
+    """
+    if tablo < 3:
+        raise ValueError("En az 3 tablo (varlıklar, kaynaklar, gelir tablosu) gerekir")
+    rng = np.random.default_rng(seed)
+    varliklar = _varliklar(rng, donem)
+    kaynaklar = _kaynaklar(rng, donem, varliklar["TOTAL ASSETS"])
+    gelir = _gelir(rng, donem)
+
+    bilanco_basligi = ["Item", *bilanco_donemleri(donem)]
+    tablolar = [
+        ("Varliklar", (bilanco_basligi, _doldur(rng, varliklar, satir, donem))),
+        ("Kaynaklar", (bilanco_basligi, _doldur(rng, kaynaklar, satir, donem))),
+        ("Gelir", (["Item", *gelir_donemleri(donem)], _doldur(rng, gelir, satir, donem))),
+    ]
+    for i in range(3, tablo):
+        tablolar.append((f"Dipnot {i - 2}", (bilanco_basligi, _doldur(rng, {}, satir, donem))))
+    return tablolar
+
+
+def projeksiyon_degerleri(tablolar: List[Tuple[str, Tablo]], yil: int = 5, wacc: float = 0.1318,
+                          buyume: float = 0.08) -> np.ndarray:
+    """
+    DCF sayfasının yıllık tahmin tablosu için girdiler (Projeksiyon matrisi)
+
+    Faaliyet karı gelir tablosunun son dönem faaliyet karından başlayıp yılda
+    buyume oranında artar; amortisman, vergi, ΔNWC ve capex onun sabit
+    oranlarıdır, böylece FCF (faaliyet karının %65'i) ve terminal değer pozitiftir.
+
+    Dönüş:
+        len(PROJEKSIYON_KALEMLERI) x yil matris (indirgeme 1 / (1 + wacc) ** t)
+    """
+    _, satirlar = dict(tablolar)["Gelir"]
+    faaliyet_kari = next(satir[-1] for satir in satirlar if satir[0] == "Operating profit / (loss)")
+    yillar = np.arange(1, yil + 1, dtype=np.float64)
+    kar = faaliyet_kari * (1 + buyume) ** yillar
+    kalemler = {
+        "faaliyet_kari": kar,
+        "amortisman": kar * 0.10,
+        "odenen_vergi": kar * 0.25,
+        "delta_nwc": kar * 0.05,
+        "capex": kar * 0.15,
+        "indirgeme": (1 + wacc) ** -yillar,
+    }
+    return np.array([kalemler[ad] for ad in PROJEKSIYON_KALEMLERI])
+
+
+def _metin(deger: float) -> str:
+    """Word tablolarındaki biçim: binlik ayracı nokta, negatifler parantez içinde ("(1.234)")"""
+    metin = f"{abs(deger):,.0f}".replace(",", ".")
+    return f"({metin})" if deger < 0 else metin
+
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+_DOCX_PARCALARI = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="word/document.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _paragraf(metin: str) -> str:
+    return f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(metin)}</w:t></w:r></w:p>"
+
+
+def docx_baytlari(tablolar: List[Tuple[str, Tablo]]) -> bytes:
+    """
+    Tabloları, aralarında birer paragraf olan bir Word belgesine yazar
+
+    document.xml doğrudan üretilir; python-docx ile hücre hücre yazmak büyük
+    tablolarda (5 x 1000 satır x 10 dönem) ~15 sn sürer, bu yol ~0,2 sn.
+    """
+    parcalar = [f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document xmlns:w="{_W}"><w:body>']
+    for ad, (baslik, satirlar) in tablolar:
+        parcalar.append(_paragraf(ad))
+        parcalar.append("<w:tbl><w:tblPr><w:tblW w:w=\"0\" w:type=\"auto\"/></w:tblPr><w:tblGrid>")
+        parcalar.append("<w:gridCol/>" * len(baslik))
+        parcalar.append("</w:tblGrid>")
+        metin_satirlari = [baslik] + [
+            # Hisse başı kar gibi küçük değerler kuruşlu yazılır
+            [satir[0], *(_metin(d) if abs(d) >= 100 else f"{d:.2f}".replace(".", ",") for d in satir[1:])]
+            for satir in satirlar
+        ]
+        for satir in metin_satirlari:
+            parcalar.append("<w:tr>")
+            parcalar.extend(f"<w:tc>{_paragraf(hucre)}</w:tc>" for hucre in satir)
+            parcalar.append("</w:tr>")
+        parcalar.append("</w:tbl>")
+    parcalar.append("<w:sectPr/></w:body></w:document>")
+
+    tampon = io.BytesIO()
+    with zipfile.ZipFile(tampon, "w", zipfile.ZIP_DEFLATED) as arsiv:
+        for yol, icerik in _DOCX_PARCALARI.items():
+            arsiv.writestr(yol, icerik)
+        arsiv.writestr("word/document.xml", "".join(parcalar))
+    return tampon.getvalue()
+
+
+def xlsx_baytlari(tablolar: List[Tuple[str, Tablo]]) -> bytes:
+    """Her tabloyu ayrı bir sayfaya sayısal hücrelerle yazar"""
+    from openpyxl import Workbook
+
+    kitap = Workbook(write_only=True)
+    for ad, (baslik, satirlar) in tablolar:
+        sayfa = kitap.create_sheet(ad)
+        sayfa.append(baslik)
+        for satir in satirlar:
+            sayfa.append([satir[0], *(round(float(deger), 2) for deger in satir[1:])])
+    tampon = io.BytesIO()
+    kitap.save(tampon)
+    return tampon.getvalue()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--cikti", required=True, help=".docx veya .xlsx dosya yolu")
+    parser.add_argument("--satir", type=int, default=40, help="Tablo başına satır sayısı")
+    parser.add_argument("--donem", type=int, default=2, help="Dönem sütunu sayısı")
+    parser.add_argument("--tablo", type=int, default=3, help="Tablo sayısı (en az 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    tablolar = tablolari_uret(args.satir, args.donem, args.tablo, args.seed)
+    if args.cikti.lower().endswith(".xlsx"):
+        veri = xlsx_baytlari(tablolar)
+    elif args.cikti.lower().endswith(".docx"):
+        veri = docx_baytlari(tablolar)
+    else:
+        parser.error("Çıktı .docx veya .xlsx olmalıdır")
+    with open(args.cikti, "wb") as f:
+        f.write(veri)
+    print(f"{args.cikti}: {len(veri) / 1024:.0f} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,16 @@
+import os
+
+# Sunucuda ekran yok; matplotlib pyplot import edilmeden Agg ile başlar (çizim
+# süreçleri de ortam değişkenini devralır)
+os.environ.setdefault("MPLBACKEND", "Agg")
+
 import streamlit as st
 import re
-import tempfile
-import fpdf
-from modules.data_extractor import extract_tables_from_docx
-from modules.webScrapping import fetch_hisse_lotlari
+import numpy as np
+import pandas as pd
+from modules.cache import extract_parsed_tables_cached
+from modules.financial_statement import FinancialStatement
+from modules.prefetch import oturum_gorevi, sonucu_al
 from modules.ratio_calculator import (
     fk_orani, 
     fd_divide_favok as fddividefavok, 
@@ -15,14 +22,28 @@ from modules.ratio_calculator import (
     aktifkarlilik, 
     ozsermayekarliligi, 
     alacakdevirhizi, 
-    stokdevirhizi
+    stokdevirhizi,
+    RatioEngine
 )
-from modules.dcf_model import nwcdegisim, capex, vergiorani, fcf, bes_yillik_fcf, bes_yillik_indirgeme, terminal_degeri
-from modules.visualization import draw_valuation_multiples_chart, draw_fcf_chart, draw_dcf_chart, draw_terminal_value_chart, draw_liquidity_chart, draw_debt_chart, draw_profitability_chart, draw_activity_chart, draw_financial_metrics_chart, create_pdf_report
+from modules.dcf_model import nwcdegisim, capex, vergiorani, fcf, bes_yillik_fcf, bes_yillik_indirgeme, terminal_degeri, duyarlilik_izgarasi
+from modules.monte_carlo import monte_carlo_dcf
+from modules.projection import Projeksiyon
+from modules.tracing import IZLEME_DOSYASI_ORTAM_DEGISKENI, baslat as izlemeyi_baslat, olcum, ortamdan_acik
+
+# Ağır bağımlılıkları olan modüller (requests / bs4 / lxml, matplotlib, fpdf)
+# açılışta değil, kullanıldıkları modül sayfasında import edilir
 
 
 st.set_page_config(page_title="Finansal Analiz", layout="wide")
 
+# Çarpan modülünde önceden başlatılmış lot isteğinin en fazla beklenme süresi (sn)
+LOT_BEKLEME_SURESI = 15
+# Başarısız lot isteğinin aynı oturumda en erken tekrarlanacağı süre (sn)
+LOT_YENIDEN_DENEME_SURESI = 60
+
+# Duyarlılık tablosunun üçüncü ekseni: 1. yıl faaliyet karı değişimleri (%)
+DUYARLILIK_FK_DEGISIMLERI = [-30, -20, -10, 0, 10, 20, 30]
+
 def format_number(value, decimal_places=2):
     """Sayıyı binlik ayraçlarıyla formatlar"""
     try:
@@ -33,9 +54,37 @@ def format_number(value, decimal_places=2):
         return value
 
 
+def onbellekli_hisse_lotlari():
+    """Lot önbelleğini (requests / bs4 / lxml) çağrıldığı thread'de, ilk kullanımda import eder"""
+    from modules.lot_cache import onbellekli_hisse_lotlari as getir
+    return getir()
+
+
+def dis_verileri_onceden_getir():
+    """
+    Dış kaynak isteklerini (lot bilgisi) sayfa yüklenir yüklenmez arka planda
+    başlatır; biten görevlerin sonuçları session_state'e yazılır
+    """
+    gorevler = st.session_state.setdefault('onceden_getirilenler', {})
+    # İlk yüklemede başlatılır; başarısız deneme her yeniden çalıştırmada değil,
+    # LOT_YENIDEN_DENEME_SURESI dolduktan sonra tekrarlanır
+    oturum_gorevi(gorevler, 'hisse_lotlari', onbellekli_hisse_lotlari,
+                  basarisiz_sonuc=(None, None), yeniden_deneme=LOT_YENIDEN_DENEME_SURESI)
+
+    for ad, future in gorevler.items():
+        if future.done():
+            st.session_state[ad] = sonucu_al(future)
+
+
 def get_hisse_lotlari():
     try:
-        lot_data = fetch_hisse_lotlari()
+        # Lot bilgisi sayfa yüklenirken başlatılan arka plan görevinden gelir
+        gorev = st.session_state.get('onceden_getirilenler', {}).get('hisse_lotlari')
+        if gorev is not None:
+            lot_data = sonucu_al(gorev, timeout=LOT_BEKLEME_SURESI, varsayilan=(None, None))
+        else:
+            lot_data = onbellekli_hisse_lotlari()
+        st.session_state['hisse_lotlari'] = lot_data
         
         if isinstance(lot_data, (tuple, list)):
             pay = lot_data[0] if len(lot_data) > 0 else 0
@@ -51,22 +100,36 @@ def get_hisse_lotlari():
         st.error(f"Hata: {str(e)}")
         return 0, 0
 
-def clean_numeric(value):
-    """Binlik ayraçlı ve parantezli değerleri float'a çevirir"""
-    if isinstance(value, str):
-        value = value.strip()
-        if value.startswith('(') and value.endswith(')'):
-            value = '-' + value[1:-1]  
-        value = value.replace('.', '').replace(',', '.')  
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return 0.0
-
+def grafigi_goster(cizimler, ad, basliklar, rapordakiler):
+    """grafikleri_ciz çıktısındaki grafiği gösterir ve adını rapora eklenecekler listesine ekler"""
+    png, hata = cizimler[ad]
+    if hata:
+        st.error(f"{basliklar[ad]} grafiği oluşturulurken hata: {hata}")
+    elif png:
+        st.image(png)
+        rapordakiler.append(ad)
 
 st.title("📊 Finansal Analiz Otomasyonu")
 
-uploaded_file = st.file_uploader("Word dosyasını yükleyin (.docx)", type=["docx"])
+# Aşama süreleri ve bellek tepesi; kapalıyken olcum() bloklarında ölçüm yapılmaz
+izleme_acik = st.sidebar.checkbox(
+    "⏱️ Performans İzleme",
+    value=ortamdan_acik(),
+    key="izleme_acik",
+    help="Dosya okuma, kalem çözümleme, hesaplama, grafik ve rapor aşamalarının sürelerini gösterir"
+)
+izleme_bellek = izleme_acik and st.sidebar.checkbox(
+    "Bellek tepesi (tracemalloc)",
+    value=True,
+    key="izleme_bellek",
+    help="Açıkken tüm ayırmalar izlenir ve ölçülen süreler uzar (PDF raporu ~4 kat)"
+)
+izleyici = izlemeyi_baslat(izleme_acik, dosya=os.environ.get(IZLEME_DOSYASI_ORTAM_DEGISKENI), bellek=izleme_bellek)
+
+# Ağ istekleri belge ayrıştırılırken arka planda sürer
+dis_verileri_onceden_getir()
+
+uploaded_file = st.file_uploader("Word veya Excel dosyasını yükleyin (.docx, .xlsx)", type=["docx", "xlsx"])
 
 kisaVadeli = 0.0
 uzun_vadeli_borclanma_kisa_vadeli = 0.0
@@ -81,22 +144,33 @@ ozSermaye = 0.0
 
 if uploaded_file:
     try:
-        tables = extract_tables_from_docx(uploaded_file)
+        # Aynı içerik yeniden çalıştırmalarda tekrar ayrıştırılmaz
+        with olcum("dosya_okuma", dosya=uploaded_file.name):
+            parsed_tables = extract_parsed_tables_cached(uploaded_file)
+        tables = [table.raw for table in parsed_tables]
         if not tables:
             st.warning("Dosyada tablo bulunamadı.")
         else:
-            for i, df in enumerate(tables):
-                st.subheader(f"📋 Tablo {i+1}")
-                st.dataframe(df, use_container_width=True)
-
-                csv = df.to_csv(index=False).encode("utf-8")
-                st.download_button(
-                    f"📥 Tablo {i+1} indir (CSV)",
-                    csv,
-                    f"tablo_{i+1}.csv",
-                    "text/csv",
-                    key=f"download_{i}"
-                )
+            # Kalem aramaları için tablolar bir kez indekslenir
+            with olcum("kalem_indeksleme"):
+                statements = [FinancialStatement.from_parsed(table) for table in parsed_tables[:3]]
+            varliklar = statements[0]
+            kaynaklar = statements[1] if len(statements) > 1 else None
+            gelir = statements[2] if len(statements) > 2 else None
+
+            with olcum("tablo_gosterimi", tablo=len(tables)):
+                for i, df in enumerate(tables):
+                    st.subheader(f"📋 Tablo {i+1}")
+                    st.dataframe(df, use_container_width=True)
+
+                    csv = df.to_csv(index=False).encode("utf-8")
+                    st.download_button(
+                        f"📥 Tablo {i+1} indir (CSV)",
+                        csv,
+                        f"tablo_{i+1}.csv",
+                        "text/csv",
+                        key=f"download_{i}"
+                    )
                 
             
       
@@ -169,160 +243,158 @@ if uploaded_file:
             else:
                 st.warning("Gelir tablosunda dönem bilgisi bulunamadı.")
 
-            try:
-                if len(tables) > 1:
-                    df2 = tables[1]
-                    try:
-                        kisaVadeli = clean_numeric(df2.loc[df2.iloc[:, 0] == "Short term borrowings", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Short term borrowings bulunamadı")
-                    try:
-                        kisaVadeliYukumlulukler = clean_numeric(df2.loc[df2.iloc[:, 0] == "TOTAL CURRENT LIABILITIES", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("TOTAL CURRENT LIABILITIES bulunamadı")
-                    try:
-                        uzunVadeliYukumlulukler = clean_numeric(df2.loc[df2.iloc[:, 0] == "TOTAL NON CURRENT LIABILITIES", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("TOTAL NON CURRENT LIABILITIES bulunamadı")
-                    try:
-                        calisanlaraIliskinYukumlulukler = clean_numeric(df2.loc[df2.iloc[:, 0] == "Liabilities for employee benefits", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Liabilities for employee benefits bulunamadı")
-                    try:
-                        kiralama_borclarinin_kisa_vadeli_kismi = clean_numeric(df2.loc[df2.iloc[:, 0] == "Lease liabilities", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Lease liabilities bulunamadı")
-                    try:
-                        uzun_vadeli_kiralama_borclari = clean_numeric(df2.loc[df2.iloc[:, 0] == "Long term lease liabilities", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Long term lease liabilities bulunamadı")
-                    try:
-                        uzun_vadeli_borclanma_kisa_vadeli = clean_numeric(df2.loc[df2.iloc[:, 0] == "Short term portion of long term borrowings", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Short term portion of long term borrowings bulunamadı")
-                    try:
-                        uzunVadeliBorc = clean_numeric(df2.loc[df2.iloc[:, 0] == "Long term borrowings", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Long term borrowings bulunamadı")
-                    try:
-                        ticariBorclar = clean_numeric(df2.loc[df2.iloc[:, 0] == "Trade payables", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Trade payables bulunamadı")    
-                    try:
-                        digerBorclar = clean_numeric(df2.loc[df2.iloc[:, 0] == "Other payables", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Other payables bulunamadı")   
-                    try:
-                        ertelenmisGelirler = clean_numeric(df2.loc[df2.iloc[:, 0] == "Deferred income to third parties", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Deferred income to third parties bulunamadı")   
-                    try:
-                        kisaVadeliKarsiliklar = clean_numeric(df2.loc[df2.iloc[:, 0] == "Short term provisions", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Short term provisions bulunamadı")                  
-                    try:
-                        ozKaynak = clean_numeric(df2.loc[df2.iloc[:, 0] == "TOTAL EQUITY", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("TOTAL EQUITY bulunamadı")
+            with olcum("kalem_cozumleme"):
+                try:
+                    if len(tables) > 1:
+                        try:
+                            kisaVadeli = kaynaklar.get("Short term borrowings", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Short term borrowings bulunamadı")
+                        try:
+                            kisaVadeliYukumlulukler = kaynaklar.get("TOTAL CURRENT LIABILITIES", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("TOTAL CURRENT LIABILITIES bulunamadı")
+                        try:
+                            uzunVadeliYukumlulukler = kaynaklar.get("TOTAL NON CURRENT LIABILITIES", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("TOTAL NON CURRENT LIABILITIES bulunamadı")
+                        try:
+                            calisanlaraIliskinYukumlulukler = kaynaklar.get("Liabilities for employee benefits", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Liabilities for employee benefits bulunamadı")
+                        try:
+                            kiralama_borclarinin_kisa_vadeli_kismi = kaynaklar.get("Lease liabilities", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Lease liabilities bulunamadı")
+                        try:
+                            uzun_vadeli_kiralama_borclari = kaynaklar.get("Long term lease liabilities", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Long term lease liabilities bulunamadı")
+                        try:
+                            uzun_vadeli_borclanma_kisa_vadeli = kaynaklar.get("Short term portion of long term borrowings", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Short term portion of long term borrowings bulunamadı")
+                        try:
+                            uzunVadeliBorc = kaynaklar.get("Long term borrowings", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Long term borrowings bulunamadı")
+                        try:
+                            ticariBorclar = kaynaklar.get("Trade payables", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Trade payables bulunamadı")    
+                        try:
+                            digerBorclar = kaynaklar.get("Other payables", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Other payables bulunamadı")   
+                        try:
+                            ertelenmisGelirler = kaynaklar.get("Deferred income to third parties", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Deferred income to third parties bulunamadı")   
+                        try:
+                            kisaVadeliKarsiliklar = kaynaklar.get("Short term provisions", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Short term provisions bulunamadı")                  
+                        try:
+                            ozKaynak = kaynaklar.get("TOTAL EQUITY", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("TOTAL EQUITY bulunamadı")
                 
-                if len(tables) > 0:
-                    df1 = tables[0]
-                    try:
-                        nakitVb = clean_numeric(df1.loc[df1.iloc[:, 0] == "Cash and cash equivalents", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Cash and cash equivalents bulunamadı")
-                    try:
-                        ticariAlacaklar_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "Trade receivables", selected_period_end].values[0])
-                        ticariAlacaklar_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "Trade receivables", selected_period_start].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Trade receivables bulunamadı")
-                    try:
-                        pesinOdenmisGiderler = clean_numeric(df1.loc[df1.iloc[:, 0] == "Prepaid expenses", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Prepaid expenses bulunamadı")
-                    try:
-                        stoklar_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "Inventories", selected_period_end].values[0])
-                        stoklar_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "Inventories", selected_period_start].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Inventories bulunamadı")  
-                    try:
-                        digerDonenVarliklar = clean_numeric(df1.loc[df1.iloc[:, 0] == "Other current assests", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Other current assests bulunamadı") 
-                    try:
-                        donenVarliklar = clean_numeric(df1.loc[df1.iloc[:, 0] == "TOTAL CURRENT ASSETS", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("TOTAL CURRENT ASSETS bulunamadı")    
-                    try:
-                        duranVarliklar = clean_numeric(df1.loc[df1.iloc[:, 0] == "TOTAL NON CURRENT ASSETS", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("TOTAL NON CURRENT ASSETS bulunamadı")
-                    try:
-                        toplamVarliklar = clean_numeric(df1.loc[df1.iloc[:, 0] == "TOTAL ASSETS", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("TOTAL ASSETS bulunamadı")                           
-                    try:
-                        finansalYatirimlar = clean_numeric(df1.loc[df1.iloc[:, 0] == "Financial investments", selected_period_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Financial investments bulunamadı")
-
-                if len(tables) > 2:
-                    df3 = tables[2]
-                    try:
-                        netKar = clean_numeric(df3.loc[df3.iloc[:, 0] == "Profit / (loss) for the period", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Profit / (loss) for the period bulunamadı")
-                    try:
-                        vergiOncesiFaaliyetKariZarari = clean_numeric(df3.loc[df3.iloc[:, 0] == "Profit / (loss) before tax", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Profit / (loss) before tax bulunamadı")
-                    try:
-                        donemOncesiVergiGelirGideri = clean_numeric(df3.loc[df3.iloc[:, 0] == "Current tax expense for the year", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Current tax expense for the year bulunamadı")
-                    try:
-                        hasilat = clean_numeric(df3.loc[df3.iloc[:, 0] == "Revenue", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Revenue bulunamadı")
-                    try:
-                        finansmanGiderleri = clean_numeric(df3.loc[df3.iloc[:, 0] == "Financial expense (-)", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Financial expense (-) bulunamadı")
-                    try:
-                        finansmanGelirleri = clean_numeric(df3.loc[df3.iloc[:, 0] == "Financial income", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Financial income bulunamadı")
-                    try:
-                        satilanMalinMaliyeti = clean_numeric(df3.loc[df3.iloc[:, 0] == "Cost of sales (-)", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Cost of sales (-) bulunamadı")
-                    try:
-                        brutKar = clean_numeric(df3.loc[df3.iloc[:, 0] == "Gross profit / (loss)", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Gross profit / (loss) bulunamadı")
-                    try:
-                        genelYonetimGiderleri = clean_numeric(df3.loc[df3.iloc[:, 0] == "General and administrative expenses (-)", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("General and administrative expenses (-) bulunamadı")
-                    try:
-                        pazarlamaGiderleri = clean_numeric(df3.loc[df3.iloc[:, 0] == "Selling, marketing and distribution expenses (-)", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Selling, marketing and distribution expenses (-) bulunamadı")
-                    try:
-                        argeGiderleri = clean_numeric(df3.loc[df3.iloc[:, 0] == "Research and development expenses (-)", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Research and development expenses (-) bulunamadı")
-                    try:
-                        amortismanVeItfaPaylari = clean_numeric(df3.loc[df3.iloc[:, 0] == "Operating profit / (loss)", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Operating profit / (loss) bulunamadı")
-                    try:
-                        hisseBasiKar = clean_numeric(df3.loc[df3.iloc[:, 0] == "Earnings per share from continuing operations", selected_period_2_end].values[0])
-                    except (IndexError, KeyError):
-                        st.warning("Earnings per share from continuing operations bulunamadı")
+                    if len(tables) > 0:
+                        try:
+                            nakitVb = varliklar.get("Cash and cash equivalents", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Cash and cash equivalents bulunamadı")
+                        try:
+                            ticariAlacaklar_son = varliklar.get("Trade receivables", selected_period_end)
+                            ticariAlacaklar_bas = varliklar.get("Trade receivables", selected_period_start)
+                        except (IndexError, KeyError):
+                            st.warning("Trade receivables bulunamadı")
+                        try:
+                            pesinOdenmisGiderler = varliklar.get("Prepaid expenses", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Prepaid expenses bulunamadı")
+                        try:
+                            stoklar_son = varliklar.get("Inventories", selected_period_end)
+                            stoklar_bas = varliklar.get("Inventories", selected_period_start)
+                        except (IndexError, KeyError):
+                            st.warning("Inventories bulunamadı")  
+                        try:
+                            digerDonenVarliklar = varliklar.get("Other current assests", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Other current assests bulunamadı") 
+                        try:
+                            donenVarliklar = varliklar.get("TOTAL CURRENT ASSETS", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("TOTAL CURRENT ASSETS bulunamadı")    
+                        try:
+                            duranVarliklar = varliklar.get("TOTAL NON CURRENT ASSETS", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("TOTAL NON CURRENT ASSETS bulunamadı")
+                        try:
+                            toplamVarliklar = varliklar.get("TOTAL ASSETS", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("TOTAL ASSETS bulunamadı")                           
+                        try:
+                            finansalYatirimlar = varliklar.get("Financial investments", selected_period_end)
+                        except (IndexError, KeyError):
+                            st.warning("Financial investments bulunamadı")
+
+                    if len(tables) > 2:
+                        try:
+                            netKar = gelir.get("Profit / (loss) for the period", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Profit / (loss) for the period bulunamadı")
+                        try:
+                            vergiOncesiFaaliyetKariZarari = gelir.get("Profit / (loss) before tax", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Profit / (loss) before tax bulunamadı")
+                        try:
+                            donemOncesiVergiGelirGideri = gelir.get("Current tax expense for the year", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Current tax expense for the year bulunamadı")
+                        try:
+                            hasilat = gelir.get("Revenue", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Revenue bulunamadı")
+                        try:
+                            finansmanGiderleri = gelir.get("Financial expense (-)", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Financial expense (-) bulunamadı")
+                        try:
+                            finansmanGelirleri = gelir.get("Financial income", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Financial income bulunamadı")
+                        try:
+                            satilanMalinMaliyeti = gelir.get("Cost of sales (-)", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Cost of sales (-) bulunamadı")
+                        try:
+                            brutKar = gelir.get("Gross profit / (loss)", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Gross profit / (loss) bulunamadı")
+                        try:
+                            genelYonetimGiderleri = gelir.get("General and administrative expenses (-)", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("General and administrative expenses (-) bulunamadı")
+                        try:
+                            pazarlamaGiderleri = gelir.get("Selling, marketing and distribution expenses (-)", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Selling, marketing and distribution expenses (-) bulunamadı")
+                        try:
+                            argeGiderleri = gelir.get("Research and development expenses (-)", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Research and development expenses (-) bulunamadı")
+                        try:
+                            amortismanVeItfaPaylari = gelir.get("Operating profit / (loss)", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Operating profit / (loss) bulunamadı")
+                        try:
+                            hisseBasiKar = gelir.get("Earnings per share from continuing operations", selected_period_2_end)
+                        except (IndexError, KeyError):
+                            st.warning("Earnings per share from continuing operations bulunamadı")
                         
-            except Exception as e:
-                st.error(f"Tablo verileri işlenirken hata: {str(e)}")
+                except Exception as e:
+                    st.error(f"Tablo verileri işlenirken hata: {str(e)}")
 
     except Exception as e:
         st.error(f"Dosya işlenirken hata: {str(e)}")
@@ -347,31 +419,53 @@ if st.session_state.get('show_module', False) and uploaded_file:
         
   
         piyasa_fiyati = st.number_input("Piyasa Fiyatı (USD)", value=10.0, min_value=0.0, key="piyasa_fiyati")
-        pay_lot, ek_pay_lot = get_hisse_lotlari()
+        with olcum("lot_bilgisi"):
+            pay_lot, ek_pay_lot = get_hisse_lotlari()
+
+        from modules.lot_cache import lot_devre_durumu
+
+        # Kaynak ulaşılamazken (devre açık) veya lot bilgisi yokken hisse sayısı elle girilir
+        lot_devresi = lot_devre_durumu()
+        if lot_devresi['kalan_sure'] > 0 or (pay_lot is None and ek_pay_lot is None):
+            if lot_devresi['kalan_sure'] > 0:
+                st.warning(f"Lot bilgisi kaynağına ulaşılamıyor, {lot_devresi['kalan_sure']:.0f} sn boyunca yeniden denenmeyecek. "
+                           "Hesaplamada aşağıdaki hisse sayısı kullanılır.")
+            else:
+                st.warning("Lot bilgisi alınamadı. Hesaplamada aşağıdaki hisse sayısı kullanılır.")
+            manuel_hisse_sayisi = st.number_input(
+                "Toplam Hisse Sayısı (Lot)",
+                min_value=0,
+                value=int((pay_lot or 0) + (ek_pay_lot or 0)),
+                step=1,
+                key="manuel_hisse_sayisi"
+            )
+            pay_lot, ek_pay_lot = manuel_hisse_sayisi, 0
+        pay_lot, ek_pay_lot = pay_lot or 0, ek_pay_lot or 0
 
         if st.button("Hesapla", key="hesapla_button"):
             try:
-                toplam_hisse = pay_lot + ek_pay_lot
+                with olcum("carpan_hesaplama"):
+                    toplam_hisse = pay_lot + ek_pay_lot
                 
-                hisseBasiKar = hisseBasiKar/10
-                fk = fk_orani(piyasa_fiyati, hisseBasiKar)
-                fd_favok = fddividefavok(  
-                    kisaVadeli, 
-                    uzun_vadeli_borclanma_kisa_vadeli, 
-                    kiralama_borclarinin_kisa_vadeli_kismi,
-                    uzunVadeliBorc, 
-                    uzun_vadeli_kiralama_borclari,
-                    netKar, 
-                    finansmanGiderleri, 
-                    amortismanVeItfaPaylari,
-                    donemOncesiVergiGelirGideri, 
-                    piyasa_fiyati,  
-                    toplam_hisse, 
-                    nakitVb, 
-                    finansalYatirimlar
-                )           
-                pd_dd = pd_divided_dd(pay_lot, ek_pay_lot, piyasa_fiyati, ozKaynak)
-                favok = netKar + donemOncesiVergiGelirGideri + finansmanGiderleri + amortismanVeItfaPaylari
+                    hisseBasiKar = hisseBasiKar/10
+                    fk = fk_orani(piyasa_fiyati, hisseBasiKar)
+                    fd_favok = fddividefavok(  
+                        kisaVadeli, 
+                        uzun_vadeli_borclanma_kisa_vadeli, 
+                        kiralama_borclarinin_kisa_vadeli_kismi,
+                        uzunVadeliBorc, 
+                        uzun_vadeli_kiralama_borclari,
+                        netKar, 
+                        finansmanGiderleri, 
+                        amortismanVeItfaPaylari,
+                        donemOncesiVergiGelirGideri, 
+                        piyasa_fiyati,  
+                        toplam_hisse, 
+                        nakitVb, 
+                        finansalYatirimlar
+                    )           
+                    pd_dd = pd_divided_dd(pay_lot, ek_pay_lot, piyasa_fiyati, ozKaynak)
+                    favok = netKar + donemOncesiVergiGelirGideri + finansmanGiderleri + amortismanVeItfaPaylari
 
              
                 col1, col2, col3 = st.columns(3)
@@ -406,6 +500,8 @@ if st.session_state.get('show_module', False) and uploaded_file:
                 st.error(f"Hesaplama hatası: {str(e)}")
                 
     elif st.session_state['selected_module'] == "DCF / İNA Hesaplama":
+        from modules.charts import grafik_verileri, grafikleri_ciz
+
         st.title("📊 DCF / İNA Hesaplama")
     
     
@@ -428,30 +524,6 @@ if st.session_state.get('show_module', False) and uploaded_file:
                 index=0,
                 key="dcf_period_end"
             )
-            stoklar_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "Inventories", period_end].values[0])
-
-            ticariAlacaklar_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "Trade receivables", period_end].values[0])
-
-            pesinOdenmisGiderler_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "Prepaid expenses", period_end].values[0])
-
-            ticariBorclar_son = clean_numeric(df2.loc[df2.iloc[:, 0] == "Trade payables", period_end].values[0])
-
-            pesinOdenmisGiderler_son = clean_numeric(df2.loc[df2.iloc[:, 0] == "Trade payables", period_end].values[0])
-
-            ertelenmisGelirler_son = clean_numeric(df2.loc[df2.iloc[:, 0] == "Deferred income to third parties", period_end].values[0])
-  
-            digerDonenVarliklar_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "Other current assests", period_end].values[0])
-  
-            maddiDuranVarlik_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "Property, plant and equipment", period_end].values[0])
-
-            maddiOlmayanDuranVarlik_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "Intangible assets", period_end].values[0])
-
-            donenVarliklar_son = clean_numeric(df1.loc[df1.iloc[:, 0] == "TOTAL CURRENT ASSETS", period_end].values[0])
-
-            kisaVadeliYukumlulukler_son = clean_numeric(df2.loc[df2.iloc[:, 0] == "TOTAL CURRENT LIABILITIES", period_end].values[0])
-
-            digerBorclar_son = clean_numeric(df2.loc[df2.iloc[:, 0] == "Other payables", period_end].values[0])
-
 
     
         with col2:
@@ -468,27 +540,28 @@ if st.session_state.get('show_module', False) and uploaded_file:
                     index=0,
                     key="dcf_period_start"
                 )
-                stoklar_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "Inventories", period_start].values[0])
-
-                ticariAlacaklar_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "Trade receivables", period_start].values[0])
-
-                pesinOdenmisGiderler_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "Prepaid expenses", period_start].values[0])
-
-                ticariBorclar_bas = clean_numeric(df2.loc[df2.iloc[:, 0] == "Trade payables", period_start].values[0])
 
-                ertelenmisGelirler_bas= clean_numeric(df2.loc[df2.iloc[:, 0] == "Deferred income to third parties", period_start].values[0])
-
-                digerDonenVarliklar_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "Other current assests", period_start].values[0])
-
-                maddiDuranVarlik_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "Property, plant and equipment", period_start].values[0])
-
-                maddiOlmayanDuranVarlik_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "Intangible assets", period_start].values[0])
-
-                donenVarliklar_bas = clean_numeric(df1.loc[df1.iloc[:, 0] == "TOTAL CURRENT ASSETS", period_start].values[0])
-
-                kisaVadeliYukumlulukler_bas = clean_numeric(df2.loc[df2.iloc[:, 0] == "TOTAL CURRENT LIABILITIES", period_start].values[0])
-
-                digerBorclar_bas = clean_numeric(df2.loc[df2.iloc[:, 0] == "Other payables", period_start].values[0])
+        # Dönem sonu ve dönem başı değerleri tek seferde (kalem x dönem dizisi)
+        dcf_donemleri = [period_end] if period_start is None else [period_end, period_start]
+        with olcum("dcf.kalemler"):
+            dcf_varliklar = varliklar.get_many(
+                ["Inventories", "Trade receivables", "Prepaid expenses", "Other current assests",
+                 "Property, plant and equipment", "Intangible assets", "TOTAL CURRENT ASSETS"],
+                dcf_donemleri
+            ).T.tolist()
+            dcf_kaynaklar = kaynaklar.get_many(
+                ["Trade payables", "Deferred income to third parties", "TOTAL CURRENT LIABILITIES", "Other payables"],
+                dcf_donemleri
+            ).T.tolist()
+
+        (stoklar_son, ticariAlacaklar_son, pesinOdenmisGiderler_son, digerDonenVarliklar_son,
+         maddiDuranVarlik_son, maddiOlmayanDuranVarlik_son, donenVarliklar_son) = dcf_varliklar[0]
+        ticariBorclar_son, ertelenmisGelirler_son, kisaVadeliYukumlulukler_son, digerBorclar_son = dcf_kaynaklar[0]
+
+        if period_start is not None:
+            (stoklar_bas, ticariAlacaklar_bas, pesinOdenmisGiderler_bas, digerDonenVarliklar_bas,
+             maddiDuranVarlik_bas, maddiOlmayanDuranVarlik_bas, donenVarliklar_bas) = dcf_varliklar[1]
+            ticariBorclar_bas, ertelenmisGelirler_bas, kisaVadeliYukumlulukler_bas, digerBorclar_bas = dcf_kaynaklar[1]
 
         ebit = brutKar - ((genelYonetimGiderleri+ pazarlamaGiderleri + argeGiderleri)*-1)
 
@@ -518,125 +591,97 @@ if st.session_state.get('show_module', False) and uploaded_file:
         fcfDegeri = fcf(nwcDegisim, capexDegeri, ebit, amortisman, donemOncesiVergiGelirGideri)
         st.success(f"📊 FCF: **{format_number(fcfDegeri, 2)}**")
 
-        st.subheader("Yıllık Faaliyet Karı Tahminleri")
-        faaliyet_kari = []
-        for yil in range(1, 6):
-            faaliyetKari_raw = st.text_input(
-                f"{yil}. Yıl Faaliyet Karı Tahmini (USD)", 
-                value=0,  
-                key=f"faaliyetkari_{yil}"
-            )
-            try:
-                faaliyetKari = int(faaliyetKari_raw.replace(".", "").replace(",", "")) 
-            except ValueError:
-                faaliyetKari = 0
-            faaliyet_kari.append(faaliyetKari)
-
-
-        st.subheader("Yıllık Amortisman Tahminleri")
-        amortisman_degerleri = []
-        for yil in range(1, 6):
-            amortismanRaw = st.text_input(
-                f"{yil}. Yıl Amortisman Tahmini (USD)", 
-                value=0,  
-                key=f"amortisman_{yil}"
-            )
-            try:
-                amortisman = int(amortismanRaw.replace(".", "").replace(",", "")) 
-            except ValueError:
-                amortisman = 0
-            amortisman_degerleri.append(amortisman)
-
-        st.subheader("Yıllık Ödenen Vergi Tahminleri")
-        odenen_vergi = []
-        for yil in range(1, 6):
-            odenenVergiRaw = st.text_input(
-                f"{yil}. Yıl Ödenen Vergi Tahmini (USD)", 
-                value=0,  
-                key=f"odenenvergi_{yil}"
-            )
-            try:
-                odenenVergi = int(odenenVergiRaw.replace(".", "").replace(",", "")) 
-            except ValueError:
-                odenenVergi = 0
-            odenen_vergi.append(odenenVergi)
-
-        st.subheader("Yıllık ΔNWC Tahminleri")
-        delta_NWC = []
-        for yil in range(1, 6):
-            deltaNWCRaw = st.text_input(
-                f"{yil}. Yıl ΔNWC Tahmini (USD)", 
-                value=0,  
-                key=f"deltanwc_{yil}"
-            )
-            try:
-                deltaNWC = int(deltaNWCRaw.replace(".", "").replace(",", ""))
-            except ValueError:
-                deltaNWC = 0
-            delta_NWC.append(deltaNWC)
-
-        st.subheader("Yıllık Capex Tahminleri")
-        capex_degerleri = []
-        for yil in range(1, 6):
-            capexRaw_= st.text_input(
-                f"{yil}. Yıl Capex Tahmini (USD)", 
-                value=0,  
-                key=f"capex_{yil}"
-            )
-            try:
-                capex_ = int(capexRaw_.replace(".", "").replace(",", ""))
-            except ValueError:
-                capex_ = 0
-            capex_degerleri.append(capex_)
-
+        wacc = 0.1318  # Varsayılan WACC değeri
 
-        terminal_buyume = st.session_state.get('terminal_buyume')
         terminal_buyume = st.number_input(  
-        "Terminal Büyüme Oranı (%) (10. yıldan sonra)", 
+        "Terminal Büyüme Oranı (%) (projeksiyon döneminden sonra)", 
             min_value=0.0, 
             max_value=100.0, 
             step=0.1, 
             value=2.5
         ) / 100
 
+        st.subheader("Projeksiyon Varsayımları")
+        pj_col1, pj_col2, pj_col3 = st.columns(3)
+        with pj_col1:
+            projeksiyon_yili = int(st.number_input(
+                "Açık Tahmin Süresi (Yıl)", min_value=1, max_value=30, value=5, step=1, key="projeksiyon_yili"
+            ))
+        with pj_col2:
+            ikinci_asama_yili = int(st.number_input(
+                "İkinci Aşama Süresi (Yıl)", min_value=0, max_value=30, value=0, step=1, key="ikinci_asama_yili",
+                help="Açık tahminlerden sonra büyümenin terminal orana doğru azaldığı yıl sayısı (0 = tek aşama)"
+            ))
+        with pj_col3:
+            ikinci_asama_buyume = st.number_input(
+                "İkinci Aşama Başlangıç Büyümesi (%)", value=10.0, step=0.5, key="ikinci_asama_buyume",
+                disabled=ikinci_asama_yili == 0
+            ) / 100
+
+        # Tüm yıllık tahminler tek bir tablo widget'ında düzenlenir; yıl sayısı
+        # değişince son girilen değerler yeni süreye taşınır
+        son_girdiler = st.session_state.get('projeksiyon_girdileri')
+        projeksiyon_tabani = st.session_state.get('projeksiyon_tabani')
+        if projeksiyon_tabani is None or projeksiyon_tabani.shape[1] != projeksiyon_yili:
+            projeksiyon_tabani = Projeksiyon.bos(projeksiyon_yili).degerler
+            if son_girdiler is not None:
+                ortak = min(son_girdiler.shape[1], projeksiyon_yili)
+                projeksiyon_tabani[:, :ortak] = son_girdiler[:, :ortak]
+            st.session_state['projeksiyon_tabani'] = projeksiyon_tabani
+
+        st.subheader("Yıllık Tahminler")
+        projeksiyon_tablosu = st.data_editor(
+            Projeksiyon(projeksiyon_tabani).to_frame(),
+            use_container_width=True,
+            key=f"projeksiyon_tablosu_{projeksiyon_yili}"
+        )
+        projeksiyon = Projeksiyon.from_frame(projeksiyon_tablosu)
+        st.session_state['projeksiyon_girdileri'] = projeksiyon.degerler
 
-        besYillikfcf = bes_yillik_fcf(faaliyet_kari, amortisman_degerleri, odenen_vergi, delta_NWC, capex_degerleri)
+        if ikinci_asama_yili > 0:
+            projeksiyon = projeksiyon.iki_asamali(
+                projeksiyon_yili + ikinci_asama_yili, terminal_buyume, wacc, baslangic_buyume=ikinci_asama_buyume
+            )
+            with st.expander("İki Aşamalı Projeksiyon Tablosu"):
+                st.dataframe(projeksiyon.to_frame(), use_container_width=True)
+        st.session_state['projeksiyon'] = projeksiyon.degerler
+
+        yil_sayisi = projeksiyon.yil_sayisi
+        faaliyet_kari = projeksiyon.kalem("faaliyet_kari").tolist()
+        indirgeme_degerleri = projeksiyon.kalem("indirgeme").tolist()
+
+        with olcum("dcf.projeksiyon", yil=yil_sayisi):
+            besYillikfcf = bes_yillik_fcf(
+                faaliyet_kari,
+                projeksiyon.kalem("amortisman").tolist(),
+                projeksiyon.kalem("odenen_vergi").tolist(),
+                projeksiyon.kalem("delta_nwc").tolist(),
+                projeksiyon.kalem("capex").tolist()
+            )
 
         terminal_fcf = besYillikfcf[-1] * (1 + terminal_buyume)
 
+        besYillikIndirgemeliDegerler = bes_yillik_indirgeme(besYillikfcf, indirgeme_degerleri)
 
-        st.success("📊 5 Yıllık FCF Tahminleri:")
-        for yil, fcf in enumerate(besYillikfcf, 1):
-            st.success(f"{yil}. Yıl FCF: {format_number(fcf, 2)}")
+        st.success(f"📊 {yil_sayisi} Yıllık FCF Tahminleri:")
+        st.dataframe(
+            pd.DataFrame(
+                {"FCF": besYillikfcf, "Bugünkü Değer (NPV)": besYillikIndirgemeliDegerler},
+                index=[f"{yil}. Yıl" for yil in range(1, yil_sayisi + 1)]
+            ).map(format_number),
+            use_container_width=True
+        )
 
-        st.success(f"Terminal FCF (5. Yıl Sonrası): {terminal_fcf:.2f}")
+        st.success(f"Terminal FCF ({yil_sayisi}. Yıl Sonrası): {terminal_fcf:.2f}")
       
         st.session_state['besYillikfcf'] = besYillikfcf
         st.session_state['terminal_fcf'] = terminal_fcf 
-        st.subheader("Yıllık İndirgeme Oranı")
-        indirgeme_degerleri = []
-        for yil in range(1, 6):
-            indirgeme_orani = st.number_input(
-                f"{yil}. Yıl İndirgeme Oranı (%)", 
-                value=50.0,  
-                min_value=0.0,
-                max_value=100.0,
-                step=0.1,
-                key=f"indirgemeorani_{yil}"
-            )
-            indirgeme_degerleri.append(indirgeme_orani / 100)  
-
-        besYillikIndirgemeliDegerler = bes_yillik_indirgeme(besYillikfcf, indirgeme_degerleri)
         st.session_state['besYillikIndirgemeliDegerler'] = besYillikIndirgemeliDegerler
-        st.success(f"📊 Bugunkü Değerler (NPV): {format_number(besYillikIndirgemeliDegerler, 2)}")
-        npvToplam = 0
-        for i in range(5):
-            npvToplam += besYillikIndirgemeliDegerler[i]
+        npvToplam = sum(besYillikIndirgemeliDegerler)
         st.success(f"📊 Bugunkü Değerler (NPV) Toplamı: {format_number(npvToplam, 2)}")
         netBorc = (kisaVadeli + uzun_vadeli_borclanma_kisa_vadeli + kiralama_borclarinin_kisa_vadeli_kismi + uzunVadeliBorc + uzun_vadeli_kiralama_borclari) - nakitVb - finansalYatirimlar
         st.session_state['netBorc'] = netBorc
         st.success(f"📊 Net Borç : **{format_number(netBorc, 2)}**")
-        wacc = 0.1318  # Varsayılan WACC değeri
         terminalDegeri = terminal_degeri(besYillikfcf, terminal_buyume, wacc)
         st.session_state['terminalDegeri'] = terminalDegeri
         st.success(f"📊 Terminal Değeri: **{format_number(terminalDegeri, 2)}**")
@@ -649,6 +694,117 @@ if st.session_state.get('show_module', False) and uploaded_file:
         st.session_state['toplamFirmaDegeri'] = toplamFirmaDegeri
         st.success(f"📊 Firma Değeri : **{format_number(toplamFirmaDegeri, 2)}**")
 
+        with st.expander("🧮 WACC x Terminal Büyüme Duyarlılık Tablosu"):
+            dt_col1, dt_col2, dt_col3 = st.columns(3)
+            with dt_col1:
+                dt_wacc_alt = st.number_input("WACC Alt Sınırı (%)", value=8.0, step=0.5, key="dt_wacc_alt") / 100
+                dt_wacc_ust = st.number_input("WACC Üst Sınırı (%)", value=18.0, step=0.5, key="dt_wacc_ust") / 100
+            with dt_col2:
+                dt_buyume_alt = st.number_input("Terminal Büyüme Alt Sınırı (%)", value=0.0, step=0.5, key="dt_buyume_alt") / 100
+                dt_buyume_ust = st.number_input("Terminal Büyüme Üst Sınırı (%)", value=6.0, step=0.5, key="dt_buyume_ust") / 100
+            with dt_col3:
+                dt_nokta = st.number_input("Eksen Başına Nokta Sayısı", value=50, min_value=2, max_value=400, step=10, key="dt_nokta")
+                dt_fk_degisim = st.select_slider("1. Yıl Faaliyet Karı Değişimi (%)", options=DUYARLILIK_FK_DEGISIMLERI,
+                                                 value=0, key="dt_fk_degisim")
+
+            dt_wacc = np.linspace(dt_wacc_alt, dt_wacc_ust, int(dt_nokta))
+            dt_buyume = np.linspace(dt_buyume_alt, dt_buyume_ust, int(dt_nokta))
+            # Üçüncü eksen (1. yıl faaliyet karı değişimleri) dahil tüm ızgara tek yayınlamada hesaplanır
+            dt_farklar = [faaliyet_kari[0] * degisim / 100 for degisim in DUYARLILIK_FK_DEGISIMLERI]
+            with olcum("dcf.duyarlilik_izgarasi", nokta=int(dt_nokta)):
+                dt_sonuc = duyarlilik_izgarasi(besYillikfcf, dt_wacc, dt_buyume, indirgeme_degerleri,
+                                               net_borc=netBorc, ilk_yil_farklari=dt_farklar)
+            dt_firma_degeri = dt_sonuc['firma_degeri'][DUYARLILIK_FK_DEGISIMLERI.index(dt_fk_degisim)]
+
+            st.session_state['duyarlilik'] = {
+                'wacc': dt_wacc,
+                'buyume': dt_buyume,
+                'firma_degeri': dt_firma_degeri,
+                'secili': (wacc, terminal_buyume),
+            }
+            gecersiz_hucre = int(np.isnan(dt_firma_degeri).sum())
+            if gecersiz_hucre:
+                st.info(f"{gecersiz_hucre} hücrede WACC terminal büyümeden küçük veya eşit olduğu için değer hesaplanmadı (gri).")
+            # Aynı ızgara için ısı haritası önbellekten gelir
+            with olcum("grafik.duyarlilik"):
+                png, hata = grafikleri_ciz(["duyarlilik"], grafik_verileri(st.session_state))["duyarlilik"]
+            if hata:
+                st.error(f"Duyarlılık grafiği oluşturulurken hata: {hata}")
+            elif png:
+                st.image(png)
+
+            dt_tablo = pd.DataFrame(
+                dt_firma_degeri,
+                index=pd.Index(np.round(dt_wacc * 100, 4), name="WACC (%)"),
+                columns=pd.Index(np.round(dt_buyume * 100, 4), name="Terminal Büyüme (%)")
+            )
+            st.download_button(
+                "📥 Duyarlılık Tablosunu İndir (CSV)",
+                dt_tablo.to_csv().encode("utf-8"),
+                "duyarlilik_tablosu.csv",
+                "text/csv",
+                key="dt_download"
+            )
+
+        with st.expander("🎲 Monte Carlo Simülasyonu"):
+            st.caption("WACC, terminal büyüme ve yıllık FCF örneklenerek firma değeri dağılımı hesaplanır. "
+                       "Yıllık indirgeme oranları yukarıdaki değerlerdir.")
+            mc_col1, mc_col2, mc_col3 = st.columns(3)
+            with mc_col1:
+                mc_wacc_ort = st.number_input("WACC Ortalaması (%)", value=wacc * 100, step=0.1, key="mc_wacc_ort") / 100
+                mc_wacc_std = st.number_input("WACC Standart Sapması (%)", value=1.0, min_value=0.0, step=0.1, key="mc_wacc_std") / 100
+            with mc_col2:
+                mc_buyume_alt = st.number_input("Terminal Büyüme Alt Sınırı (%)", value=max(terminal_buyume * 100 - 1, 0.0), step=0.1, key="mc_buyume_alt") / 100
+                mc_buyume_ust = st.number_input("Terminal Büyüme Üst Sınırı (%)", value=terminal_buyume * 100 + 1, step=0.1, key="mc_buyume_ust") / 100
+            with mc_col3:
+                mc_fcf_std = st.number_input("Yıllık FCF Sapması (%)", value=10.0, min_value=0.0, step=1.0, key="mc_fcf_std") / 100
+                mc_piyasa_degeri = st.number_input("Piyasa Değeri (₺)", value=0.0, min_value=0.0, key="mc_piyasa_degeri")
+            mc_col4, mc_col5 = st.columns(2)
+            with mc_col4:
+                mc_cekilis = st.number_input("Çekiliş Sayısı", value=1_000_000, min_value=1_000, step=100_000, key="mc_cekilis")
+            with mc_col5:
+                mc_seed = st.number_input("Tohum (seed)", value=42, min_value=0, step=1, key="mc_seed")
+
+            if st.button("Simülasyonu Çalıştır", key="mc_button"):
+                try:
+                    with olcum("monte_carlo", cekilis=int(mc_cekilis)):
+                        mc_sonuc = monte_carlo_dcf(
+                            besYillikfcf,
+                            {"tur": "normal", "ortalama": mc_wacc_ort, "std": mc_wacc_std},
+                            {"tur": "uniform", "alt": mc_buyume_alt, "ust": mc_buyume_ust},
+                            {"tur": "normal", "ortalama": 0.0, "std": mc_fcf_std},
+                            net_borc=netBorc,
+                            piyasa_degeri=mc_piyasa_degeri if mc_piyasa_degeri > 0 else None,
+                            indirgeme_degerleri=indirgeme_degerleri,
+                            cekilis_sayisi=int(mc_cekilis),
+                            seed=int(mc_seed)
+                        )
+                    # Çekiliş dizisi oturumda tutulmaz, yalnızca özet saklanır
+                    st.session_state['monteCarlo'] = {k: v for k, v in mc_sonuc.items() if k != 'degerler'}
+                except ValueError as e:
+                    st.error(f"Simülasyon hatası: {str(e)}")
+
+            mc_ozet = st.session_state.get('monteCarlo')
+            if mc_ozet:
+                mc_metrik_kolonlari = st.columns(len(mc_ozet['yuzdelikler']))
+                for kolon, (yuzdelik, deger) in zip(mc_metrik_kolonlari, mc_ozet['yuzdelikler'].items()):
+                    kolon.metric(f"P{yuzdelik}", format_number(deger, 0))
+                if mc_ozet['piyasa_degerini_asma_olasiligi'] is not None:
+                    st.success(f"📊 Değerin Piyasa Değerini Aşma Olasılığı: %**{mc_ozet['piyasa_degerini_asma_olasiligi'] * 100:.1f}**")
+                if mc_ozet['gecersiz_oran'] > 0:
+                    mc_uyari = (f"Çekilişlerin %{mc_ozet['gecersiz_oran'] * 100:.2f}'inde WACC terminal büyümeden küçük veya eşit olduğu için "
+                                "değer hesaplanamadı; dağılım ve yüzdelikler yalnızca geçerli çekilişleri kapsar.")
+                    if mc_ozet.get('gecerli_cekilislerde_asma_olasiligi') is not None:
+                        mc_uyari += (" Aşma olasılığında bu çekilişler aşmamış sayıldı; yalnızca geçerli çekilişlerde "
+                                     f"olasılık %{mc_ozet['gecerli_cekilislerde_asma_olasiligi'] * 100:.1f}.")
+                    st.warning(mc_uyari)
+                with olcum("grafik.monte_carlo"):
+                    png, hata = grafikleri_ciz(["monte_carlo"], grafik_verileri(st.session_state))["monte_carlo"]
+                if hata:
+                    st.error(f"Monte Carlo grafiği oluşturulurken hata: {hata}")
+                elif png:
+                    st.image(png)
+
 
     elif st.session_state['selected_module'] == "Finansal Rasyolar ve Analiz":
         st.title("📈 Finansal Rasyolar ve Analiz Modülü")
@@ -685,86 +841,116 @@ if st.session_state.get('show_module', False) and uploaded_file:
         st.session_state['stokDevirHizi'] = stokDevirHizi
         st.success(f"📊 Stok Devir Hızı: **{stokDevirHizi:.2f}**")   
 
+        st.title("📈 Dönemsel Rasyo Trendleri")
+        # Tüm dönemlerin rasyoları tek seferde hesaplanır (sıfır paydalar NaN)
+        with olcum("rasyo_trendleri"):
+            rasyoTrendleri = RatioEngine(varliklar, kaynaklar, gelir).hesapla()
+        st.session_state['rasyoTrendleri'] = rasyoTrendleri
+        if rasyoTrendleri.empty:
+            st.warning("Trend için bilanço dönemi bulunamadı.")
+        else:
+            st.dataframe(rasyoTrendleri.map(format_number), use_container_width=True)
+            secili_rasyolar = st.multiselect(
+                "Grafikte gösterilecek rasyolar",
+                rasyoTrendleri.columns.tolist(),
+                default=rasyoTrendleri.columns[:2].tolist(),
+                key="rasyo_trend_secimi"
+            )
+            if secili_rasyolar and len(rasyoTrendleri) > 1:
+                st.line_chart(rasyoTrendleri[secili_rasyolar])
+
     elif st.session_state['selected_module'] == "Grafik ve Raporlama Modülü":
+        from modules.charts import grafik_verileri, grafikleri_ciz, rapor_goruntuleri
+        from modules.visualization import create_pdf_report
+
         st.title("📊 Grafik ve Raporlama Modülü")
         st.info("Finansal Analiz Grafikleri ve Raporları")
 
-        report_figs = []
+        rapordakiler = []
+
+        # Grafikler oturum durumunun düz değer anlık görüntüsünden, süreç
+        # havuzunda paralel olarak PNG'ye çizilir
+        grafik_verisi = grafik_verileri(st.session_state)
+        rapor_grafikleri = {
+            "carpanlar": "Değerleme Çarpanları",
+            "fcf": f"{len(grafik_verisi['besYillikfcf'])} Yıllık FCF Tahminleri",
+            "dcf": "İndirgemeli Nakit Akımları",
+            "terminal_deger": "Terminal Değer Dağılımı",
+            "likidite": "Likidite Oranları",
+            "borcluluk": "Borçluluk Oranı",
+            "karlilik": "Karlılık Oranları",
+            "faaliyet": "Faaliyet Oranları",
+            "finansal_metrikler": "Finansal Metrikler",
+        }
+        with olcum("grafik_cizimi", grafik=len(rapor_grafikleri)):
+            cizimler = grafikleri_ciz(rapor_grafikleri, grafik_verisi)
 
         st.subheader("📈 Finansal Grafikler")
 
 
         with st.expander("Değerleme Çarpanları"):
-            fig = draw_valuation_multiples_chart()
-            if fig:
-                st.pyplot(fig)
-                report_figs.append(("Değerleme Çarpanları", fig))
+            grafigi_goster(cizimler, "carpanlar", rapor_grafikleri, rapordakiler)
 
         with st.expander("Nakit Akımı Analizi"):
             col1, col2 = st.columns(2)
             with col1:
-                fig = draw_fcf_chart()
-                if fig:
-                    st.pyplot(fig)
-                    report_figs.append(("5 Yıllık FCF Tahminleri", fig))
+                grafigi_goster(cizimler, "fcf", rapor_grafikleri, rapordakiler)
         
             with col2:
-                fig = draw_dcf_chart()
-                if fig:
-                    st.pyplot(fig)
-                    report_figs.append(("İndirgemeli Nakit Akımları", fig))
+                grafigi_goster(cizimler, "dcf", rapor_grafikleri, rapordakiler)
         
-            fig = draw_terminal_value_chart()
-            if fig:
-                st.pyplot(fig)
-                report_figs.append(("Terminal Değer Dağılımı", fig))
+            grafigi_goster(cizimler, "terminal_deger", rapor_grafikleri, rapordakiler)
 
      
         with st.expander("Finansal Oranlar"):
             col1, col2 = st.columns(2)
             with col1:
-                fig = draw_liquidity_chart()
-                if fig:
-                    st.pyplot(fig)
-                    report_figs.append(("Likidite Oranları", fig))
-            
-                fig = draw_debt_chart()
-                if fig:
-                    st.pyplot(fig)
-                    report_figs.append(("Borçluluk Oranı", fig))
+                grafigi_goster(cizimler, "likidite", rapor_grafikleri, rapordakiler)
+                grafigi_goster(cizimler, "borcluluk", rapor_grafikleri, rapordakiler)
         
             with col2:
-                fig = draw_profitability_chart()
-                if fig:
-                    st.pyplot(fig)
-                    report_figs.append(("Karlılık Oranları", fig))
-            
-                fig = draw_activity_chart()
-                if fig:
-                    st.pyplot(fig)
-                    report_figs.append(("Faaliyet Oranları", fig))
+                grafigi_goster(cizimler, "karlilik", rapor_grafikleri, rapordakiler)
+                grafigi_goster(cizimler, "faaliyet", rapor_grafikleri, rapordakiler)
 
         
         with st.expander("Finansal Metrikler"):
-            fig = draw_financial_metrics_chart()
-            if fig:
-                st.pyplot(fig)
-                report_figs.append(("Finansal Metrikler", fig))
+            grafigi_goster(cizimler, "finansal_metrikler", rapor_grafikleri, rapordakiler)
 
         st.divider()
         st.subheader("📑 Rapor Oluşturma")
 
+        vektorel = st.checkbox("Vektörel grafikler (SVG)", value=False,
+                               help="Grafikler PDF'e vektörel çizim olarak gömülür; kapalıysa 120 dpi PNG kullanılır")
+
         if st.button("📊 PDF Raporu Oluştur"):
             with st.spinner("Rapor oluşturuluyor..."):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_pdf:
-                    if create_pdf_report(tmp_pdf.name, report_figs):
-                        with open(tmp_pdf.name, "rb") as f:
-                            st.download_button(
-                                label="📥 PDF Raporunu İndir",
-                                data=f,
-                                file_name="finansal_analiz_raporu.pdf",
-                                mime="application/pdf"
-                            )
-                        st.success("Rapor başarıyla oluşturuldu!")
-                    else:
-                        st.error("PDF oluşturulamadı! Lütfen verileri kontrol edin.")
\ No newline at end of file
+                with olcum("rapor.goruntuler", grafik=len(rapordakiler), vektorel=vektorel):
+                    goruntuler = rapor_goruntuleri(rapordakiler, grafik_verisi, vektorel=vektorel)
+                report_figs = [(rapor_grafikleri[ad], *goruntuler[ad]) for ad in rapordakiler]
+                # PDF bellekte üretilir ve doğrudan indirme butonuna verilir
+                with olcum("rapor.pdf"):
+                    pdf_baytlari = create_pdf_report(report_figs)
+                if pdf_baytlari:
+                    st.download_button(
+                        label="📥 PDF Raporunu İndir",
+                        data=pdf_baytlari,
+                        file_name="finansal_analiz_raporu.pdf",
+                        mime="application/pdf"
+                    )
+                    st.success("Rapor başarıyla oluşturuldu!")
+                else:
+                    st.error("PDF oluşturulamadı! Lütfen verileri kontrol edin.")
+
+
+if izleyici.acik:
+    izleme_kayitlari = izleyici.bitir()
+    with st.sidebar.expander("⏱️ Aşama Süreleri", expanded=True):
+        if izleme_kayitlari:
+            izleme_tablosu = pd.DataFrame(izleme_kayitlari).sort_values("baslangic_ms")
+            # İç içe aşamalar adın girintisiyle gösterilir
+            izleme_tablosu.index = ["\u2003" * derinlik + ad for ad, derinlik
+                                    in zip(izleme_tablosu["ad"], izleme_tablosu["derinlik"])]
+            st.dataframe(izleme_tablosu[["duvar_ms", "cpu_ms", "bellek_tepe_kib"]], use_container_width=True)
+        else:
+            st.caption("Bu çalıştırmada ölçülen aşama yok.")
+        st.caption(f"Betik toplamı: {izleyici.toplam_ms:.0f} ms · çalıştırma {izleyici.calistirma}")
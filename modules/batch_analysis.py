@@ -0,0 +1,316 @@
+"""
+Finansal tablo arşivini Streamlit olmadan toplu olarak analiz eden komut satırı aracı
+
+Kullanım:
+    python -m modules.batch_analysis arsiv/ -o sonuclar.parquet
+    python -m modules.batch_analysis "arsiv/**/*.docx" -o sonuclar.csv --wacc 0.1318 --isci 8
+
+Her dosya ayrı bir süreçte (ProcessPoolExecutor) çıkarılır, kalemleri çözülür
+ve her bilanço dönemi için rasyolar, çarpanlar ve DCF hesaplanır. Sonuçlar tek
+bir CSV / Parquet dosyasına, hatalar dosya bazında ayrı bir rapora yazılır.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.data_extractor import extract_tables_from_docx, extract_tables_from_excel, parse_tables
+from modules.financial_statement import FinancialStatement
+from modules.ratio_calculator import RatioEngine, fk_orani, fd_divide_favok, pd_divide_dd
+from modules.dcf_model import nwcdegisim, capex, fcf, toplu_dcf
+
+DESTEKLENEN_UZANTILAR = (".docx", ".xlsx", ".xlsm")
+
+# Çarpan ve DCF hesabı için çözülen kalemler: kısa ad -> (tablo sırası, kalem adı)
+# (0: varlıklar, 1: kaynaklar, 2: gelir tablosu; main.py ile aynı kalemler)
+KALEMLER = {
+    "nakit": (0, "Cash and cash equivalents"),
+    "finansal_yatirimlar": (0, "Financial investments"),
+    "donen_varliklar": (0, "TOTAL CURRENT ASSETS"),
+    "maddi_duran_varlik": (0, "Property, plant and equipment"),
+    "maddi_olmayan_duran_varlik": (0, "Intangible assets"),
+    "kisa_vadeli": (1, "Short term borrowings"),
+    "uzun_vadeli_borclanma_kisa_vadeli": (1, "Short term portion of long term borrowings"),
+    "kiralama_kisa_vadeli": (1, "Lease liabilities"),
+    "uzun_vadeli_borc": (1, "Long term borrowings"),
+    "uzun_vadeli_kiralama": (1, "Long term lease liabilities"),
+    "kisa_vadeli_yukumlulukler": (1, "TOTAL CURRENT LIABILITIES"),
+    "oz_kaynak": (1, "TOTAL EQUITY"),
+    "net_kar": (2, "Profit / (loss) for the period"),
+    "vergi": (2, "Current tax expense for the year"),
+    "finansman_giderleri": (2, "Financial expense (-)"),
+    "brut_kar": (2, "Gross profit / (loss)"),
+    "genel_yonetim": (2, "General and administrative expenses (-)"),
+    "pazarlama": (2, "Selling, marketing and distribution expenses (-)"),
+    "arge": (2, "Research and development expenses (-)"),
+    "amortisman_ve_itfa": (2, "Operating profit / (loss)"),
+    "hisse_basi_kar": (2, "Earnings per share from continuing operations"),
+}
+
+
+def dosyalari_bul(girdiler: List[str]) -> List[str]:
+    """Klasör veya glob girdilerinden desteklenen tablo dosyalarını (sıralı, tekrarsız) döndürür"""
+    dosyalar = set()
+    for girdi in girdiler:
+        if os.path.isdir(girdi):
+            adaylar = glob.glob(os.path.join(girdi, "**", "*"), recursive=True)
+        else:
+            adaylar = glob.glob(girdi, recursive=True)
+        for aday in adaylar:
+            # Word'ün kilit dosyaları (~$rapor.docx) atlanır
+            if (aday.lower().endswith(DESTEKLENEN_UZANTILAR) and os.path.isfile(aday)
+                    and not os.path.basename(aday).startswith("~$")):
+                dosyalar.add(os.path.abspath(aday))
+    return sorted(dosyalar)
+
+
+def tablolari_oku(yol: str) -> List[FinancialStatement]:
+    """Dosyanın ilk üç tablosunu (varlıklar, kaynaklar, gelir tablosu) okur"""
+    if yol.lower().endswith((".xlsx", ".xlsm")):
+        tablolar = extract_tables_from_excel(yol)
+    else:
+        with open(yol, "rb") as f:
+            tablolar = extract_tables_from_docx(f)
+    if not tablolar:
+        raise ValueError("Dosyada tablo bulunamadı")
+    return [FinancialStatement.from_parsed(tablo) for tablo in parse_tables(tablolar[:3])]
+
+
+def _kalem(tablolar: List[FinancialStatement], ad: str, donem: Optional[str]) -> float:
+    """Kalemi tablodan çözer; tablo, kalem veya dönem yoksa NaN"""
+    sira, etiket = KALEMLER[ad]
+    if sira >= len(tablolar) or donem is None:
+        return np.nan
+    tablo = tablolar[sira]
+    if etiket not in tablo or not tablo.has_period(donem):
+        return np.nan
+    return tablo.get(etiket, donem)
+
+
+def _oran(deger) -> float:
+    """Oran fonksiyonlarının None / hata dönüşlerini NaN'a çevirir"""
+    return np.nan if deger is None else float(deger)
+
+
+def dosyayi_analiz_et(yol: str, ayarlar: Dict) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    Tek bir dosyayı uçtan uca analiz eder (süreç havuzunda çalışan iş)
+
+    Parametreler:
+        yol: .docx / .xlsx dosya yolu
+        ayarlar: wacc, terminal_buyume, fcf_buyume, yil_sayisi ve isteğe bağlı
+            piyasa (dosya adı -> {'fiyat', 'hisse_sayisi'})
+
+    Dönüş:
+        (her bilanço dönemi için bir sonuç satırı, hata kaydı veya None);
+        satırlardaki sure_sn dosyanın toplam analiz süresidir
+    """
+    baslangic = time.perf_counter()
+    try:
+        tablolar = tablolari_oku(yol)
+        motor = RatioEngine(*tablolar[:3])
+        donemler = motor.donemler()
+        if not donemler:
+            raise ValueError("Bilanço tablosunda dönem bilgisi bulunamadı")
+        rasyolar = motor.hesapla()
+
+        piyasa = ayarlar.get("piyasa", {}).get(os.path.basename(yol), {})
+        fiyat = piyasa.get("fiyat", np.nan)
+        hisse_sayisi = piyasa.get("hisse_sayisi", np.nan)
+
+        satirlar = []
+        for i, (bilanco_donemi, gelir_donemi) in enumerate(donemler):
+            k = {ad: _kalem(tablolar, ad, gelir_donemi if sira == 2 else bilanco_donemi)
+                 for ad, (sira, _) in KALEMLER.items()}
+            onceki = donemler[i - 1][0] if i > 0 else None
+
+            net_borc = (k["kisa_vadeli"] + k["uzun_vadeli_borclanma_kisa_vadeli"] + k["kiralama_kisa_vadeli"]
+                        + k["uzun_vadeli_borc"] + k["uzun_vadeli_kiralama"]) - k["nakit"] - k["finansal_yatirimlar"]
+
+            # Çarpanlar yalnızca piyasa verisi verilen dosyalar için (sayfadaki formüllerle)
+            fk = fd_favok = pd_dd = np.nan
+            if np.isfinite(fiyat) and np.isfinite(hisse_sayisi):
+                if k["hisse_basi_kar"]:
+                    fk = fk_orani(fiyat, k["hisse_basi_kar"] / 10)
+                fd_favok = _oran(fd_divide_favok(
+                    k["kisa_vadeli"], k["uzun_vadeli_borclanma_kisa_vadeli"], k["kiralama_kisa_vadeli"],
+                    k["uzun_vadeli_borc"], k["uzun_vadeli_kiralama"], k["net_kar"], k["finansman_giderleri"],
+                    k["amortisman_ve_itfa"], k["vergi"], fiyat, hisse_sayisi, k["nakit"], k["finansal_yatirimlar"]
+                ))
+                pd_dd = _oran(pd_divide_dd(hisse_sayisi, 0, fiyat, k["oz_kaynak"]))
+
+            # DCF: baz FCF önceki bilanço dönemine göre hesaplanır ve fcf_buyume ile projekte edilir
+            baz_fcf = sirket_degeri = firma_degeri = np.nan
+            if onceki is not None:
+                nwc_degisim = (nwcdegisim(k["donen_varliklar"], k["kisa_vadeli_yukumlulukler"])
+                               - nwcdegisim(_kalem(tablolar, "donen_varliklar", onceki),
+                                            _kalem(tablolar, "kisa_vadeli_yukumlulukler", onceki)))
+                capex_degeri = capex(k["maddi_duran_varlik"], _kalem(tablolar, "maddi_duran_varlik", onceki),
+                                     k["maddi_olmayan_duran_varlik"],
+                                     _kalem(tablolar, "maddi_olmayan_duran_varlik", onceki),
+                                     ayarlar["amortisman"])
+                ebit = k["brut_kar"] - ((k["genel_yonetim"] + k["pazarlama"] + k["arge"]) * -1)
+                baz_fcf = fcf(nwc_degisim, capex_degeri, ebit, ayarlar["amortisman"], k["vergi"])
+
+                yillar = np.arange(1, ayarlar["yil_sayisi"] + 1)
+                projeksiyon = baz_fcf * (1 + ayarlar["fcf_buyume"]) ** yillar
+                sonuc = toplu_dcf(projeksiyon, 0.0, 0.0, 0.0, 0.0, ayarlar["wacc"], ayarlar["terminal_buyume"],
+                                  net_borc=net_borc)
+                sirket_degeri = float(sonuc["sirket_degeri"])
+                firma_degeri = float(sonuc["firma_degeri"])
+
+            satir = {"dosya": yol, "bilanco_donemi": bilanco_donemi, "gelir_donemi": gelir_donemi}
+            satir.update(rasyolar.loc[bilanco_donemi].to_dict())
+            satir.update({
+                "F/K": fk, "FD/FAVOK": fd_favok, "PD/DD": pd_dd,
+                "Net Borç": net_borc, "Baz FCF": baz_fcf,
+                "Şirket Değeri": sirket_degeri, "Firma Değeri": firma_degeri,
+                "sure_sn": np.nan,
+            })
+            satirlar.append(satir)
+
+        # Süre dönem satırları arasında birikmesin: dosyanın tüm satırlarına aynı süre yazılır
+        sure = time.perf_counter() - baslangic
+        for satir in satirlar:
+            satir["sure_sn"] = sure
+        return satirlar, None
+
+    except Exception as e:
+        return [], {
+            "dosya": yol,
+            "hata_turu": type(e).__name__,
+            "mesaj": str(e),
+            "ayrinti": traceback.format_exc(limit=5),
+        }
+
+
+def toplu_analiz(dosyalar: List[str], ayarlar: Dict, isci_sayisi: Optional[int] = None,
+                 parca_boyutu: Optional[int] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Dosyaları süreç havuzunda analiz eder
+
+    Parametreler:
+        dosyalar: Analiz edilecek dosya yolları
+        ayarlar: dosyayi_analiz_et'e iletilen DCF / piyasa ayarları
+        isci_sayisi: Süreç sayısı (None ise çekirdek sayısı)
+        parca_boyutu: Her sürece tek seferde gönderilen dosya sayısı; None ise
+            dosya sayısı / (4 x süreç sayısı)
+
+    Dönüş:
+        (sonuç tablosu, hata raporu)
+    """
+    isci_sayisi = isci_sayisi or os.cpu_count() or 1
+    if parca_boyutu is None:
+        parca_boyutu = max(1, len(dosyalar) // (isci_sayisi * 4))
+
+    sonuclar, hatalar = [], []
+    is_fonksiyonu = partial(dosyayi_analiz_et, ayarlar=ayarlar)
+    if isci_sayisi == 1:
+        ciktilar = map(is_fonksiyonu, dosyalar)
+        for satirlar, hata in ciktilar:
+            sonuclar.extend(satirlar)
+            if hata:
+                hatalar.append(hata)
+    else:
+        with ProcessPoolExecutor(max_workers=isci_sayisi) as havuz:
+            for satirlar, hata in havuz.map(is_fonksiyonu, dosyalar, chunksize=parca_boyutu):
+                sonuclar.extend(satirlar)
+                if hata:
+                    hatalar.append(hata)
+
+    return (pd.DataFrame(sonuclar),
+            pd.DataFrame(hatalar, columns=["dosya", "hata_turu", "mesaj", "ayrinti"]))
+
+
+def _tablo_yaz(df: pd.DataFrame, yol: str) -> str:
+    """
+    Uzantıya göre Parquet veya CSV olarak yazar
+
+    Parquet motoru (pyarrow / fastparquet) kurulu değilse aynı adla .csv yazılır.
+
+    Dönüş:
+        Yazılan dosyanın yolu
+    """
+    if yol.lower().endswith(".parquet"):
+        try:
+            df.to_parquet(yol, index=False)
+            return yol
+        except ImportError as e:
+            csv_yolu = os.path.splitext(yol)[0] + ".csv"
+            print(f"Parquet yazılamadı ({str(e).splitlines()[0]}); sonuçlar CSV olarak yazılıyor: {csv_yolu}. "
+                  "Parquet çıktısı için pyarrow kurun (pip install pyarrow).", file=sys.stderr)
+            yol = csv_yolu
+    df.to_csv(yol, index=False, encoding="utf-8")
+    return yol
+
+
+def _piyasa_verisi_oku(yol: Optional[str]) -> Dict[str, Dict[str, float]]:
+    """dosya, fiyat, hisse_sayisi sütunlu CSV'yi dosya adı -> piyasa verisi sözlüğüne çevirir"""
+    if not yol:
+        return {}
+    df = pd.read_csv(yol)
+    eksik = {"dosya", "fiyat", "hisse_sayisi"} - set(df.columns)
+    if eksik:
+        raise ValueError(f"Piyasa verisi dosyasında eksik sütun: {', '.join(sorted(eksik))}")
+    return {
+        os.path.basename(str(satir.dosya)): {"fiyat": float(satir.fiyat), "hisse_sayisi": float(satir.hisse_sayisi)}
+        for satir in df.itertuples(index=False)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Finansal tablo arşivini toplu analiz eder")
+    parser.add_argument("girdiler", nargs="+", help="Klasör(ler) veya glob desen(ler)i (.docx, .xlsx)")
+    parser.add_argument("-o", "--cikti", default="toplu_analiz.csv", help="Sonuç dosyası (.csv veya .parquet)")
+    parser.add_argument("--hata-raporu", default=None,
+                        help="Hata raporu dosyası (varsayılan: <cikti>_hatalar.csv)")
+    parser.add_argument("--isci", type=int, default=None, help="Süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--parca", type=int, default=None, help="Sürece tek seferde gönderilen dosya sayısı")
+    parser.add_argument("--wacc", type=float, default=0.1318)
+    parser.add_argument("--terminal-buyume", type=float, default=0.025)
+    parser.add_argument("--fcf-buyume", type=float, default=0.0, help="Baz FCF'nin yıllık büyüme oranı")
+    parser.add_argument("--yil", type=int, default=5, help="Projeksiyon yılı")
+    parser.add_argument("--amortisman", type=float, default=0.0, help="Yıllık amortisman tutarı")
+    parser.add_argument("--piyasa", default=None,
+                        help="Çarpanlar için dosya, fiyat, hisse_sayisi sütunlu CSV (isteğe bağlı)")
+    args = parser.parse_args(argv)
+
+    dosyalar = dosyalari_bul(args.girdiler)
+    if not dosyalar:
+        print("Analiz edilecek .docx / .xlsx dosyası bulunamadı", file=sys.stderr)
+        return 1
+
+    ayarlar = {
+        "wacc": args.wacc,
+        "terminal_buyume": args.terminal_buyume,
+        "fcf_buyume": args.fcf_buyume,
+        "yil_sayisi": args.yil,
+        "amortisman": args.amortisman,
+        "piyasa": _piyasa_verisi_oku(args.piyasa),
+    }
+
+    baslangic = time.perf_counter()
+    sonuclar, hatalar = toplu_analiz(dosyalar, ayarlar, args.isci, args.parca)
+    sure = time.perf_counter() - baslangic
+
+    cikti = _tablo_yaz(sonuclar, args.cikti)
+    hata_raporu = args.hata_raporu or os.path.splitext(args.cikti)[0] + "_hatalar.csv"
+    hatalar.to_csv(hata_raporu, index=False, encoding="utf-8")
+
+    print(f"{len(dosyalar)} dosya {sure:.2f} sn'de işlendi: "
+          f"{len(dosyalar) - len(hatalar)} başarılı, {len(hatalar)} hatalı")
+    print(f"Sonuçlar: {cikti}")
+    print(f"Hata raporu: {hata_raporu}")
+    return 0 if hatalar.empty else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import pandas as pd
+
+from modules.data_extractor import ParsedTable, extract_tables_from_docx, extract_tables_from_excel, parse_tables
+
+
+class LRUCache:
+    """
+    Thread-safe, giriş sayısı ve toplam boyut ile sınırlı LRU önbellek
+
+    Streamlit modülleri süreç başına bir kez import edildiği için modül
+    seviyesindeki örnekler tüm oturumlar ve yeniden çalıştırmalar arasında
+    paylaşılır. Aynı anahtar için eş zamanlı istekler tek bir hesaplamayı bekler.
+
+    Parametreler:
+        max_entries: Tutulacak en fazla giriş sayısı
+        max_bytes: Girişlerin toplam tahmini boyut sınırı (bayt)
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._girisler: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._toplam_bayt = 0
+        self._kilit = threading.Lock()
+        self._hesaplanan: Dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._kilit:
+            giris = self._girisler.get(key)
+            if giris is None:
+                self.misses += 1
+                return default
+            self._girisler.move_to_end(key)
+            self.hits += 1
+            return giris[0]
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> None:
+        with self._kilit:
+            eski = self._girisler.pop(key, None)
+            if eski is not None:
+                self._toplam_bayt -= eski[1]
+            # Tek başına sınırı aşan girişler önbelleğe alınmaz
+            if size > self.max_bytes:
+                return
+            self._girisler[key] = (value, size)
+            self._toplam_bayt += size
+            while self._girisler and (len(self._girisler) > self.max_entries or self._toplam_bayt > self.max_bytes):
+                _, (_, eski_boyut) = self._girisler.popitem(last=False)
+                self._toplam_bayt -= eski_boyut
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, loader: Callable[[], Any],
+                       size_of: Optional[Callable[[Any], int]] = None) -> Any:
+        """
+        Anahtar önbellekte yoksa loader() ile hesaplar ve saklar
+
+        Aynı anahtarı isteyen diğer thread'ler hesaplama bitene kadar bekler,
+        böylece bir içerik yalnızca bir kez hesaplanır.
+        """
+        eksik = object()
+        value = self.get(key, eksik)
+        if value is not eksik:
+            return value
+
+        with self._kilit:
+            anahtar_kilidi = self._hesaplanan.setdefault(key, threading.Lock())
+
+        with anahtar_kilidi:
+            # Beklerken başka bir thread hesaplamış olabilir
+            with self._kilit:
+                giris = self._girisler.get(key)
+                if giris is not None:
+                    self._girisler.move_to_end(key)
+                    return giris[0]
+            try:
+                value = loader()
+                self.put(key, value, size_of(value) if size_of else 0)
+            finally:
+                with self._kilit:
+                    self._hesaplanan.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        with self._kilit:
+            self._girisler.clear()
+            self._toplam_bayt = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._kilit:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._girisler),
+                "bytes": self._toplam_bayt,
+            }
+
+
+def icerik_hash(data: bytes) -> str:
+    """Dosya içeriğinin SHA-256 özeti"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _tablo_boyutu(tables: List[ParsedTable]) -> int:
+    return int(sum(
+        df.memory_usage(deep=True).sum()
+        for table in tables
+        for df in (table.raw, table.numeric, table.parse_failed)
+    ))
+
+
+# Ayrıştırılmış yüklemeler için süreç genelinde paylaşılan önbellek
+_parse_cache = LRUCache(max_entries=16, max_bytes=512 * 1024 * 1024)
+
+
+def extract_parsed_tables_cached(uploaded_file) -> List[ParsedTable]:
+    """
+    Yüklenen .docx / .xlsx dosyasının tablolarını içerik özetine göre önbellekten döndürür
+
+    Tablolar çıkarım sırasında bir kez sayıya çevrilir (parse_tables); önbellekte
+    ham tablo, sayısal karşılığı ve hata maskesi birlikte tutulur.
+
+    Aynı içerik kaç kez yeniden çalıştırılırsa veya kaç oturumda yüklenirse
+    yüklensin yalnızca bir kez ayrıştırılır. Dönen DataFrame'ler oturumlar
+    arasında paylaşıldığı için yerinde değiştirilmemelidir.
+
+    Parametreler:
+        uploaded_file: Streamlit file_uploader objesi (veya name özellikli dosya benzeri obje)
+
+    Dönüş:
+        ParsedTable listesi (raw, numeric, parse_failed)
+    """
+    if hasattr(uploaded_file, "getvalue"):
+        file_bytes = uploaded_file.getvalue()
+    else:
+        file_bytes = uploaded_file.read()
+
+    dosya_adi = getattr(uploaded_file, "name", "") or ""
+    if dosya_adi.lower().endswith((".xlsx", ".xlsm")):
+        tur, extractor = "xlsx", extract_tables_from_excel
+    else:
+        tur, extractor = "docx", extract_tables_from_docx
+
+    return _parse_cache.get_or_compute(
+        (tur, icerik_hash(file_bytes)),
+        lambda: parse_tables(extractor(io.BytesIO(file_bytes))),
+        size_of=_tablo_boyutu
+    )
+
+
+def extract_tables_cached(uploaded_file) -> List[pd.DataFrame]:
+    """extract_parsed_tables_cached ile aynı önbellekten yalnızca ham tabloları döndürür"""
+    return [table.raw for table in extract_parsed_tables_cached(uploaded_file)]
+
+
+def parse_cache_stats() -> Dict[str, int]:
+    """Ayrıştırma önbelleğinin isabet / kaçırma / çıkarma istatistikleri"""
+    return _parse_cache.stats()
@@ -0,0 +1,526 @@
+"""
+Rapor grafiklerinin pyplot'suz (nesne yönelimli Figure + Agg) çizimi
+
+Grafikler st.session_state yerine grafik_verileri() ile alınmış düz değer
+anlık görüntüsünden çizilir; bu yüzden bu modül streamlit'e bağımlı değildir
+ve grafikler süreç havuzunda paralel olarak PNG'ye dönüştürülebilir.
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+
+from modules.cache import LRUCache
+
+# Grafiklerin görünümü (renk, boyut, yazı vb.) değiştiğinde artırılır; önbellekteki
+# eski görüntüler böylece kullanılmaz
+GRAFIK_STIL_SURUMU = 1
+
+# PDF raporuna vektörel (SVG) gömüldüğünde düzgün çıkmayan grafikler: imshow
+# ızgarası SVG'de dönüşümlü bir <image> olarak yazılır, fpdf bu dönüşümü desteklemez
+RASTER_GRAFIKLER = frozenset({"duyarlilik"})
+
+# SVG'ye tarih / RDF üst verisi yazılmaz; fpdf <metadata> etiketini tanımaz ve
+# aynı girdiler her seferinde aynı baytları üretir
+SVG_UST_VERISI = {"Date": None, "Creator": None, "Format": None, "Type": None}
+
+# Bu yıl sayısının üzerindeki projeksiyonlarda çubuk / nokta değer etiketleri yazılmaz
+ETIKET_YIL_SINIRI = 10
+
+# Grafiklerin ihtiyaç duyduğu session_state anahtarları ve varsayılanları
+GRAFIK_ANAHTARLARI = {
+    'fk': 0, 'fd_divide_favok': 0, 'pd_divide_dd': 0,
+    'besYillikfcf': [0] * 5, 'besYillikIndirgemeliDegerler': [0] * 5, 'terminalDegeri': 0,
+    'cariOran': 0, 'asitTestOrani': 0, 'borcToplamVarlik': 0,
+    'netKarMarji': 0, 'aktifKarlilikOrani': 0, 'ozSermayeKarliligi': 0,
+    'alacakDevirHizi': 0, 'stokDevirHizi': 0,
+    'netBorc': 0, 'toplamSirketDegeri': 0, 'toplamFirmaDegeri': 0,
+    'monteCarlo': None, 'duyarlilik': None,
+}
+
+
+def grafik_verileri(durum: Mapping) -> Dict:
+    """
+    Grafiklerin kullandığı değerlerin düz (pickle'lanabilir) anlık görüntüsü
+
+    Parametreler:
+        durum: st.session_state veya benzeri bir sözlük
+    """
+    veri = {}
+    for anahtar, varsayilan in GRAFIK_ANAHTARLARI.items():
+        deger = durum.get(anahtar, varsayilan)
+        veri[anahtar] = varsayilan if deger is None and varsayilan is not None else deger
+    # Monte Carlo sonucundaki tam çekiliş dizisi grafikte kullanılmaz, kopyalanmaz
+    if veri['monteCarlo']:
+        veri['monteCarlo'] = {k: v for k, v in veri['monteCarlo'].items() if k != 'degerler'}
+    return veri
+
+
+def _x_etiketlerini_dondur(ax, aci=15):
+    setp(ax.get_xticklabels(), rotation=aci, ha='right')
+
+
+def valuation_multiples_figure(veri: Dict) -> Figure:
+    carpans = ["F/K", "FD/FAVÖK", "PD/DD"]
+    degerler = [veri['fk'], veri['fd_divide_favok'], veri['pd_divide_dd']]
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    colors = ["#1f77b4", "#2ca02c", "#ff7f0e"]
+    bars = ax.bar(carpans, degerler, color=colors, width=0.6)
+
+    ax.set_title("Şirket Değerleme Çarpanları Karşılaştırması", fontsize=14, pad=20)
+    ax.set_ylabel("Çarpan Değeri", fontsize=12)
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1, f"{height:.2f}x",
+                ha='center', va='bottom', fontsize=12, fontweight='bold')
+
+    ax.set_ylim(0, max(degerler) * 1.2)
+    _x_etiketlerini_dondur(ax)
+    fig.tight_layout()
+    return fig
+
+
+def fcf_figure(veri: Dict) -> Figure:
+    besYillikfcf = veri['besYillikfcf']
+    yil_sayisi = len(besYillikfcf)
+    yillar = [f"Yıl {i+1}" for i in range(yil_sayisi)]
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.plot(yillar, besYillikfcf, marker='o', markersize=8 if yil_sayisi <= ETIKET_YIL_SINIRI else 4, linewidth=2.5,
+            label="FCF Tahmini", color="navy", markerfacecolor='white', markeredgewidth=2)
+
+    ax.set_title(f"{yil_sayisi} Yıllık Serbest Nakit Akımı Tahminleri", fontsize=14, pad=20)
+    ax.set_xlabel("Yıllar", fontsize=12)
+    ax.set_ylabel("FCF (USD)", fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.legend(fontsize=12, loc='upper left')
+    ax.yaxis.set_major_formatter('${x:,.0f}')
+
+    # Uzun projeksiyonlarda değer etiketleri üst üste bineceği için yazılmaz
+    if yil_sayisi <= ETIKET_YIL_SINIRI:
+        for i, val in enumerate(besYillikfcf):
+            ax.text(i, val + (max(besYillikfcf)*0.05), f"${val:,.0f}",
+                    ha='center', va='bottom', fontsize=11, fontweight='bold')
+    else:
+        _x_etiketlerini_dondur(ax, 45)
+
+    ax.set_ylim(0, max(besYillikfcf) * 1.3)
+    fig.tight_layout()
+    return fig
+
+
+def dcf_figure(veri: Dict) -> Figure:
+    besYillikIndirgemeliDegerler = veri['besYillikIndirgemeliDegerler']
+    yil_sayisi = len(besYillikIndirgemeliDegerler)
+    yillar = [f"Yıl {i+1}" for i in range(yil_sayisi)]
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    bars = ax.bar(yillar, besYillikIndirgemeliDegerler, color='skyblue')
+
+    ax.set_title(f"{yil_sayisi} Yıllık İndirgemeli FCF (NPV)")
+    ax.set_ylabel("Bugünkü Değer (USD)")
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+    if yil_sayisi <= ETIKET_YIL_SINIRI:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height, f"${height:,.0f}",
+                    ha='center', va='bottom', fontsize=9)
+    else:
+        _x_etiketlerini_dondur(ax, 45)
+
+    ax.yaxis.set_major_formatter('${x:,.0f}')
+    fig.tight_layout()
+    return fig
+
+
+def terminal_value_figure(veri: Dict) -> Figure:
+    besYillikIndirgemeliDegerler = veri['besYillikIndirgemeliDegerler']
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.pie([sum(besYillikIndirgemeliDegerler), veri['terminalDegeri']],
+           labels=[f"{len(besYillikIndirgemeliDegerler)} Yıllık Nakit Akımları", "Terminal Değer"],
+           autopct='%1.1f%%',
+           colors=["#FFFB00", "#0C0A7A"],
+           startangle=90)
+    ax.set_title("Terminal Değerin Toplam Değere Katkısı")
+    return fig
+
+
+def label_bars(ax, bars, offset=0.2, fmt="{:.2f}"):
+    for bar in bars:
+        yval = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2, yval + offset, fmt.format(yval),
+                ha='center', va='bottom', fontsize=10)
+
+
+def liquidity_figure(veri: Dict) -> Figure:
+    oranlar = ["Cari Oran", "Asit-Test"]
+    degerler = [veri['cariOran'], veri['asitTestOrani']]
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    bars = ax.bar(oranlar, degerler, color=["#4CAF50", "#2196F3"])
+    ax.set_title("Likidite Oranları")
+    ax.set_ylabel("Oran")
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+    label_bars(ax, bars, offset=0.1)
+    return fig
+
+
+def debt_figure(veri: Dict) -> Figure:
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    bars = ax.bar(["Borç / Varlık"], [veri['borcToplamVarlik']], color="salmon")
+    ax.set_title("Borçluluk Oranı")
+    ax.set_ylabel("Oran")
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.02, f"{height:.2f}",
+                ha='center', va='bottom', fontsize=12)
+
+    fig.tight_layout()
+    return fig
+
+
+def profitability_figure(veri: Dict) -> Figure:
+    oranlar = ["Net Kâr Marjı", "Aktif Kârlılık", "Özsermaye Kârlılığı"]
+    degerler = [
+        veri['netKarMarji'] * 100,
+        veri['aktifKarlilikOrani'] * 100,
+        veri['ozSermayeKarliligi'] * 100
+    ]
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bars = ax.bar(oranlar, degerler, color=["#3F51B5", "#009688", "#FFC107"])
+    ax.set_title("Kârlılık Oranları Karşılaştırması", pad=20, fontsize=14)
+    ax.set_ylabel("Oran (%)", fontsize=12)
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+    _x_etiketlerini_dondur(ax)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.5, f"{height:.1f}%",
+                ha='center', va='bottom', fontsize=11, fontweight='bold')
+
+    ax.set_ylim(0, max(degerler) * 1.2)
+    fig.tight_layout()
+    return fig
+
+
+def activity_figure(veri: Dict) -> Figure:
+    oranlar = ["Alacak Devir Hızı", "Stok Devir Hızı"]
+    degerler = [veri['alacakDevirHizi'], veri['stokDevirHizi']]
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    bars = ax.bar(oranlar, degerler, color=["#7E57C2", "#26C6DA"], width=0.5)
+    ax.set_title("Faaliyet Verimliliği Oranları", fontsize=14, pad=20)
+    ax.set_ylabel("Devir Hızı (Kat)", fontsize=12)
+    ax.grid(axis="y", linestyle="--", alpha=0.5)
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1, f"{height:.1f}x",
+                ha='center', va='bottom', fontsize=12, fontweight='bold')
+
+    max_value = max(degerler)
+    ax.set_ylim(0, max_value * 1.3 if max_value > 0 else 10)
+    _x_etiketlerini_dondur(ax)
+    ax.set_facecolor('#f8f9fa')
+    fig.patch.set_facecolor('#f8f9fa')
+    fig.tight_layout()
+    return fig
+
+
+def financial_metrics_figure(veri: Dict) -> Figure:
+    labels = ['Net Borç', 'Terminal Değer', 'Toplam Şirket Değeri', 'Toplam Firma Değeri']
+    values = [
+        abs(veri['netBorc']),
+        veri['terminalDegeri'],
+        veri['toplamSirketDegeri'],
+        veri['toplamFirmaDegeri']
+    ]
+
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    bars = ax.bar(labels, values, color=['#1f77b4', '#2ca02c', '#d62728', '#ff7f0e'], width=0.6)
+    ax.set_title('Temel Finansal Metrikler Karşılaştırması', fontsize=16, pad=20, fontweight='bold')
+    ax.set_ylabel('Değer (USD)', fontsize=12)
+    ax.set_xlabel('Metrikler', fontsize=12)
+    ax.yaxis.set_major_formatter('${x:,.0f}')
+    ax.grid(axis='y', linestyle='--', alpha=0.5)
+
+    for bar in bars:
+        height = bar.get_height()
+        offset = max(values) * 0.03
+        ax.text(bar.get_x() + bar.get_width()/2., height + offset, f"${height:,.0f}",
+                ha='center', va='bottom', fontsize=11, fontweight='bold')
+
+    _x_etiketlerini_dondur(ax)
+    ax.set_ylim(0, max(values) * 1.15)
+    ax.set_facecolor('#f8f9fa')
+    fig.patch.set_facecolor('#f8f9fa')
+    fig.tight_layout()
+    return fig
+
+
+def monte_carlo_figure(veri: Dict) -> Optional[Figure]:
+    sonuc = veri['monteCarlo']
+    if not sonuc:
+        return None
+    sayilar, sinirlar = sonuc['histogram']
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.bar(sinirlar[:-1], sayilar, width=sinirlar[1:] - sinirlar[:-1], align='edge',
+           color="#1f77b4", edgecolor="white", alpha=0.85)
+
+    yuzdelikler = sonuc['yuzdelikler']
+    for yuzdelik, deger in yuzdelikler.items():
+        ax.axvline(deger, color="#d62728" if yuzdelik == 50 else "gray", linestyle="--", linewidth=1.5)
+        ax.text(deger, max(sayilar) * 1.02, f"P{yuzdelik}", ha='center', va='bottom', fontsize=10)
+
+    ax.set_title("Monte Carlo Firma Değeri Dağılımı", fontsize=14, pad=20)
+    ax.set_xlabel("Firma Değeri", fontsize=12)
+    ax.set_ylabel("Çekiliş Sayısı", fontsize=12)
+    ax.xaxis.set_major_formatter('{x:,.0f}')
+    ax.grid(axis="y", linestyle="--", alpha=0.5)
+    ax.set_ylim(0, max(sayilar) * 1.12)
+    fig.tight_layout()
+    return fig
+
+
+def sensitivity_heatmap_figure(veri: Dict) -> Optional[Figure]:
+    tablo = veri['duyarlilik']
+    if not tablo:
+        return None
+    wacc = np.asarray(tablo['wacc']) * 100
+    buyume = np.asarray(tablo['buyume']) * 100
+    degerler = np.ma.masked_invalid(tablo['firma_degeri'])
+
+    fig = Figure(figsize=(10, 7))
+    ax = fig.subplots()
+    cmap = colormaps['RdYlGn'].copy()
+    cmap.set_bad('#d9d9d9')  # WACC <= g hücreleri
+    # WACC ≈ g yakınındaki aşırı değerler renk ölçeğini ezmesin
+    vmin, vmax = np.percentile(degerler.compressed(), [2, 98]) if degerler.count() else (None, None)
+    # imshow tek bir raster çizer; 200x200 ızgarada da hızlıdır
+    im = ax.imshow(degerler, cmap=cmap, aspect='auto', origin='lower', interpolation='nearest',
+                   vmin=vmin, vmax=vmax, extent=[buyume[0], buyume[-1], wacc[0], wacc[-1]])
+    cbar = fig.colorbar(im, ax=ax)
+    cbar.set_label("Firma Değeri", fontsize=12)
+    cbar.formatter.set_useOffset(False)
+
+    secili = tablo.get('secili')
+    if secili:
+        ax.plot(secili[1] * 100, secili[0] * 100, marker='x', color='black', markersize=12, markeredgewidth=2.5)
+
+    ax.set_title("WACC x Terminal Büyüme Duyarlılığı", fontsize=14, pad=20)
+    ax.set_xlabel("Terminal Büyüme Oranı (%)", fontsize=12)
+    ax.set_ylabel("WACC (%)", fontsize=12)
+    fig.tight_layout()
+    return fig
+
+
+# Her grafiğin kullandığı anlık görüntü anahtarları (önbellek anahtarı bunlardan üretilir)
+GRAFIK_GIRDILERI: Dict[str, Tuple[str, ...]] = {
+    "carpanlar": ('fk', 'fd_divide_favok', 'pd_divide_dd'),
+    "fcf": ('besYillikfcf',),
+    "dcf": ('besYillikIndirgemeliDegerler',),
+    "terminal_deger": ('besYillikIndirgemeliDegerler', 'terminalDegeri'),
+    "likidite": ('cariOran', 'asitTestOrani'),
+    "borcluluk": ('borcToplamVarlik',),
+    "karlilik": ('netKarMarji', 'aktifKarlilikOrani', 'ozSermayeKarliligi'),
+    "faaliyet": ('alacakDevirHizi', 'stokDevirHizi'),
+    "finansal_metrikler": ('netBorc', 'terminalDegeri', 'toplamSirketDegeri', 'toplamFirmaDegeri'),
+    "monte_carlo": ('monteCarlo',),
+    "duyarlilik": ('duyarlilik',),
+}
+
+# Grafik adı -> çizim fonksiyonu (veri anlık görüntüsü -> Figure veya None)
+GRAFIKLER: Dict[str, Callable[[Dict], Optional[Figure]]] = {
+    "carpanlar": valuation_multiples_figure,
+    "fcf": fcf_figure,
+    "dcf": dcf_figure,
+    "terminal_deger": terminal_value_figure,
+    "likidite": liquidity_figure,
+    "borcluluk": debt_figure,
+    "karlilik": profitability_figure,
+    "faaliyet": activity_figure,
+    "finansal_metrikler": financial_metrics_figure,
+    "monte_carlo": monte_carlo_figure,
+    "duyarlilik": sensitivity_heatmap_figure,
+}
+
+
+def grafik_baytlari(ad: str, veri: Dict, dpi: int = 120, bicim: str = "png") -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Tek bir grafiği çizip PNG / SVG baytlarına dönüştürür (süreç havuzunda çalışan iş)
+
+    Dönüş:
+        (görüntü baytları veya çizilecek veri yoksa None, hata mesajı veya None)
+    """
+    try:
+        fig = GRAFIKLER[ad](veri)
+        if fig is None:
+            return None, None
+        tampon = io.BytesIO()
+        fig.savefig(tampon, format=bicim, dpi=dpi, bbox_inches='tight',
+                    metadata=SVG_UST_VERISI if bicim == "svg" else None)
+        return tampon.getvalue(), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _ozete_ekle(ozet, deger):
+    """Anlık görüntü değerini (sayı, liste, sözlük, numpy dizisi) özete kararlı biçimde ekler"""
+    if isinstance(deger, np.ndarray):
+        ozet.update(f"nd{deger.dtype.str}{deger.shape}".encode())
+        ozet.update(np.ascontiguousarray(deger).tobytes())
+    elif isinstance(deger, dict):
+        ozet.update(b"{")
+        for anahtar in sorted(deger, key=repr):
+            _ozete_ekle(ozet, anahtar)
+            _ozete_ekle(ozet, deger[anahtar])
+        ozet.update(b"}")
+    elif isinstance(deger, (list, tuple)):
+        ozet.update(b"[")
+        for eleman in deger:
+            _ozete_ekle(ozet, eleman)
+        ozet.update(b"]")
+    else:
+        # np.float64(1.0) ile 1.0 aynı özeti versin
+        if isinstance(deger, np.generic):
+            deger = deger.item()
+        ozet.update(f"{type(deger).__name__}:{deger!r};".encode())
+
+
+def grafik_anahtari(ad: str, veri: Dict, dpi: int = 120, bicim: str = "png") -> Tuple:
+    """Grafiğin girdilerinin özeti + stil sürümü + çıktı ayarlarından oluşan önbellek anahtarı"""
+    ozet = hashlib.sha256()
+    for anahtar in GRAFIK_GIRDILERI[ad]:
+        _ozete_ekle(ozet, anahtar)
+        _ozete_ekle(ozet, veri.get(anahtar))
+    return ad, GRAFIK_STIL_SURUMU, bicim, dpi, ozet.hexdigest()
+
+
+# Çizilmiş grafik görüntüleri için süreç genelinde paylaşılan önbellek
+_grafik_onbellegi = LRUCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+
+
+def grafik_onbellek_istatistikleri() -> Dict[str, int]:
+    return _grafik_onbellegi.stats()
+
+
+_havuz: Optional[ProcessPoolExecutor] = None
+
+
+def _cizim_havuzu() -> ProcessPoolExecutor:
+    """Süreç genelinde paylaşılan çizim havuzu (ilk kullanımda açılır)"""
+    global _havuz
+    if _havuz is None:
+        # Çok thread'li Streamlit sunucusunu fork'lamamak için spawn kullanılır
+        _havuz = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                     mp_context=multiprocessing.get_context("spawn"))
+    return _havuz
+
+
+def _ciz(adlar, veri, dpi, bicim, paralel) -> Dict[str, Tuple[Optional[bytes], Optional[str]]]:
+    if paralel is None:
+        paralel = (os.cpu_count() or 1) > 1 and len(adlar) > 1
+    if not paralel:
+        return {ad: grafik_baytlari(ad, veri, dpi, bicim) for ad in adlar}
+
+    global _havuz
+    try:
+        havuz = _cizim_havuzu()
+        isler = {ad: havuz.submit(grafik_baytlari, ad, veri, dpi, bicim) for ad in adlar}
+        return {ad: is_.result() for ad, is_ in isler.items()}
+    except BrokenProcessPool:
+        # Bir işçi süreç öldüyse havuz yeniden açılmak üzere bırakılır, bu seferlik seri çizilir
+        _havuz = None
+        return {ad: grafik_baytlari(ad, veri, dpi, bicim) for ad in adlar}
+
+
+def grafikleri_ciz(adlar: Iterable[str], veri: Dict, dpi: int = 120, bicim: str = "png",
+                   paralel: Optional[bool] = None) -> Dict[str, Tuple[Optional[bytes], Optional[str]]]:
+    """
+    Grafikleri (mümkünse süreç havuzunda paralel) PNG / SVG'ye dönüştürür
+
+    Girdileri, stil sürümü ve çıktı ayarları önbellektekiyle aynı olan grafikler
+    yeniden çizilmez; yalnızca değişenler havuza gönderilir.
+
+    Parametreler:
+        adlar: GRAFIKLER anahtarları
+        veri: grafik_verileri() anlık görüntüsü
+        dpi: PNG çözünürlüğü
+        bicim: "png" veya "svg"
+        paralel: None ise birden fazla çekirdek ve çizilecek birden fazla grafik varsa havuz kullanılır
+
+    Dönüş:
+        Grafik adı -> (görüntü baytları veya None, hata mesajı veya None)
+    """
+    anahtarlar = {ad: grafik_anahtari(ad, veri, dpi, bicim) for ad in adlar}
+    sonuclar = {}
+    eksikler = []
+    for ad, anahtar in anahtarlar.items():
+        onbellekte = _grafik_onbellegi.get(anahtar)
+        if onbellekte is None:
+            eksikler.append(ad)
+        else:
+            sonuclar[ad] = onbellekte
+
+    for ad, sonuc in _ciz(eksikler, veri, dpi, bicim, paralel).items():
+        baytlar, hata = sonuc
+        # Hatalı çizimler önbelleğe alınmaz, bir sonraki çalıştırmada yeniden denenir
+        if hata is None:
+            _grafik_onbellegi.put(anahtarlar[ad], sonuc, len(baytlar or b""))
+        sonuclar[ad] = sonuc
+    return {ad: sonuclar[ad] for ad in anahtarlar}
+
+
+def rapor_goruntuleri(adlar: Iterable[str], veri: Dict, vektorel: bool = True,
+                      dpi: int = 120) -> Dict[str, Tuple[Optional[bytes], Optional[bytes]]]:
+    """
+    PDF raporuna gömülecek grafik görüntülerini hazırlar
+
+    vektorel ise RASTER_GRAFIKLER dışındaki grafikler SVG olarak çizilir ve PDF'e
+    vektörel yerleştirilir (yakınlaştırınca bulanıklaşmaz, dosya küçülür); PNG
+    yedek olarak da döner, SVG gömülemezse o kullanılır. Her iki biçim de
+    grafikleri_ciz önbelleğinden geçer.
+
+    Dönüş:
+        Grafik adı -> (gömülecek görüntü, yedek PNG veya None); çizilemeyen
+        grafiklerde görüntü None
+    """
+    adlar = list(adlar)
+    pngler = grafikleri_ciz(adlar, veri, dpi)
+    svgler = {}
+    if vektorel:
+        svgler = grafikleri_ciz([ad for ad in adlar if ad not in RASTER_GRAFIKLER], veri, dpi, bicim="svg")
+
+    sonuclar = {}
+    for ad in adlar:
+        png = pngler[ad][0]
+        svg = svgler.get(ad, (None, None))[0]
+        sonuclar[ad] = (svg, png) if svg else (png, None)
+    return sonuclar
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Dict, Optional
+
+KAPALI = "kapali"
+ACIK = "acik"
+YARI_ACIK = "yari_acik"
+
+
+class DevreAcikHatasi(Exception):
+    """Devre açıkken yapılan çağrılarda ağa gidilmeden fırlatılır"""
+
+    def __init__(self, ad: str, kalan_sure: float, son_hata: Optional[str] = None):
+        self.kalan_sure = kalan_sure
+        self.son_hata = son_hata
+        mesaj = f"{ad} devresi açık, {kalan_sure:.0f} sn sonra yeniden denenecek"
+        if son_hata:
+            mesaj += f" (son hata: {son_hata})"
+        super().__init__(mesaj)
+
+
+class DevreKesici:
+    """
+    Art arda başarısız olan bir dış kaynağa yapılan çağrıları kısa devre eden kesici
+
+    esik kadar art arda hata olunca devre açılır ve bekleme süresi boyunca
+    çağrılar ağa gitmeden DevreAcikHatasi ile reddedilir (negatif önbellek).
+    Süre dolunca tek bir deneme çağrısına izin verilir (yarı açık): başarılıysa
+    devre kapanır, değilse bekleme süresi carpan ile büyütülerek (en fazla
+    en_fazla_bekleme) devre yeniden açılır. Deneme sürerken gelen çağrılar da
+    reddedilir; deneme deneme_zaman_asimi içinde sonuçlanmazsa (çağıran
+    basarili / basarisiz / vazgec çağırmadan kaybolduysa) yeni bir denemeye
+    izin verilir.
+
+    Parametreler:
+        ad: Hata mesajlarında kullanılan ad (örneğin sunucu adı)
+        esik: Devreyi açan art arda hata sayısı
+        ilk_bekleme: İlk açılıştaki bekleme süresi (sn)
+        en_fazla_bekleme: Üstel artan bekleme süresinin üst sınırı (sn)
+        carpan: Her başarısız denemede bekleme süresinin çarpanı
+        deneme_zaman_asimi: Sonuçlanmayan bir denemenin kayıp sayılacağı süre (sn)
+    """
+
+    def __init__(self, ad: str, esik: int = 2, ilk_bekleme: float = 30.0,
+                 en_fazla_bekleme: float = 15 * 60.0, carpan: float = 2.0,
+                 deneme_zaman_asimi: float = 60.0):
+        self.ad = ad
+        self.esik = esik
+        self.ilk_bekleme = ilk_bekleme
+        self.en_fazla_bekleme = en_fazla_bekleme
+        self.carpan = carpan
+        self.deneme_zaman_asimi = deneme_zaman_asimi
+
+        self._durum = KAPALI
+        self._hata_sayisi = 0
+        self._bekleme = ilk_bekleme
+        self._acilma_zamani = 0.0
+        self._son_hata: Optional[str] = None
+        self._deneme_suruyor = False
+        self._deneme_zamani = 0.0
+        self._kilit = threading.Lock()
+
+    def _kalan(self, simdi: float) -> float:
+        if self._durum == YARI_ACIK and self._deneme_suruyor:
+            # Deneme en geç zaman aşımında sonuçlanmış (veya kayıp) sayılır
+            return max(0.0, self._deneme_zamani + self.deneme_zaman_asimi - simdi)
+        return max(0.0, self._acilma_zamani + self._bekleme - simdi)
+
+    def izin_ver(self):
+        """Çağrıya izin verir; devre açıksa (veya deneme sürüyorsa) DevreAcikHatasi fırlatır"""
+        with self._kilit:
+            if self._durum == KAPALI:
+                return
+            simdi = time.monotonic()
+            kalan = self._kalan(simdi)
+            if kalan == 0.0:
+                # Bekleme doldu ya da önceki deneme zaman aşımına uğradı
+                self._durum = YARI_ACIK
+                self._deneme_suruyor = False
+            if self._durum == YARI_ACIK and not self._deneme_suruyor:
+                self._deneme_suruyor = True
+                self._deneme_zamani = simdi
+                return
+            raise DevreAcikHatasi(self.ad, kalan, self._son_hata)
+
+    def basarili(self):
+        with self._kilit:
+            self._durum = KAPALI
+            self._hata_sayisi = 0
+            self._bekleme = self.ilk_bekleme
+            self._son_hata = None
+            self._deneme_suruyor = False
+
+    def vazgec(self):
+        """İzin verilen çağrı sonuçlanmadan kesildiyse (ör. st.rerun) denemeyi bırakır; sıradaki çağrı yeniden dener"""
+        with self._kilit:
+            self._deneme_suruyor = False
+
+    def basarisiz(self, hata: Optional[BaseException] = None):
+        with self._kilit:
+            self._son_hata = str(hata) if hata is not None else None
+            self._hata_sayisi += 1
+            if self._durum == YARI_ACIK:
+                self._bekleme = min(self._bekleme * self.carpan, self.en_fazla_bekleme)
+            elif self._hata_sayisi < self.esik:
+                return
+            self._durum = ACIK
+            self._acilma_zamani = time.monotonic()
+            self._deneme_suruyor = False
+
+    @property
+    def acik(self) -> bool:
+        """Devre şu anda çağrıları reddediyor mu (bekleme süresi dolmadıysa)"""
+        with self._kilit:
+            return self._durum != KAPALI and self._kalan(time.monotonic()) > 0
+
+    def durum(self) -> Dict:
+        """Arayüzde gösterilecek özet: durum, hata sayısı, kalan süre, son hata"""
+        with self._kilit:
+            return {
+                "durum": self._durum,
+                "hata_sayisi": self._hata_sayisi,
+                "kalan_sure": self._kalan(time.monotonic()) if self._durum != KAPALI else 0.0,
+                "son_hata": self._son_hata,
+            }
+
+
+_kesiciler: Dict[str, DevreKesici] = {}
+_kesiciler_kilidi = threading.Lock()
+
+
+def devre_kesici(ad: str) -> DevreKesici:
+    """Ada (örneğin sunucu adına) göre süreç genelinde paylaşılan kesiciyi döndürür"""
+    with _kesiciler_kilidi:
+        kesici = _kesiciler.get(ad)
+        if kesici is None:
+            kesici = _kesiciler[ad] = DevreKesici(ad)
+        return kesici
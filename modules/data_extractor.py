@@ -1,72 +1,411 @@
+import numpy as np
 import pandas as pd
-from docx import Document
-import tempfile
 import os
 import io
-from typing import List, Union, Optional  # Tip tanımlamaları için
+import zipfile
+from xml.etree import ElementTree as ET
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union, Optional  # Tip tanımlamaları için
 import warnings  # Uyarıları yönetmek için
+import datetime
 from pathlib import Path 
 
-def extract_tables_from_docx(uploaded_file):
-    file_bytes = uploaded_file.read()  
+# Boş kabul edilen hücre içerikleri (NaN olarak okunur, hata sayılmaz)
+BOS_HUCRELER = ["", "-", "–", "—"]
+
+# WordprocessingML etiketleri (iterparse isim alanlı tam adları kullanır)
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY = W_NS + "body"
+W_TBL = W_NS + "tbl"
+W_TR = W_NS + "tr"
+W_TR_PR = W_NS + "trPr"
+W_GRID_BEFORE = W_NS + "gridBefore"
+W_TC = W_NS + "tc"
+W_TC_PR = W_NS + "tcPr"
+W_GRID_SPAN = W_NS + "gridSpan"
+W_V_MERGE = W_NS + "vMerge"
+W_P = W_NS + "p"
+W_R = W_NS + "r"
+W_HYPERLINK = W_NS + "hyperlink"
+W_T = W_NS + "t"
+W_TAB = W_NS + "tab"
+W_PTAB = W_NS + "ptab"
+W_BR = W_NS + "br"
+W_CR = W_NS + "cr"
+W_NO_BREAK_HYPHEN = W_NS + "noBreakHyphen"
+W_VAL = W_NS + "val"
+W_TYPE = W_NS + "type"
+
+
+class ParsedTable(NamedTuple):
+    """Ham metin tablosu ile aynı şekildeki sayısal karşılığı ve ayrıştırma hata maskesi"""
+    raw: pd.DataFrame
+    numeric: pd.DataFrame
+    parse_failed: pd.DataFrame
+
+
+def _satirlardan_dataframe(rows: Iterable[List[str]]) -> pd.DataFrame:
+    """İlk satırı başlık kabul ederek satır listesinden DataFrame oluşturur"""
+    data = []
+    keys = None
+
+    for r_idx, row_data in enumerate(rows):
+        if r_idx == 0:
+            keys = row_data
+        else:
+            data.append(row_data)
+
+    if keys:
+        return pd.DataFrame(data, columns=keys)
+    return pd.DataFrame(data)
+
+
+def _ana_belge_yolu(arsiv: zipfile.ZipFile) -> str:
+    """Paket ilişkilerinden ana belge XML'inin yolunu bulur (genelde word/document.xml)"""
+    try:
+        rels = ET.fromstring(arsiv.read("_rels/.rels"))
+        for rel in rels:
+            if rel.get("Type", "").endswith("/officeDocument"):
+                return rel.get("Target", "").lstrip("/")
+    except (KeyError, ET.ParseError):
+        pass
+    return "word/document.xml"
+
 
-    with tempfile.TemporaryDirectory() as temp_dir:
-        docx_path = os.path.join(temp_dir, "input.docx")
-        with open(docx_path, "wb") as f:
-            f.write(file_bytes)
+def _run_metni(run) -> str:
+    """python-docx Run.text ile aynı dönüşüm (tab, satır sonu, bölünmez tire)"""
+    parcalar = []
+    for e in run:
+        if e.tag == W_T:
+            parcalar.append(e.text or "")
+        elif e.tag in (W_TAB, W_PTAB):
+            parcalar.append("\t")
+        elif e.tag == W_CR:
+            parcalar.append("\n")
+        elif e.tag == W_BR:
+            if e.get(W_TYPE, "textWrapping") == "textWrapping":
+                parcalar.append("\n")
+        elif e.tag == W_NO_BREAK_HYPHEN:
+            parcalar.append("-")
+    return "".join(parcalar)
 
-        doc = Document(docx_path)
 
-        tables = []
-        for table in doc.tables:
-            data = []
-            keys = None
+def _hucre_metni(tc) -> str:
+    """python-docx _Cell.text ile aynı: doğrudan paragrafların metni, satır sonuyla birleştirilir"""
+    paragraflar = []
+    for p in tc.iterfind(W_P):
+        parcalar = []
+        for e in p:
+            if e.tag == W_R:
+                parcalar.append(_run_metni(e))
+            elif e.tag == W_HYPERLINK:
+                parcalar.extend(_run_metni(r) for r in e.iterfind(W_R))
+        paragraflar.append("".join(parcalar))
+    return "\n".join(paragraflar).strip()
 
-            for r_idx, row in enumerate(table.rows):
-                row_data = [cell.text.strip() for cell in row.cells]
-                if r_idx == 0:
-                    keys = row_data
-                else:
-                    data.append(row_data)
 
-            if keys:
-                df = pd.DataFrame(data, columns=keys)
+def _tablo_satirlari(tbl) -> Iterator[List[str]]:
+    """
+    Bir w:tbl elemanının satırlarını python-docx row.cells düzeninde üretir
+
+    gridSpan kadar aynı hücre tekrarlanır; vMerge="continue" hücreleri bir üst
+    satırdaki aynı ızgara konumundaki hücrenin metnini alır. Izgara konumları
+    satır bazında tutulduğu için hücre başına maliyet sabittir.
+    """
+    onceki_satir: Dict[int, str] = {}
+    for tr in tbl.iterfind(W_TR):
+        izgara = 0
+        tr_pr = tr.find(W_TR_PR)
+        if tr_pr is not None:
+            grid_before = tr_pr.find(W_GRID_BEFORE)
+            if grid_before is not None:
+                izgara = int(grid_before.get(W_VAL, 0))
+
+        satir: List[str] = []
+        bu_satir: Dict[int, str] = {}
+        for tc in tr.iterfind(W_TC):
+            span = 1
+            birlesik = None
+            tc_pr = tc.find(W_TC_PR)
+            if tc_pr is not None:
+                grid_span = tc_pr.find(W_GRID_SPAN)
+                if grid_span is not None:
+                    span = int(grid_span.get(W_VAL, 1))
+                v_merge = tc_pr.find(W_V_MERGE)
+                if v_merge is not None:
+                    birlesik = v_merge.get(W_VAL, "continue")
+
+            if birlesik == "continue":
+                metinler = [onceki_satir.get(izgara + k, "") for k in range(span)]
             else:
-                df = pd.DataFrame(data)
+                metinler = [_hucre_metni(tc)] * span
+
+            for k, metin in enumerate(metinler):
+                bu_satir[izgara + k] = metin
+            satir.extend(metinler)
+            izgara += span
+
+        onceki_satir = bu_satir
+        yield satir
+
+
+def iter_tables_from_docx_bytes(file_bytes: bytes) -> Iterator[pd.DataFrame]:
+    """
+    .docx içeriğindeki gövde tablolarını python-docx kullanmadan, sırayla üretir
+
+    Dosya bellekte zipfile ile açılır ve ana belge XML'i iterparse ile akış
+    halinde okunur. Her gövde elemanı işlendikten sonra ağaçtan silindiği için
+    bellek kullanımı belge boyutuyla değil en büyük tabloyla orantılıdır.
+    Yalnızca python-docx'teki Document.tables ile aynı tablolar (gövdenin
+    doğrudan alt tabloları) döndürülür.
+
+    Parametreler:
+        file_bytes: .docx dosyasının baytları
+
+    Dönüş:
+        Tablo başına bir DataFrame üreten iterator (ilk satır sütun başlığıdır)
+    """
+    with zipfile.ZipFile(io.BytesIO(file_bytes)) as arsiv:
+        with arsiv.open(_ana_belge_yolu(arsiv)) as xml:
+            derinlik = 0
+            body = None
+            for olay, eleman in ET.iterparse(xml, events=("start", "end")):
+                if olay == "start":
+                    derinlik += 1
+                    if eleman.tag == W_BODY and body is None:
+                        body = eleman
+                        govde_derinligi = derinlik
+                    continue
+
+                if body is not None and derinlik == govde_derinligi + 1:
+                    # Gövdenin doğrudan alt elemanı tamamlandı
+                    if eleman.tag == W_TBL:
+                        yield _satirlardan_dataframe(_tablo_satirlari(eleman))
+                    body.remove(eleman)
+                derinlik -= 1
 
-            tables.append(df)
 
-        return tables
-    
-def extract_tables_from_excel(excel_file):
+def _extract_tables_with_python_docx(file_bytes: bytes) -> List[pd.DataFrame]:
+    # python-docx yalnızca bu yedek yolda gerekir; uygulama açılışında import edilmez
+    from docx import Document
+
+    doc = Document(io.BytesIO(file_bytes))
+
+    tables = []
+    for table in doc.tables:
+        rows = ([cell.text.strip() for cell in row.cells] for row in table.rows)
+        tables.append(_satirlardan_dataframe(rows))
+
+    return tables
+
+
+def extract_tables_from_docx(uploaded_file):
+    """
+    Word dosyasındaki tüm tabloları çıkarır
+
+    Önce hızlı akış okuyucusu (iter_tables_from_docx_bytes) denenir; belge
+    onunla okunamazsa python-docx ile okunur.
+
+    Parametreler:
+        uploaded_file: Yüklenen Word dosyası (Streamlit file_uploader objesi)
+
+    Dönüş:
+        Tabloların listesi (DataFrame'ler)
+    """
+    file_bytes = uploaded_file.read()
+
+    try:
+        return list(iter_tables_from_docx_bytes(file_bytes))
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, ValueError) as e:
+        warnings.warn(f"Hızlı docx okuyucu başarısız, python-docx kullanılıyor: {str(e)}")
+        return _extract_tables_with_python_docx(file_bytes)
+
+
+def _excel_hucresi(value):
+    """pandas'ın openpyxl okuyucusu gibi tam sayı değerli float'ları int yapar"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _excel_basligi(value) -> str:
+    """
+    Başlık hücresini metne çevirir
+
+    Tarih biçimli başlıklar Word tablolarındaki gibi 'gg.aa.yyyy' olur; sayılar
+    ve diğer değerler metin haline getirilir, böylece dönem sütunları
+    dosya türünden bağımsız olarak aynı şekilde aranabilir.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.strftime("%d.%m.%Y")
+    return str(_excel_hucresi(value))
+
+
+def _excel_basliklari(header: List, width: int) -> List[str]:
+    """Boş başlıkları 'Unnamed: i', tekrar edenleri 'ad.1' olarak adlandırır (pd.read_excel ile aynı)"""
+    basliklar = []
+    gorulen: Dict = {}
+    for i in range(width):
+        value = header[i] if i < len(header) else None
+        col = f"Unnamed: {i}" if value is None else _excel_basligi(value)
+        if col in gorulen:
+            gorulen[col] += 1
+            yeni = f"{col}.{gorulen[col]}"
+            while yeni in gorulen:
+                gorulen[col] += 1
+                yeni = f"{col}.{gorulen[col]}"
+            gorulen[yeni] = 0
+            col = yeni
+        else:
+            gorulen[col] = 0
+        basliklar.append(col)
+    return basliklar
+
+
+def _sayfa_dataframe(ws) -> Optional[pd.DataFrame]:
+    """
+    Salt okunur bir çalışma sayfasını satır satır okuyarak DataFrame'e çevirir
+
+    İlk dolu satır başlıktır. Sayfa boşsa veya başlık satırında hiç değer yoksa
+    veri satırları okunmadan None döner.
+    """
+    # Hatalı boyut bilgisi (ör. A1:XFD1048576) satırların gereksiz doldurulmasına yol açar
+    ws.reset_dimensions()
+    satirlar = ws.iter_rows(values_only=True)
+
+    header = None
+    for row in satirlar:
+        if any(v is not None for v in row):
+            header = list(row)
+            break
+    if header is None:
+        return None
+
+    data = []
+    son_dolu = -1
+    for row in satirlar:
+        row = list(row)
+        while row and row[-1] is None:
+            row.pop()
+        if row:
+            son_dolu = len(data)
+        data.append([_excel_hucresi(v) for v in row])
+    del data[son_dolu + 1:]
+
+    while header and header[-1] is None:
+        header.pop()
+    width = max([len(header)] + [len(row) for row in data])
+    for row in data:
+        row.extend([None] * (width - len(row)))
+
+    df = pd.DataFrame(data, columns=_excel_basliklari(header, width))
+    return df.fillna(np.nan)
+
+
+def extract_tables_from_excel(excel_file, required_labels: Optional[Iterable[str]] = None):
     """
     Excel dosyasındaki tüm sayfalardaki tabloları çıkarır
-    
+
+    Çalışma kitabı openpyxl ile salt okunur modda tek geçişte okunur; satırlar
+    akış halinde gelir, boş veya başlıksız sayfalar veri satırları okunmadan atlanır.
+
     Parametreler:
         excel_file: Yüklenen Excel dosyası (Streamlit file_uploader objesi)
-    
+        required_labels: Verilirse, bu kalem adlarının tümü tabloların ilk
+            sütununda bulunduktan sonra kalan sayfalar okunmaz
+
     Dönüş:
         Tabloların listesi (DataFrame'ler)
     """
     try:
-        # Excel dosyasını oku
-        excel_data = pd.ExcelFile(io.BytesIO(excel_file.read()))
-        tables = []
-        
-        # Her sayfayı işle
-        for sheet_name in excel_data.sheet_names:
-            df = pd.read_excel(excel_data, sheet_name=sheet_name)
-            
-            # Boş olmayan ve geçerli sütun isimleri olan tabloları ekle
-            if not df.empty and not all(col.startswith('Unnamed') for col in df.columns):
+        # openpyxl ilk Excel dosyası okunurken import edilir
+        from openpyxl import load_workbook
+
+        # Dosya objesi kopyalanmadan doğrudan okunur
+        wb = load_workbook(excel_file, read_only=True, data_only=True, keep_links=False)
+        try:
+            tables = []
+            aranan = set(required_labels) if required_labels is not None else None
+
+            # Her sayfayı işle
+            for ws in wb.worksheets:
+                df = _sayfa_dataframe(ws)
+                if df is None or df.empty:
+                    continue
+
                 # Sayfa adını dataframe'e ek özellik olarak kaydet
-                df.attrs['sheet_name'] = sheet_name  
+                df.attrs['sheet_name'] = ws.title
                 tables.append(df)
-                
-        return tables
-        
+
+                if aranan is not None:
+                    aranan.difference_update(df.iloc[:, 0].tolist())
+                    if not aranan:
+                        break
+
+            return tables
+        finally:
+            wb.close()
+
     except Exception as e:
         print(f"Excel dosyası işleme hatası: {str(e)}")
         return []
-    
 
+
+def parse_numeric_table(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Türkçe biçimli ("1.234,56", "(12.345)") tablo hücrelerini toplu olarak float'a çevirir
+
+    Tüm hücreler tek bir sütun halinde vektörel string işlemleriyle dönüştürülür:
+    parantezli değerler negatif, noktalar binlik ayracı, virgül ondalık ayracıdır.
+    Boş hücreler ve tireler NaN olur. Excel'den gelen sayısal hücreler olduğu gibi
+    kullanılır.
+
+    Parametreler:
+        df: Ham tablo (extract_tables_from_docx / extract_tables_from_excel çıktısı)
+
+    Dönüş:
+        (float64 DataFrame, sayıya çevrilemeyen dolu hücreler için bool maske);
+        ikisi de df ile aynı indeks ve sütunlara sahiptir
+    """
+    hucreler = pd.Series(df.to_numpy(dtype=object).ravel(), dtype=object)
+    if pd.api.types.infer_dtype(hucreler, skipna=True) in ("string", "empty"):
+        # Word tablolarında tüm hücreler metindir; tip kontrolü tek C döngüsüyle biter
+        metin_mi = hucreler.notna()
+    else:
+        metin_mi = hucreler.map(lambda v: isinstance(v, str)).astype(bool)
+
+    # Metin hücreleri pandas string dtype'ına alınıp toplu işlenir
+    metin = hucreler.where(metin_mi).astype("string").str.strip()
+    bos = metin.isin(BOS_HUCRELER).fillna(False).astype(bool)
+
+    parantezli = (metin.str.startswith("(") & metin.str.endswith(")")).fillna(False).astype(bool)
+    metin = metin.where(~parantezli, "-" + metin.str.slice(1, -1))
+    metin = metin.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    metin = metin.where(~bos).fillna("nan").to_numpy(dtype=object)
+
+    try:
+        # Hızlı yol: tüm metinler sayıya çevrilebiliyorsa numpy tek geçişte dönüştürür
+        sayilar = metin.astype(np.float64)
+    except ValueError:
+        sayilar = pd.to_numeric(metin, errors="coerce").astype(np.float64)
+
+    metin_maskesi = metin_mi.to_numpy()
+    if metin_maskesi.all():
+        degerler = sayilar
+    else:
+        diger = pd.to_numeric(hucreler.where(~metin_mi), errors="coerce").to_numpy(dtype=np.float64)
+        degerler = np.where(metin_maskesi, sayilar, diger)
+
+    hatali = np.isnan(degerler) & ~bos.to_numpy() & hucreler.notna().to_numpy()
+
+    numeric = pd.DataFrame(degerler.reshape(df.shape), index=df.index, columns=df.columns)
+    parse_failed = pd.DataFrame(hatali.reshape(df.shape), index=df.index, columns=df.columns)
+    return numeric, parse_failed
+
+
+def parse_tables(tables: List[pd.DataFrame]) -> List[ParsedTable]:
+    """Çıkarılan her tablo için sayısal karşılığını ve hata maskesini üretir"""
+    parsed = []
+    for df in tables:
+        numeric, parse_failed = parse_numeric_table(df)
+        parsed.append(ParsedTable(df, numeric, parse_failed))
+    return parsed
@@ -1,4 +1,4 @@
-import streamlit as st
+import numpy as np
 def nwcdegisim(donenVarliklar, kisaVadeliYukumlulukler):
     return donenVarliklar - kisaVadeliYukumlulukler
 
@@ -15,7 +15,9 @@ def fcf(nwc_degisim, capex, ebit, amortisman, donemOncesiVergiGelirGideri):
 def bes_yillik_fcf(faaliyet_kari, amortisman_degerleri, odenen_vergi, delta_NWC, capex_degerleri):
     fcf_listesi = []
     
-    for i in range(5):
+    # Projeksiyon süresi girdilerin uzunluğundan alınır (varsayılan sayfada 5 yıl)
+    yil_sayisi = min(len(faaliyet_kari), len(amortisman_degerleri), len(odenen_vergi), len(delta_NWC), len(capex_degerleri))
+    for i in range(yil_sayisi):
         fcf = (faaliyet_kari[i]) + amortisman_degerleri[i] - odenen_vergi[i] - delta_NWC[i] - capex_degerleri[i]
         fcf_listesi.append(fcf)
     
@@ -65,3 +67,113 @@ def terminal_degeri(fcf_listesi, buyume_orani, wacc):
         raise ValueError("FCF listesi boş olamaz")
     except (TypeError, ValueError) as e:
         raise ValueError(f"Geçersiz giriş değeri: {str(e)}")
+
+
+def toplu_dcf(faaliyet_kari, amortisman_degerleri, odenen_vergi, delta_NWC, capex_degerleri,
+              wacc, terminal_buyume, indirgeme_degerleri=None, net_borc=0.0):
+    """
+    Çok sayıda şirket ve senaryo için FCF, indirgeme, terminal değer ve toplam
+    değeri tek bir vektörel çağrıda hesaplar (bes_yillik_fcf, bes_yillik_indirgeme
+    ve terminal_degeri'nin dizi karşılığı)
+
+    Parametreler:
+        faaliyet_kari, amortisman_degerleri, odenen_vergi, delta_NWC, capex_degerleri:
+            (şirket x senaryo x yıl) şeklinde veya bu şekle yayınlanabilen diziler;
+            yıl sayısı son eksenden alınır
+        wacc, terminal_buyume: (şirket x senaryo) şekline yayınlanabilen oranlar (0.1318 gibi)
+        indirgeme_degerleri: Yıl bazında indirgeme katsayıları, son ekseni yıl olan
+            ve yukarıdaki şekle yayınlanabilen dizi (1'den büyük değerler yüzde kabul
+            edilir). None ise katsayılar 1 / (1 + wacc) ** t olarak hesaplanır
+        net_borc: (şirket x senaryo) şekline yayınlanabilen net borç
+
+    Dönüş:
+        Sözlük:
+            'fcf': (şirket x senaryo x yıl) serbest nakit akımları
+            'indirgenmis_fcf': (şirket x senaryo x yıl) bugünkü değerler
+            'terminal_deger': (şirket x senaryo) bugüne indirgenmiş terminal değer;
+                WACC <= terminal büyüme olan hücrelerde NaN
+            'sirket_degeri': indirgenmiş FCF toplamı + terminal değer
+            'firma_degeri': sirket_degeri - net borç
+    """
+    fcf_dizisi = (np.asarray(faaliyet_kari, dtype=np.float64)
+                  + np.asarray(amortisman_degerleri, dtype=np.float64)
+                  - np.asarray(odenen_vergi, dtype=np.float64)
+                  - np.asarray(delta_NWC, dtype=np.float64)
+                  - np.asarray(capex_degerleri, dtype=np.float64))
+    yil_sayisi = fcf_dizisi.shape[-1]
+
+    wacc = np.asarray(wacc, dtype=np.float64)
+    terminal_buyume = np.asarray(terminal_buyume, dtype=np.float64)
+
+    if indirgeme_degerleri is None:
+        yillar = np.arange(1, yil_sayisi + 1, dtype=np.float64)
+        katsayilar = (1 + wacc[..., np.newaxis]) ** -yillar
+    else:
+        katsayilar = np.asarray(indirgeme_degerleri, dtype=np.float64)
+        # % olarak girildiyse düzelt (örneğin 89.93 → 0.8993)
+        katsayilar = np.where(katsayilar > 1, katsayilar / 100, katsayilar)
+
+    indirgenmis = fcf_dizisi * katsayilar
+
+    # Terminal değer = [FCF * (1+g)] / (WACC - g), bugüne / (1+WACC)^n ile indirgenir
+    gecerli = wacc > terminal_buyume
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal = (fcf_dizisi[..., -1] * (1 + terminal_buyume)
+                    / (wacc - terminal_buyume)
+                    / (1 + wacc) ** yil_sayisi)
+    terminal = np.where(gecerli, terminal, np.nan)
+
+    sirket_degeri = indirgenmis.sum(axis=-1) + terminal
+    firma_degeri = sirket_degeri - np.asarray(net_borc, dtype=np.float64)
+
+    return {
+        'fcf': fcf_dizisi,
+        'indirgenmis_fcf': indirgenmis,
+        'terminal_deger': terminal,
+        'sirket_degeri': sirket_degeri,
+        'firma_degeri': firma_degeri,
+    }
+
+
+def duyarlilik_izgarasi(fcf_listesi, wacc_degerleri, buyume_degerleri, indirgeme_degerleri=None,
+                        net_borc=0.0, ilk_yil_farklari=None):
+    """
+    WACC x terminal büyüme (isteğe bağlı olarak x 1. yıl FCF farkı) ızgarası
+    üzerinde terminal değeri ve firma değerini tek bir yayınlama (broadcast) ile hesaplar
+
+    Parametreler:
+        fcf_listesi: Yıllık FCF tahminleri
+        wacc_degerleri: Izgaranın WACC ekseni (W değer)
+        buyume_degerleri: Izgaranın terminal büyüme ekseni (G değer)
+        indirgeme_degerleri: Yıl bazında sabit indirgeme katsayıları (sayfadaki
+            gibi); None ise her WACC için 1 / (1 + wacc) ** t kullanılır
+        net_borc: Firma değerinden düşülecek net borç
+        ilk_yil_farklari: Verilirse 1. yıl FCF'sine eklenecek farklar (K değer),
+            örneğin 1. yıl faaliyet karındaki değişimler
+
+    Dönüş:
+        Sözlük: 'terminal_deger' ve 'firma_degeri'; şekil (W x G) ya da
+        ilk_yil_farklari verildiyse (K x W x G). WACC <= g hücreleri hata
+        yerine NaN'dır.
+    """
+    fcf_dizisi = np.asarray(fcf_listesi, dtype=np.float64)
+    if fcf_dizisi.size == 0:
+        raise ValueError("FCF listesi boş olamaz")
+
+    if ilk_yil_farklari is not None:
+        farklar = np.asarray(ilk_yil_farklari, dtype=np.float64)
+        fcf_dizisi = np.broadcast_to(fcf_dizisi, farklar.shape + fcf_dizisi.shape).copy()
+        fcf_dizisi[..., 0] += farklar
+        # (K x 1 x 1 x yıl) → sonuçlar (K x W x G)
+        fcf_dizisi = fcf_dizisi[:, np.newaxis, np.newaxis, :]
+
+    sifir = np.zeros(1)
+    wacc = np.asarray(wacc_degerleri, dtype=np.float64)[:, np.newaxis]
+    buyume = np.asarray(buyume_degerleri, dtype=np.float64)[np.newaxis, :]
+
+    sonuc = toplu_dcf(fcf_dizisi, sifir, sifir, sifir, sifir, wacc, buyume,
+                      indirgeme_degerleri=indirgeme_degerleri, net_borc=net_borc)
+    return {
+        'terminal_deger': sonuc['terminal_deger'],
+        'firma_degeri': sonuc['firma_degeri'],
+    }
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, List, Optional, Sequence
+
+from modules.data_extractor import ParsedTable, parse_numeric_table
+
+
+class FinancialStatement:
+    """
+    Bir finansal tablonun (bilanço, gelir tablosu) indekslenmiş, sayısal hali
+
+    İlk sütundaki kalem adları satır indeksine, kalan sütun başlıkları dönem
+    indeksine çevrilir; hücreler bir kez float'a dönüştürülüp tek bir matriste
+    tutulur. Böylece her (kalem, dönem) erişimi tablo taraması yerine O(1)
+    sözlük + dizi erişimidir.
+
+    Parametreler:
+        labels: Kalem adları (satır sırasıyla)
+        periods: Dönem sütun başlıkları (sütun sırasıyla)
+        values: len(labels) x len(periods) boyutlu değer matrisi
+        blank: Kaynak tabloda boş / sayıya çevrilemeyen hücrelerin maskesi
+            (None ise values içindeki NaN'lar)
+    """
+
+    def __init__(self, labels: Sequence[Hashable], periods: Sequence[Hashable], values, blank=None):
+        self.labels = list(labels)
+        self.periods = list(periods)
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(self.labels), len(self.periods))
+        # Doldurma değeri (fill_value) uygulanmış hücreler de boş olarak bilinir
+        if blank is None:
+            self.blank = np.isnan(self.values)
+        else:
+            self.blank = np.asarray(blank, dtype=bool).reshape(self.values.shape)
+
+        # Aynı isimli kalem birden fazla ise ilk satır geçerli (eski .values[0] davranışı)
+        self._satir_indeksi: Dict[Hashable, int] = {}
+        for i, label in enumerate(self.labels):
+            self._satir_indeksi.setdefault(label, i)
+
+        self._sutun_indeksi: Dict[Hashable, int] = {}
+        for j, period in enumerate(self.periods):
+            self._sutun_indeksi.setdefault(period, j)
+
+    @classmethod
+    def from_parsed(cls, table: ParsedTable, fill_value: Optional[float] = 0.0) -> "FinancialStatement":
+        """
+        Çıkarım sırasında sayıya çevrilmiş bir tablodan FinancialStatement oluşturur
+
+        Parametreler:
+            table: parse_tables çıktısındaki ParsedTable (ilk sütun kalem adlarıdır)
+            fill_value: Boş / sayıya çevrilemeyen hücreler için kullanılacak değer
+        """
+        raw, numeric = table.raw, table.numeric
+        if raw.shape[1] == 0:
+            return cls([], [], np.empty((0, 0)))
+
+        values = numeric.iloc[:, 1:].to_numpy(dtype=np.float64)
+        blank = np.isnan(values)
+        if fill_value is not None:
+            values = np.where(blank, fill_value, values)
+        return cls(raw.iloc[:, 0].tolist(), raw.columns[1:].tolist(), values, blank)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, fill_value: Optional[float] = 0.0) -> "FinancialStatement":
+        """
+        extract_tables_from_docx / extract_tables_from_excel çıktısındaki bir
+        tablodan FinancialStatement oluşturur (ilk sütun kalem adlarıdır)
+        """
+        numeric, parse_failed = parse_numeric_table(df)
+        return cls.from_parsed(ParsedTable(df, numeric, parse_failed), fill_value)
+
+    def __contains__(self, label) -> bool:
+        return label in self._satir_indeksi
+
+    def has_period(self, period) -> bool:
+        return period in self._sutun_indeksi
+
+    def _satir(self, label) -> int:
+        try:
+            return self._satir_indeksi[label]
+        except KeyError:
+            raise KeyError(f"Kalem bulunamadı: {label}") from None
+
+    def _sutun(self, period) -> int:
+        try:
+            return self._sutun_indeksi[period]
+        except KeyError:
+            raise KeyError(f"Dönem bulunamadı: {period}") from None
+
+    def get(self, label, period) -> float:
+        """Tek bir kalemin seçilen dönemdeki değeri (yoksa KeyError)"""
+        return float(self.values[self._satir(label), self._sutun(period)])
+
+    def is_blank(self, label, period) -> bool:
+        """Hücre kaynak tabloda boş / sayıya çevrilemez miydi (get() doldurma değerini döndürür)"""
+        return bool(self.blank[self._satir(label), self._sutun(period)])
+
+    def get_many(self, labels: Sequence[Hashable], periods: Sequence[Hashable]) -> np.ndarray:
+        """
+        Birden fazla kalemi birden fazla dönem için tek seferde döndürür
+
+        Dönüş:
+            len(labels) x len(periods) boyutlu float64 dizisi
+        """
+        satirlar = [self._satir(label) for label in labels]
+        sutunlar = [self._sutun(period) for period in periods]
+        return self.values[np.ix_(satirlar, sutunlar)]
+
+    def row(self, label) -> np.ndarray:
+        """Bir kalemin tüm dönemlerdeki değerleri"""
+        return self.values[self._satir(label)]
+
+    def missing(self, labels: Sequence[Hashable]) -> List[Hashable]:
+        """Tabloda bulunmayan kalemleri döndürür"""
+        return [label for label in labels if label not in self._satir_indeksi]
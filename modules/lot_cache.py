@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from modules.circuit_breaker import devre_kesici
+from modules.webScrapping import VARSAYILAN_URL, lotlari_ayristir, ortak_oturum
+
+# Lot bilgisinin yeniden doğrulanmadan taze kabul edildiği süre (sn)
+LOT_TTL_SN = float(os.environ.get("LOT_ONBELLEK_TTL", 6 * 60 * 60))
+
+# Lot bilgisi ayrıştırılamayan sayfanın yeniden denenmeden önce beklenen süre (sn)
+LOT_NEGATIF_TTL_SN = float(os.environ.get("LOT_ONBELLEK_NEGATIF_TTL", 5 * 60))
+
+# Disk önbelleğinin varsayılan dizini
+LOT_ONBELLEK_DIZINI = os.environ.get(
+    "LOT_ONBELLEK_DIZINI",
+    os.path.join(os.path.expanduser("~"), ".cache", "finansal_analiz", "lotlar")
+)
+
+
+class LotOnbellegi:
+    """
+    Kazınan pay / ek pay lot bilgisi için iki katmanlı (bellek + disk) önbellek
+
+    - Taze kayıt (TTL içinde) ağa gidilmeden döner.
+    - Süresi geçmiş kayıt da hemen döner; arka planda ETag / Last-Modified ile
+      koşullu istek atılarak yenilenir (stale-while-revalidate). Sunucu 304
+      dönerse yalnızca kaydın zamanı güncellenir.
+    - Hiç kaydı olmayan URL ilk seferde eşzamanlı olarak çekilir.
+    - Lot bilgisi ayrıştırılamayan sayfa (ör. bakım sayfası) diske yazılmaz ve
+      önceki geçerli kaydı ezmez; yalnızca bellekte negatif_ttl kadar tutulur.
+      Önceki kayıt varsa o değerler dönmeye devam eder.
+    - İstekler sunucu başına bir DevreKesici'den geçer; sunucu art arda
+      başarısız olursa çağrılar bekleme süresi boyunca ağa gitmeden reddedilir.
+
+    Parametreler:
+        dizin: Disk katmanının dizini (None ise yalnızca bellek kullanılır)
+        ttl: Kaydın taze kabul edildiği süre (sn)
+        negatif_ttl: Ayrıştırılamayan sayfanın yeniden denenmeden önceki süresi (sn)
+        session: İsteklerde kullanılacak oturum (None ise ortak_oturum())
+        timeout: İstek zaman aşımı (sn)
+    """
+
+    def __init__(self, dizin: Optional[str] = LOT_ONBELLEK_DIZINI, ttl: float = LOT_TTL_SN,
+                 session: Optional[requests.Session] = None, timeout: float = 10,
+                 negatif_ttl: float = LOT_NEGATIF_TTL_SN):
+        self.dizin = dizin
+        self.ttl = ttl
+        self.negatif_ttl = negatif_ttl
+        self.session = session
+        self.timeout = timeout
+        self._bellek: Dict[str, Dict] = {}
+        self._yenilenenler = set()
+        self._kilit = threading.Lock()
+
+    def _dosya_yolu(self, url: str) -> str:
+        return os.path.join(self.dizin, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _diskten_oku(self, url: str) -> Optional[Dict]:
+        if not self.dizin:
+            return None
+        try:
+            with open(self._dosya_yolu(url), "r", encoding="utf-8") as f:
+                kayit = json.load(f)
+            return kayit if kayit.get("url") == url else None
+        except (OSError, ValueError):
+            return None
+
+    def _diske_yaz(self, kayit: Dict):
+        if not self.dizin:
+            return
+        try:
+            os.makedirs(self.dizin, exist_ok=True)
+            # Yarım yazılmış dosya okunmasın diye geçici dosyaya yazılıp yer değiştirilir
+            fd, gecici = tempfile.mkstemp(dir=self.dizin, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(kayit, f)
+            os.replace(gecici, self._dosya_yolu(kayit["url"]))
+        except OSError as e:
+            print(f"Lot önbelleği diske yazılamadı: {str(e)}")
+
+    def _kaydet(self, kayit: Dict):
+        with self._kilit:
+            self._bellek[kayit["url"]] = kayit
+        self._diske_yaz(kayit)
+
+    def _kayit(self, url: str) -> Optional[Dict]:
+        with self._kilit:
+            kayit = self._bellek.get(url)
+        if kayit is None:
+            kayit = self._diskten_oku(url)
+            if kayit is not None:
+                with self._kilit:
+                    self._bellek.setdefault(url, kayit)
+        return kayit
+
+    def _cek(self, url: str, onceki: Optional[Dict] = None) -> Dict:
+        """Sayfayı (önceki kayıt varsa koşullu olarak) çeker ve yeni kaydı döndürür"""
+        basliklar = {}
+        if onceki is not None:
+            if onceki.get("etag"):
+                basliklar["If-None-Match"] = onceki["etag"]
+            if onceki.get("last_modified"):
+                basliklar["If-Modified-Since"] = onceki["last_modified"]
+
+        kesici = devre_kesici(urlsplit(url).netloc)
+        kesici.izin_ver()
+        try:
+            response = (self.session or ortak_oturum()).get(url, headers=basliklar, timeout=self.timeout)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except Exception as e:
+            kesici.basarisiz(e)
+            raise
+        except BaseException:
+            # Betik kesildi (st.rerun / st.stop); bu kaynağın hatası sayılmaz
+            kesici.vazgec()
+            raise
+        kesici.basarili()
+
+        if response.status_code == 304 and onceki is not None:
+            kayit = dict(onceki, zaman=time.time())
+        else:
+            pay_lot, ek_pay_lot = lotlari_ayristir(response.text)
+            if pay_lot is None and ek_pay_lot is None:
+                # Bozuk sayfa geçerli kaydın yerine geçmez; koşulsuz yeniden denenmek üzere yalnızca bellekte tutulur
+                kayit = dict(onceki or {"url": url, "pay_lot": None, "ek_pay_lot": None},
+                             etag=None, last_modified=None, zaman=time.time(), ayristirilamadi=True)
+                with self._kilit:
+                    self._bellek[url] = kayit
+                return kayit
+            kayit = {
+                "url": url,
+                "pay_lot": pay_lot,
+                "ek_pay_lot": ek_pay_lot,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "zaman": time.time(),
+            }
+        self._kaydet(kayit)
+        return kayit
+
+    def _arka_planda_yenile(self, url: str, onceki: Dict):
+        if devre_kesici(urlsplit(url).netloc).acik:
+            return
+        with self._kilit:
+            if url in self._yenilenenler:
+                return
+            self._yenilenenler.add(url)
+
+        def yenile():
+            try:
+                self._cek(url, onceki)
+            except Exception as e:
+                # Yenileme başarısızsa eski değer kullanılmaya devam eder
+                print(f"Lot bilgisi yenilenemedi: {str(e)}")
+            finally:
+                with self._kilit:
+                    self._yenilenenler.discard(url)
+
+        threading.Thread(target=yenile, name="lot-yenile", daemon=True).start()
+
+    def getir(self, url: str = VARSAYILAN_URL) -> Tuple[Optional[int], Optional[int]]:
+        """
+        URL'nin (pay lot, ek pay lot) bilgisini önbellekten döndürür
+
+        Dönüş:
+            (pay_lot, ek_pay_lot); hiç kayıt yoksa ve çekme başarısızsa (None, None)
+        """
+        kayit = self._kayit(url)
+        if kayit is None:
+            try:
+                kayit = self._cek(url)
+            except Exception as e:
+                print(f"Hata oluştu: {str(e)}")
+                return None, None
+        elif time.time() - kayit.get("zaman", 0) > (self.negatif_ttl if kayit.get("ayristirilamadi") else self.ttl):
+            self._arka_planda_yenile(url, kayit)
+        return kayit["pay_lot"], kayit["ek_pay_lot"]
+
+    def temizle(self):
+        """Bellek katmanını boşaltır (disk kayıtları korunur)"""
+        with self._kilit:
+            self._bellek.clear()
+
+
+_lot_onbellegi = LotOnbellegi()
+
+
+def onbellekli_hisse_lotlari(url: str = VARSAYILAN_URL) -> Tuple[Optional[int], Optional[int]]:
+    """fetch_hisse_lotlari'nın süreç genelinde paylaşılan önbellekli karşılığı"""
+    return _lot_onbellegi.getir(url)
+
+
+def lot_devre_durumu(url: str = VARSAYILAN_URL) -> Dict:
+    """Lot sayfasının sunucusu için devre kesici durumu (DevreKesici.durum())"""
+    return devre_kesici(urlsplit(url).netloc).durum()
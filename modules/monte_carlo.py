@@ -0,0 +1,136 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Union
+
+from modules.dcf_model import toplu_dcf
+
+# Desteklenen dağılımlar ve beklenen parametreleri
+DAGILIMLAR = {
+    "sabit": ("deger",),
+    "normal": ("ortalama", "std"),
+    "uniform": ("alt", "ust"),
+    "ucgen": ("alt", "tepe", "ust"),
+    "lognormal": ("mu", "sigma"),
+}
+
+
+def ornekle(rng: np.random.Generator, dagilim: Dict, boyut) -> np.ndarray:
+    """
+    Dağılım tanımına göre örnek çeker
+
+    Parametreler:
+        rng: numpy Generator
+        dagilim: {"tur": "normal", "ortalama": 0.13, "std": 0.01} gibi bir sözlük
+            (türler ve parametreleri DAGILIMLAR'da)
+        boyut: Çekilecek dizinin şekli
+    """
+    tur = dagilim.get("tur", "sabit")
+    if tur not in DAGILIMLAR:
+        raise ValueError(f"Bilinmeyen dağılım türü: {tur}")
+    eksik = [p for p in DAGILIMLAR[tur] if p not in dagilim]
+    if eksik:
+        raise ValueError(f"{tur} dağılımı için eksik parametre: {', '.join(eksik)}")
+
+    if tur == "sabit":
+        return np.full(boyut, float(dagilim["deger"]))
+    if tur == "normal":
+        return rng.normal(dagilim["ortalama"], dagilim["std"], boyut)
+    if tur == "uniform":
+        return rng.uniform(dagilim["alt"], dagilim["ust"], boyut)
+    if tur == "ucgen":
+        return rng.triangular(dagilim["alt"], dagilim["tepe"], dagilim["ust"], boyut)
+    return rng.lognormal(dagilim["mu"], dagilim["sigma"], boyut)
+
+
+def monte_carlo_dcf(
+    fcf_listesi: Sequence[float],
+    wacc_dagilimi: Dict,
+    buyume_dagilimi: Dict,
+    fcf_dagilimi: Union[Dict, List[Dict], None] = None,
+    net_borc: float = 0.0,
+    piyasa_degeri: Optional[float] = None,
+    indirgeme_degerleri: Optional[Sequence[float]] = None,
+    cekilis_sayisi: int = 1_000_000,
+    parca_boyutu: int = 100_000,
+    seed: Optional[int] = None,
+    kutu_sayisi: int = 50,
+    yuzdelikler: Sequence[float] = (5, 25, 50, 75, 95),
+) -> Dict:
+    """
+    WACC, terminal büyüme ve yıllık FCF'yi örnekleyerek firma değeri dağılımını hesaplar
+
+    Her çekilişte yıllık FCF = baz FCF * (1 + şok) olarak alınır ve toplu_dcf ile
+    değerlenir. Çekilişler parca_boyutu'luk parçalar halinde işlendiği için ara
+    diziler (parça x yıl) boyutunu aşmaz; yalnızca sonuç dizisi tam boyutta tutulur.
+
+    Parametreler:
+        fcf_listesi: Baz yıllık FCF tahminleri (bes_yillik_fcf çıktısı)
+        wacc_dagilimi, buyume_dagilimi: ornekle() için dağılım tanımları
+        fcf_dagilimi: FCF şoku dağılımı; tek tanım tüm yıllara bağımsız uygulanır,
+            liste verilirse yıl bazında kullanılır. None ise FCF sabittir
+        net_borc: Firma değerinden düşülecek net borç
+        piyasa_degeri: Verilirse değerin bunu aşma olasılığı hesaplanır; WACC <= g
+            olan (değerlenemeyen) çekilişler aşmamış sayılır
+        indirgeme_degerleri: Yıl bazında sabit indirgeme katsayıları; None ise
+            her çekilişin WACC'ı ile 1 / (1 + wacc) ** t kullanılır
+        cekilis_sayisi: Toplam çekiliş sayısı
+        parca_boyutu: Bir seferde değerlenen çekiliş sayısı
+        seed: Tekrarlanabilir sonuç için tohum
+        kutu_sayisi: Histogram kutu sayısı
+        yuzdelikler: Raporlanacak yüzdelikler
+
+    Dönüş:
+        Sözlük: 'degerler' (firma değerleri, WACC <= g çekilişlerinde NaN),
+        'yuzdelikler', 'ortalama', 'histogram' (sayılar, kutu sınırları),
+        'gecersiz_oran', 'piyasa_degerini_asma_olasiligi' (tüm çekilişler üzerinden),
+        'gecerli_cekilislerde_asma_olasiligi' (yalnızca değerlenebilen çekilişler üzerinden)
+    """
+    baz_fcf = np.asarray(fcf_listesi, dtype=np.float64)
+    yil_sayisi = baz_fcf.shape[0]
+    if yil_sayisi == 0:
+        raise ValueError("FCF listesi boş olamaz")
+    if cekilis_sayisi < 1:
+        raise ValueError("Çekiliş sayısı en az 1 olmalıdır")
+    if parca_boyutu < 1:
+        raise ValueError("Parça boyutu en az 1 olmalıdır")
+    if isinstance(fcf_dagilimi, list) and len(fcf_dagilimi) != yil_sayisi:
+        raise ValueError("Yıl bazında FCF dağılımı sayısı FCF listesi ile aynı olmalıdır")
+
+    rng = np.random.default_rng(seed)
+    degerler = np.empty(cekilis_sayisi, dtype=np.float64)
+    sifir = np.zeros(1)
+
+    for bas in range(0, cekilis_sayisi, parca_boyutu):
+        son = min(bas + parca_boyutu, cekilis_sayisi)
+        n = son - bas
+
+        wacc = ornekle(rng, wacc_dagilimi, n)
+        buyume = ornekle(rng, buyume_dagilimi, n)
+
+        if fcf_dagilimi is None:
+            fcf = baz_fcf
+        elif isinstance(fcf_dagilimi, list):
+            soklar = np.column_stack([ornekle(rng, d, n) for d in fcf_dagilimi])
+            fcf = baz_fcf * (1 + soklar)
+        else:
+            fcf = baz_fcf * (1 + ornekle(rng, fcf_dagilimi, (n, yil_sayisi)))
+
+        # FCF doğrudan faaliyet karı yerine verilir, diğer kalemler sıfırdır
+        sonuc = toplu_dcf(fcf, sifir, sifir, sifir, sifir, wacc, buyume,
+                          indirgeme_degerleri=indirgeme_degerleri, net_borc=net_borc)
+        degerler[bas:son] = np.broadcast_to(sonuc['firma_degeri'], (n,))
+
+    gecerli = degerler[np.isfinite(degerler)]
+    if gecerli.size == 0:
+        raise ValueError("Tüm çekilişlerde WACC terminal büyüme oranından küçük veya eşit")
+
+    sayilar, sinirlar = np.histogram(gecerli, bins=kutu_sayisi)
+    asan = int((gecerli > piyasa_degeri).sum()) if piyasa_degeri is not None else None
+    return {
+        'degerler': degerler,
+        'yuzdelikler': dict(zip(yuzdelikler, np.percentile(gecerli, yuzdelikler).tolist())),
+        'ortalama': float(gecerli.mean()),
+        'histogram': (sayilar, sinirlar),
+        'gecersiz_oran': 1 - gecerli.size / cekilis_sayisi,
+        'piyasa_degerini_asma_olasiligi': asan / cekilis_sayisi if asan is not None else None,
+        'gecerli_cekilislerde_asma_olasiligi': asan / gecerli.size if asan is not None else None,
+    }
@@ -0,0 +1,101 @@
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Any, Callable, Dict, Optional
+
+# Dış kaynak çağrıları (ağ G/Ç) için arka plan thread havuzu; belge ayrıştırma
+# ana thread'de sürerken istekler bu havuzda beklenir
+_havuz = ThreadPoolExecutor(max_workers=4, thread_name_prefix="onceden-getir")
+_calisanlar: Dict[str, Future] = {}
+_kilit = threading.Lock()
+# Görevlerin bitiş anları (time.monotonic); başarısız denemenin tekrarını geciktirmek için
+_bitis_zamanlari: "weakref.WeakKeyDictionary[Future, float]" = weakref.WeakKeyDictionary()
+
+# Başarısız bir oturum görevinin en erken yeniden başlatılacağı süre (sn)
+YENIDEN_DENEME_SURESI = 60.0
+
+
+def _bitisi_kaydet(future: Future) -> None:
+    _bitis_zamanlari[future] = time.monotonic()
+
+
+def onceden_getir(ad: str, fonksiyon: Callable, *args, **kwargs) -> Future:
+    """
+    fonksiyon(*args, **kwargs) çağrısını arka planda başlatır
+
+    Aynı adla başlatılmış ve henüz bitmemiş bir görev varsa yenisi açılmaz,
+    o görevin Future'ı döner; böylece aynı anda açık olan oturumlar / yeniden
+    çalıştırmalar aynı isteği paylaşır.
+
+    Parametreler:
+        ad: Görevin adı (örneğin 'hisse_lotlari')
+        fonksiyon: Arka planda çalıştırılacak fonksiyon
+
+    Dönüş:
+        concurrent.futures.Future
+    """
+    with _kilit:
+        future = _calisanlar.get(ad)
+        if future is not None and not future.done():
+            return future
+        future = _havuz.submit(fonksiyon, *args, **kwargs)
+        future.add_done_callback(_bitisi_kaydet)
+        _calisanlar[ad] = future
+        return future
+
+
+def _basarisiz_mi(future: Future, basarisiz_sonuc: Any) -> bool:
+    if future.cancelled() or future.exception() is not None:
+        return True
+    return future.result() == basarisiz_sonuc
+
+
+def oturum_gorevi(gorevler: Dict[str, Future], ad: str, fonksiyon: Callable, *args,
+                  basarisiz_sonuc: Any = None, yeniden_deneme: float = YENIDEN_DENEME_SURESI,
+                  **kwargs) -> Future:
+    """
+    Bir oturumun (session_state) görev sözlüğündeki ad görevini gerekirse başlatır
+
+    Görev yoksa onceden_getir ile başlatılır. Önceki görev hata verdiyse veya
+    sonucu basarisiz_sonuc ise, bitişinden yeniden_deneme sn geçmeden yenisi
+    başlatılmaz; böylece ulaşılamayan bir kaynak her yeniden çalıştırmada
+    (widget etkileşiminde) tekrar istenmez. Süren veya başarılı görev korunur.
+
+    Parametreler:
+        gorevler: Oturumun görev sözlüğü (ad -> Future)
+        ad: Görevin adı (örneğin 'hisse_lotlari')
+        fonksiyon: Arka planda çalıştırılacak fonksiyon
+        basarisiz_sonuc: Başarısız denemeyi gösteren sonuç (örneğin (None, None))
+        yeniden_deneme: Başarısız denemeden sonra beklenecek süre (sn)
+
+    Dönüş:
+        Oturumun güncel görevi (concurrent.futures.Future)
+    """
+    onceki = gorevler.get(ad)
+    if onceki is not None:
+        if not onceki.done() or not _basarisiz_mi(onceki, basarisiz_sonuc):
+            return onceki
+        # Geri çağırma henüz çalışmadıysa görev az önce bitmiştir
+        bitis = _bitis_zamanlari.setdefault(onceki, time.monotonic())
+        if time.monotonic() - bitis < yeniden_deneme:
+            return onceki
+    gorevler[ad] = onceden_getir(ad, fonksiyon, *args, **kwargs)
+    return gorevler[ad]
+
+
+def sonucu_al(future: Optional[Future], timeout: Optional[float] = None, varsayilan: Any = None) -> Any:
+    """
+    Future'ın sonucunu en fazla timeout sn bekleyerek döndürür
+
+    Future yoksa, süre dolarsa veya görev hata verdiyse varsayilan döner.
+    """
+    if future is None:
+        return varsayilan
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        return varsayilan
+    except Exception as e:
+        print(f"Arka plan görevi başarısız: {str(e)}")
+        return varsayilan
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+from modules.dcf_model import toplu_dcf
+
+# Projeksiyon matrisinin satırları (sıra sabittir)
+PROJEKSIYON_KALEMLERI = ["faaliyet_kari", "amortisman", "odenen_vergi", "delta_nwc", "capex", "indirgeme"]
+
+# Veri düzenleyicide gösterilen sütun başlıkları
+KALEM_ETIKETLERI = {
+    "faaliyet_kari": "Faaliyet Karı (USD)",
+    "amortisman": "Amortisman (USD)",
+    "odenen_vergi": "Ödenen Vergi (USD)",
+    "delta_nwc": "ΔNWC (USD)",
+    "capex": "Capex (USD)",
+    "indirgeme": "İndirgeme Oranı (%)",
+}
+
+# İkinci aşamada büyüme oranıyla uzatılan nakit akımı kalemleri
+AKIM_KALEMLERI = ["faaliyet_kari", "amortisman", "odenen_vergi", "delta_nwc", "capex"]
+
+
+class Projeksiyon:
+    """
+    N yıllık DCF projeksiyon girdileri
+
+    Tüm kalemler (kalem x yıl) boyutunda tek bir float64 matriste tutulur;
+    satırlar PROJEKSIYON_KALEMLERI sırasındadır. İndirgeme satırı kesir olarak
+    saklanır (0.5 = %50).
+
+    Parametreler:
+        degerler: len(PROJEKSIYON_KALEMLERI) x yıl_sayısı matris
+    """
+
+    def __init__(self, degerler):
+        self.degerler = np.array(degerler, dtype=np.float64, ndmin=2)
+        if self.degerler.shape[0] != len(PROJEKSIYON_KALEMLERI):
+            raise ValueError(f"Projeksiyon {len(PROJEKSIYON_KALEMLERI)} satır içermelidir")
+
+    @classmethod
+    def bos(cls, yil_sayisi: int, indirgeme: float = 0.5) -> "Projeksiyon":
+        """Tüm akımları sıfır, indirgeme oranları sabit bir projeksiyon"""
+        degerler = np.zeros((len(PROJEKSIYON_KALEMLERI), yil_sayisi))
+        degerler[PROJEKSIYON_KALEMLERI.index("indirgeme")] = indirgeme
+        return cls(degerler)
+
+    @property
+    def yil_sayisi(self) -> int:
+        return self.degerler.shape[1]
+
+    def kalem(self, ad: str) -> np.ndarray:
+        """Bir kalemin yıllık değerleri (matrisin satır görünümü)"""
+        return self.degerler[PROJEKSIYON_KALEMLERI.index(ad)]
+
+    def iki_asamali(self, toplam_yil: int, terminal_buyume: float, wacc: float,
+                    baslangic_buyume: Optional[float] = None) -> "Projeksiyon":
+        """
+        Açık tahmin yıllarını, büyümesi terminal büyümeye doğru doğrusal olarak
+        azalan (fade) ikinci bir aşamayla toplam_yil'a uzatır
+
+        Parametreler:
+            toplam_yil: Uzatılmış projeksiyonun yıl sayısı
+            terminal_buyume: İkinci aşamanın sonunda ulaşılan büyüme oranı
+            wacc: İkinci aşama yıllarının indirgeme katsayıları için (1 / (1 + wacc) ** t)
+            baslangic_buyume: İkinci aşamanın ilk büyüme oranı; None ise son iki
+                yılın faaliyet karı büyümesi kullanılır
+
+        Dönüş:
+            Yeni Projeksiyon (ilk yil_sayisi yılı bu projeksiyonla aynıdır)
+        """
+        n1 = self.yil_sayisi
+        if toplam_yil <= n1:
+            return Projeksiyon(self.degerler[:, :toplam_yil])
+
+        if baslangic_buyume is None:
+            faaliyet_kari = self.kalem("faaliyet_kari")
+            if n1 >= 2 and faaliyet_kari[-2] != 0:
+                baslangic_buyume = faaliyet_kari[-1] / faaliyet_kari[-2] - 1
+            else:
+                baslangic_buyume = terminal_buyume
+
+        n2 = toplam_yil - n1
+        adimlar = np.arange(1, n2 + 1, dtype=np.float64)
+        buyumeler = baslangic_buyume + (terminal_buyume - baslangic_buyume) * adimlar / n2
+        carpanlar = np.cumprod(1 + buyumeler)
+
+        degerler = np.empty((len(PROJEKSIYON_KALEMLERI), toplam_yil))
+        degerler[:, :n1] = self.degerler
+        for ad in AKIM_KALEMLERI:
+            satir = PROJEKSIYON_KALEMLERI.index(ad)
+            degerler[satir, n1:] = self.degerler[satir, -1] * carpanlar
+        degerler[PROJEKSIYON_KALEMLERI.index("indirgeme"), n1:] = (
+            (1 + wacc) ** -np.arange(n1 + 1, toplam_yil + 1, dtype=np.float64)
+        )
+        return Projeksiyon(degerler)
+
+    def fcf(self) -> np.ndarray:
+        """Yıllık serbest nakit akımları (bes_yillik_fcf ile aynı formül)"""
+        return (self.kalem("faaliyet_kari") + self.kalem("amortisman") - self.kalem("odenen_vergi")
+                - self.kalem("delta_nwc") - self.kalem("capex"))
+
+    def degerle(self, wacc: float, terminal_buyume: float, net_borc: float = 0.0) -> Dict:
+        """Projeksiyonu toplu_dcf ile değerler (anahtarlar toplu_dcf ile aynı)"""
+        return toplu_dcf(
+            self.kalem("faaliyet_kari"), self.kalem("amortisman"), self.kalem("odenen_vergi"),
+            self.kalem("delta_nwc"), self.kalem("capex"), wacc, terminal_buyume,
+            indirgeme_degerleri=self.kalem("indirgeme"), net_borc=net_borc
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Yıllar satır, kalemler sütun olacak şekilde düzenlenebilir tablo (indirgeme % olarak)"""
+        df = pd.DataFrame(
+            self.degerler.T,
+            index=pd.Index([f"{yil}. Yıl" for yil in range(1, self.yil_sayisi + 1)], name="Yıl"),
+            columns=[KALEM_ETIKETLERI[ad] for ad in PROJEKSIYON_KALEMLERI]
+        )
+        df[KALEM_ETIKETLERI["indirgeme"]] *= 100
+        return df
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Projeksiyon":
+        """to_frame biçimindeki (düzenlenmiş) tablodan projeksiyon oluşturur; boş hücreler 0 kabul edilir"""
+        sutunlar = [KALEM_ETIKETLERI[ad] for ad in PROJEKSIYON_KALEMLERI]
+        degerler = df[sutunlar].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=np.float64).T.copy()
+        degerler[PROJEKSIYON_KALEMLERI.index("indirgeme")] /= 100
+        return cls(degerler)
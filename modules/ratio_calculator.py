@@ -1,3 +1,8 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
 def toplam_hisse(pay_lot, ek_pay_lot):
     return (pay_lot if pay_lot is not None else 0) + (ek_pay_lot if ek_pay_lot is not None else 0)
 
@@ -98,3 +103,179 @@ def alacakdevirhizi(hasilat, ticariAlacaklar_son):
 
 def stokdevirhizi(satilanMalinMaliyeti, stoklar_son):
     return 365/(stoklar_son/satilanMalinMaliyeti*365)
+
+
+# Rasyo motorunun kullandığı kalemler: kısa ad -> (tablo, kalem adı)
+RASYO_KALEMLERI = {
+    "donen_varliklar": ("bilanco_varlik", "TOTAL CURRENT ASSETS"),
+    "duran_varliklar": ("bilanco_varlik", "TOTAL NON CURRENT ASSETS"),
+    "toplam_varliklar": ("bilanco_varlik", "TOTAL ASSETS"),
+    "stoklar": ("bilanco_varlik", "Inventories"),
+    "ticari_alacaklar": ("bilanco_varlik", "Trade receivables"),
+    "kisa_vadeli_yukumlulukler": ("bilanco_kaynak", "TOTAL CURRENT LIABILITIES"),
+    "uzun_vadeli_yukumlulukler": ("bilanco_kaynak", "TOTAL NON CURRENT LIABILITIES"),
+    "kisa_vadeli_borclanma": ("bilanco_kaynak", "Short term borrowings"),
+    "uzun_vadeli_borclanma_kisa_vadeli": ("bilanco_kaynak", "Short term portion of long term borrowings"),
+    "ticari_borclar": ("bilanco_kaynak", "Trade payables"),
+    "calisan_yukumlulukleri": ("bilanco_kaynak", "Liabilities for employee benefits"),
+    "diger_borclar": ("bilanco_kaynak", "Other payables"),
+    "ertelenmis_gelirler": ("bilanco_kaynak", "Deferred income to third parties"),
+    "kisa_vadeli_karsiliklar": ("bilanco_kaynak", "Short term provisions"),
+    "oz_kaynak": ("bilanco_kaynak", "TOTAL EQUITY"),
+    "net_kar": ("gelir", "Profit / (loss) for the period"),
+    "hasilat": ("gelir", "Revenue"),
+    "satilan_malin_maliyeti": ("gelir", "Cost of sales (-)"),
+}
+
+# Rasyo sütun başlıkları (RatioEngine çıktısındaki sırayla)
+RASYO_ETIKETLERI = {
+    "cari_oran": "Cari Oran",
+    "asit_test_orani": "Asit-Test Oranı",
+    "borc_toplam_varlik": "Borç / Toplam Varlık (%)",
+    "finansal_kaldirac": "Finansal Kaldıraç Oranı",
+    "net_kar_marji": "Net Kar Marjı (%)",
+    "aktif_karlilik": "Aktif Karlılık (%)",
+    "oz_sermaye_karliligi": "Öz Sermaye Karlılığı (%)",
+    "alacak_devir_hizi": "Alacak Devir Hızı",
+    "stok_devir_hizi": "Stok Devir Hızı",
+}
+
+AYLAR = ["January", "February", "March", "April", "May", "June", "July",
+         "August", "September", "October", "November", "December"]
+
+
+def _bilanco_donemi(period) -> Optional[Tuple[int, int]]:
+    """'31.12.2024' biçimindeki bilanço dönemini (yıl, ay) olarak döndürür"""
+    eslesme = re.fullmatch(r"\s*(\d{1,2})\.(\d{1,2})\.(\d{4})\s*", str(period))
+    if not eslesme:
+        return None
+    return int(eslesme.group(3)), int(eslesme.group(2))
+
+
+def _gelir_donemi(period) -> Optional[Tuple[int, int]]:
+    """'1 January - 31 December 2024' biçimindeki gelir tablosu döneminin bitişini (yıl, ay) olarak döndürür"""
+    metin = str(period)
+    yillar = re.findall(r"\b(\d{4})\b", metin)
+    aylar = [(metin.rfind(ay), i + 1) for i, ay in enumerate(AYLAR) if ay in metin]
+    if not yillar or not aylar:
+        return None
+    return int(yillar[-1]), max(aylar)[1]
+
+
+def _bol(pay, payda):
+    """Sıfıra / NaN'a bölmede ZeroDivisionError yerine NaN döndüren bölme"""
+    pay = np.asarray(pay, dtype=np.float64)
+    payda = np.asarray(payda, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sonuc = pay / payda
+    return np.where(payda == 0, np.nan, sonuc)
+
+
+def rasyolari_hesapla(kalemler: pd.DataFrame) -> pd.DataFrame:
+    """
+    Kalem tablosundan tüm rasyoları vektörel olarak hesaplar (yukarıdaki tek
+    dönemlik fonksiyonların dizi karşılığı)
+
+    Parametreler:
+        kalemler: Sütunları RASYO_KALEMLERI anahtarları olan tablo; her satır
+            bir (şirket,) dönemdir. Eksik değerler NaN olmalıdır
+
+    Dönüş:
+        Aynı indeksli, sütunları RASYO_ETIKETLERI başlıkları olan tablo
+        (paydası sıfır veya eksik olan hücreler NaN)
+    """
+    k = {ad: kalemler[ad].to_numpy(dtype=np.float64) for ad in RASYO_KALEMLERI}
+    toplam_yukumluluk = k["kisa_vadeli_yukumlulukler"] + k["uzun_vadeli_yukumlulukler"]
+    aktif = k["donen_varliklar"] + k["duran_varliklar"]
+    asit_test_paydasi = (k["kisa_vadeli_borclanma"] + k["uzun_vadeli_borclanma_kisa_vadeli"] + k["ticari_borclar"]
+                         + k["calisan_yukumlulukleri"] + k["diger_borclar"] + k["ertelenmis_gelirler"]
+                         + k["kisa_vadeli_karsiliklar"])
+
+    rasyolar = {
+        "cari_oran": _bol(k["donen_varliklar"], k["kisa_vadeli_yukumlulukler"]),
+        "asit_test_orani": _bol(k["donen_varliklar"] - k["stoklar"], asit_test_paydasi),
+        "borc_toplam_varlik": _bol(toplam_yukumluluk, aktif) * 100,
+        "finansal_kaldirac": _bol(toplam_yukumluluk, k["toplam_varliklar"]),
+        "net_kar_marji": _bol(k["net_kar"], k["hasilat"]) * 100,
+        "aktif_karlilik": _bol(k["net_kar"], aktif) * 100,
+        "oz_sermaye_karliligi": _bol(k["net_kar"], k["oz_kaynak"]) * 100,
+        "alacak_devir_hizi": _bol(k["hasilat"], k["ticari_alacaklar"]),
+        # Satışların maliyeti tabloda negatif olduğundan işaret çevrilir (sayfadaki gibi)
+        "stok_devir_hizi": -_bol(k["satilan_malin_maliyeti"], k["stoklar"]),
+    }
+    return pd.DataFrame({RASYO_ETIKETLERI[ad]: deger for ad, deger in rasyolar.items()}, index=kalemler.index)
+
+
+class RatioEngine:
+    """
+    Bir şirketin bilanço ve gelir tablosundaki tüm dönemler için rasyoları
+    tek seferde hesaplar
+
+    Bilanço dönemleri (31.12.2024) gelir tablosu dönemleriyle (1 January -
+    31 December 2024) bitiş yılı ve ayına göre eşleştirilir; aynı ay yoksa
+    aynı yılın son gelir dönemi kullanılır. Eşleşmeyen, tabloda bulunmayan
+    veya hücresi boş / sayıya çevrilemeyen kalemler (fill_value ile
+    doldurulmuş olsalar bile) NaN olur, ilgili rasyolar da NaN döner.
+
+    Parametreler:
+        varliklar: Bilanço varlık tablosu (FinancialStatement)
+        kaynaklar: Bilanço kaynak tablosu (FinancialStatement, yoksa None)
+        gelir: Gelir tablosu (FinancialStatement, yoksa None)
+    """
+
+    def __init__(self, varliklar, kaynaklar=None, gelir=None):
+        self.tablolar = {"bilanco_varlik": varliklar, "bilanco_kaynak": kaynaklar, "gelir": gelir}
+
+    def donemler(self) -> List[Tuple[str, Optional[str]]]:
+        """(bilanço dönemi, eşleşen gelir tablosu dönemi) çiftleri, eskiden yeniye"""
+        bilanco = [(p, _bilanco_donemi(p)) for p in self.tablolar["bilanco_varlik"].periods]
+        bilanco = sorted((tarih, p) for p, tarih in bilanco if tarih is not None)
+
+        gelir_tablosu = self.tablolar["gelir"]
+        gelir = []
+        if gelir_tablosu is not None:
+            gelir = [(p, _gelir_donemi(p)) for p in gelir_tablosu.periods]
+            gelir = sorted((tarih, p) for p, tarih in gelir if tarih is not None)
+
+        ciftler = []
+        for tarih, donem in bilanco:
+            ayni_ay = [p for t, p in gelir if t == tarih]
+            ayni_yil = [p for t, p in gelir if t[0] == tarih[0]]
+            eslesen = (ayni_ay or ayni_yil or [None])[-1]
+            ciftler.append((donem, eslesen))
+        return ciftler
+
+    def kalemler(self) -> pd.DataFrame:
+        """Dönem x kalem tablosu (RASYO_KALEMLERI sütunlarıyla, eksikler NaN)"""
+        ciftler = self.donemler()
+        veriler = {}
+        for ad, (tablo_adi, etiket) in RASYO_KALEMLERI.items():
+            tablo = self.tablolar[tablo_adi]
+            sutun = np.full(len(ciftler), np.nan)
+            if tablo is not None and etiket in tablo:
+                for i, (bilanco_donemi, gelir_donemi) in enumerate(ciftler):
+                    donem = gelir_donemi if tablo_adi == "gelir" else bilanco_donemi
+                    if donem is not None and tablo.has_period(donem) and not tablo.is_blank(etiket, donem):
+                        sutun[i] = tablo.get(etiket, donem)
+            veriler[ad] = sutun
+        return pd.DataFrame(veriler, index=pd.Index([p for p, _ in ciftler], name="Dönem"))
+
+    def hesapla(self) -> pd.DataFrame:
+        """Tüm dönemler için rasyo tablosu (satırlar dönem, sütunlar rasyo)"""
+        return rasyolari_hesapla(self.kalemler())
+
+    @staticmethod
+    def coklu(motorlar: Dict[str, "RatioEngine"]) -> pd.DataFrame:
+        """
+        Birden fazla şirketin rasyolarını tek bir vektörel hesaplamayla döndürür
+
+        Parametreler:
+            motorlar: Şirket adı -> RatioEngine
+
+        Dönüş:
+            (Şirket, Dönem) çok seviyeli indeksli rasyo tablosu
+        """
+        if not motorlar:
+            return pd.DataFrame(columns=list(RASYO_ETIKETLERI.values()))
+        kalemler = pd.concat({ad: motor.kalemler() for ad, motor in motorlar.items()}, names=["Şirket", "Dönem"])
+        return rasyolari_hesapla(kalemler)
@@ -0,0 +1,206 @@
+import contextlib
+import datetime
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+import weakref
+from typing import Dict, List, Optional
+
+# Ortam değişkeniyle tüm oturumlar için izleme açılır / JSON satırı kayıt dosyası verilir
+IZLEME_ORTAM_DEGISKENI = "FINANS_IZLEME"
+IZLEME_DOSYASI_ORTAM_DEGISKENI = "FINANS_IZLEME_DOSYASI"
+
+# İzleme kapalıyken olcum() her çağrıda aynı boş bağlamı döndürür
+_BOS_OLCUM = contextlib.nullcontext()
+
+# Streamlit her oturumun betiğini ayrı bir thread'de çalıştırır; etkin izleyici thread başınadır
+_yerel = threading.local()
+
+_dosya_kilidi = threading.Lock()
+_bellek_kilidi = threading.Lock()
+_bellek_kullanicilari = 0
+_tracemalloc_bizde = False
+
+
+def ortamdan_acik() -> bool:
+    """FINANS_IZLEME ortam değişkeni 1 / true / evet ise True döndürür"""
+    return os.environ.get(IZLEME_ORTAM_DEGISKENI, "").strip().lower() in ("1", "true", "evet", "on")
+
+
+def _bellek_izlemeyi_baslat() -> None:
+    global _bellek_kullanicilari, _tracemalloc_bizde
+    with _bellek_kilidi:
+        _bellek_kullanicilari += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracemalloc_bizde = True
+
+
+def _bellek_izlemeyi_birak() -> None:
+    global _bellek_kullanicilari, _tracemalloc_bizde
+    with _bellek_kilidi:
+        _bellek_kullanicilari -= 1
+        # Başka biri (ör. python -X tracemalloc) başlattıysa kapatılmaz
+        if _bellek_kullanicilari == 0 and _tracemalloc_bizde:
+            tracemalloc.stop()
+            _tracemalloc_bizde = False
+
+
+class _Olcum:
+    """Bir aşamanın duvar saati, thread CPU süresi ve bellek tepesini ölçen bağlam yöneticisi"""
+
+    __slots__ = ("izleyici", "ad", "etiketler", "ust", "_duvar", "_cpu", "_bellek", "_cocuk_tepe")
+
+    def __init__(self, izleyici: "Izleyici", ad: str, etiketler: Dict):
+        self.izleyici = izleyici
+        self.ad = ad
+        self.etiketler = etiketler
+        self.ust = None
+        self._cocuk_tepe = 0
+
+    def __enter__(self):
+        yigin = self.izleyici._yigin
+        self.ust = yigin[-1] if yigin else None
+        if self.izleyici.bellek:
+            anlik, tepe = tracemalloc.get_traced_memory()
+            # Tepe sayacı süreç genelinde tektir; sıfırlamadan önceki tepe üst aşamaya aktarılır
+            if self.ust is not None:
+                self.ust._cocuk_tepe = max(self.ust._cocuk_tepe, tepe)
+            tracemalloc.reset_peak()
+            self._bellek = anlik
+        yigin.append(self)
+        self._cpu = time.thread_time()
+        self._duvar = time.perf_counter()
+        return self
+
+    def __exit__(self, tur, deger, iz):
+        duvar = time.perf_counter() - self._duvar
+        cpu = time.thread_time() - self._cpu
+        self.izleyici._yigin.pop()
+        kayit = {
+            "ad": self.ad,
+            "ust": self.ust.ad if self.ust is not None else None,
+            "derinlik": len(self.izleyici._yigin),
+            "baslangic_ms": round((self._duvar - self.izleyici._baslangic) * 1000, 3),
+            "duvar_ms": round(duvar * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "bellek_tepe_kib": None,
+            "hata": tur.__name__ if tur is not None else None,
+        }
+        if self.izleyici.bellek:
+            tepe = max(tracemalloc.get_traced_memory()[1], self._cocuk_tepe)
+            if self.ust is not None:
+                self.ust._cocuk_tepe = max(self.ust._cocuk_tepe, tepe)
+            kayit["bellek_tepe_kib"] = round(max(tepe - self._bellek, 0) / 1024, 1)
+        kayit.update(self.etiketler)
+        self.izleyici.kayitlar.append(kayit)
+        return False
+
+
+class Izleyici:
+    """
+    Bir betik çalıştırmasının aşama ölçümlerini toplar
+
+    Kapalı izleyicinin olcum() çağrısı yalnızca paylaşılan boş bir bağlam
+    döndürür. Açıkken her aşama için duvar saati, thread CPU süresi ve
+    (bellek=True ise) tracemalloc ile aşama içindeki bellek tepesi kaydedilir.
+    tracemalloc süreç geneli çalışır ve açık kaldığı sürece tüm ayırmaları
+    yavaşlatır; son açık izleyici bitince durdurulur. Betik bitir()'e
+    ulaşmadan kesilirse (st.rerun, st.stop, yakalanmamış hata) izleyici,
+    aynı thread'de baslat() yeniden çağrıldığında veya çöp toplandığında
+    bırakılır; tracemalloc açık kalmaz. Aynı anda çalışan
+    oturumların ayırmaları birbirinin bellek tepesine karışabilir. Süreç
+    havuzunda çalışan işlerin CPU süresi cpu_ms'e dahil değildir.
+
+    Parametreler:
+        acik: Ölçüm yapılıp yapılmayacağı
+        dosya: Kayıtların JSON satırı olarak ekleneceği dosya (None ise yazılmaz)
+        bellek: tracemalloc ile bellek tepesinin ölçülüp ölçülmeyeceği
+    """
+
+    def __init__(self, acik: bool = False, dosya: Optional[str] = None, bellek: bool = True):
+        self.acik = acik
+        self.dosya = dosya
+        self.bellek = acik and bellek
+        self.kayitlar: List[Dict] = []
+        self.calistirma = uuid.uuid4().hex[:12]
+        self._yigin: List[_Olcum] = []
+        self._bitti = False
+        self.toplam_ms = None
+        self._baslangic = time.perf_counter()
+        self._bellek_birak = None
+        if self.bellek:
+            _bellek_izlemeyi_baslat()
+            # Tek seferlik: bitir() veya nesnenin toplanması, hangisi önce olursa
+            self._bellek_birak = weakref.finalize(self, _bellek_izlemeyi_birak)
+
+    def olcum(self, ad: str, **etiketler):
+        """
+        Aşamayı ölçen bağlam yöneticisi döndürür
+
+        Parametreler:
+            ad: Aşamanın adı (ör. 'dosya_okuma', 'grafik.fcf')
+            etiketler: Kayda eklenecek ek alanlar (ör. satir_sayisi=40)
+        """
+        if not self.acik:
+            return _BOS_OLCUM
+        return _Olcum(self, ad, etiketler)
+
+    def bitir(self) -> List[Dict]:
+        """
+        Ölçümü sonlandırır, kayıtları dosyaya ekler ve döndürür
+
+        Dönüş:
+            Tamamlanma sırasına göre aşama kayıtları (iç aşamalar dıştakilerden önce gelir)
+        """
+        if self._bitti or not self.acik:
+            return self.kayitlar
+        self._bitti = True
+        self.toplam_ms = round((time.perf_counter() - self._baslangic) * 1000, 3)
+        if self._bellek_birak is not None:
+            self._bellek_birak()
+        if self.dosya and self.kayitlar:
+            zaman = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds")
+            satirlar = "".join(
+                json.dumps({"zaman": zaman, "calistirma": self.calistirma, **kayit}, ensure_ascii=False, default=str) + "\n"
+                for kayit in self.kayitlar
+            )
+            try:
+                with _dosya_kilidi, open(self.dosya, "a", encoding="utf-8") as f:
+                    f.write(satirlar)
+            except OSError as e:
+                print(f"İzleme kaydı yazılamadı: {str(e)}")
+        return self.kayitlar
+
+
+def baslat(acik: bool = False, dosya: Optional[str] = None, bellek: bool = True) -> Izleyici:
+    """
+    Bu thread için yeni bir izleyici oluşturur ve olcum() çağrılarını ona yönlendirir
+
+    Thread'in önceki izleyicisi bitir()'e ulaşmadan kaldıysa önce o bitirilir.
+    """
+    onceki = getattr(_yerel, "izleyici", None)
+    if onceki is not None:
+        onceki.bitir()
+    izleyici = Izleyici(acik, dosya, bellek)
+    _yerel.izleyici = izleyici
+    return izleyici
+
+
+def olcum(ad: str, **etiketler):
+    """
+    Etkin izleyicide aşamayı ölçen bağlam yöneticisi döndürür
+
+    Etkin izleyici yoksa veya kapalıysa hiçbir şey ölçülmez.
+
+    Kullanım:
+        with olcum("dosya_okuma", dosya=ad):
+            ...
+    """
+    izleyici = getattr(_yerel, "izleyici", None)
+    if izleyici is None or not izleyici.acik:
+        return _BOS_OLCUM
+    return _Olcum(izleyici, ad, etiketler)
@@ -1,44 +1,235 @@
+import os
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import re
-from typing import Tuple, Optional
-
-def fetch_hisse_lotlari(url: str = "https://borsa.doviz.com/halka-arz/dof-robotik-sanayi-as/194") -> Tuple[Optional[int], Optional[int]]:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        "Accept-Language": "tr-TR,tr;q=0.9"
-    }
-    
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Tuple, Optional
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+# Lot bilgisinin çekildiği sayfa; LOT_SAYFASI_URL ile başka (ör. yerel test) sunucuya yönlendirilir
+VARSAYILAN_URL = os.environ.get("LOT_SAYFASI_URL", "https://borsa.doviz.com/halka-arz/dof-robotik-sanayi-as/194")
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Language": "tr-TR,tr;q=0.9"
+}
+
+try:
+    from lxml import etree
+except ImportError:  # lxml yoksa SoupStrainer'lı BeautifulSoup kullanılır
+    etree = None
+
+# Sayfadaki başlık ("Pay") ve değer ("12.500.000 Lot") div'lerinin sınıfları
+ETIKET_SINIFI = "text-xs text-blue-gray-2"
+DEGER_SINIFI = "text-md font-semibold text-white mt-4"
+
+# Aynı sunucuya aynı anda açılan en fazla istek (ve havuzdaki bağlantı) sayısı
+HOST_BASINA_ISTEK = 4
+
+_oturum: Optional[requests.Session] = None
+_oturum_havuz_boyutu = 0
+_oturum_kilidi = threading.Lock()
+
+
+class LotSonucu(NamedTuple):
+    """Bir URL için çekilen lot bilgisi; hata varsa lotlar None, hata mesajı doludur"""
+    pay_lot: Optional[int]
+    ek_pay_lot: Optional[int]
+    hata: Optional[str] = None
+
+
+def ortak_oturum(havuz_boyutu: int = HOST_BASINA_ISTEK) -> requests.Session:
+    """
+    Süreç genelinde paylaşılan, keep-alive bağlantı havuzlu requests.Session
+
+    Her çağrıda yeni bağlantı (TCP + TLS el sıkışması) açmak yerine aynı
+    sunucuya yapılan istekler havuzdaki bağlantıları yeniden kullanır.
+
+    Parametreler:
+        havuz_boyutu: Sunucu başına havuzda tutulacak en az bağlantı sayısı;
+            mevcut havuz daha küçükse daha büyük bir adaptör takılır (havuz
+            yalnızca büyür). Havuzdan fazla eşzamanlı istek olursa fazla
+            bağlantılar iade edilirken atılır ve yeniden kullanılamaz.
+    """
+    global _oturum, _oturum_havuz_boyutu
+    with _oturum_kilidi:
+        if _oturum is None:
+            _oturum = requests.Session()
+            _oturum.headers.update(HEADERS)
+        if havuz_boyutu > _oturum_havuz_boyutu:
+            adaptor = HTTPAdapter(pool_connections=16, pool_maxsize=havuz_boyutu)
+            _oturum.mount("https://", adaptor)
+            _oturum.mount("http://", adaptor)
+            _oturum_havuz_boyutu = havuz_boyutu
+        return _oturum
+
+
+def _noktali_tam_sayi(metin: str) -> int:
+    """'12.500.000' → 12500000"""
+    return int(metin.replace(".", ""))
+
+
+class AlanKurali(NamedTuple):
+    """
+    Sayfadan bir alanın nasıl çıkarılacağı: etiket sınıflı div'in metni
+    etiket ise, ondan sonraki ilk değer sınıflı div'in metninde desen aranır
+    ve ilk grubu donustur ile çevrilir
+    """
+    etiket: str
+    desen: str = r'(\d{1,3}(?:\.\d{3})*)'
+    donustur: Callable[[str], Any] = _noktali_tam_sayi
+    etiket_sinifi: str = ETIKET_SINIFI
+    deger_sinifi: str = DEGER_SINIFI
+
+
+# Halka arz sayfasından çıkarılan alanlar; yeni alan (fiyat, tarih, arz
+# büyüklüğü vb.) eklemek için buraya bir kural eklemek yeterlidir
+LOT_KURALLARI: Dict[str, AlanKurali] = {
+    "pay_lot": AlanKurali("Pay"),
+    "ek_pay_lot": AlanKurali("Ek Pay"),
+}
+
+
+def _deger_ayikla(kural: AlanKurali, metin: Optional[str]) -> Any:
+    if metin is None:
+        return None
+    eslesme = re.search(kural.desen, metin)
+    return kural.donustur(eslesme.group(1)) if eslesme else None
+
+
+def _alanlar_lxml(html, kurallar: Dict[str, AlanKurali]) -> Dict[str, Any]:
+    """
+    lxml ile ayrıştırır; yalnızca kurallardaki sınıflara sahip div'ler XPath
+    ile seçilir, sayfanın geri kalanı Python nesnesine çevrilmez
+    """
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    kok = etree.fromstring(html, _LXML_PARSER)
+    sonuc = dict.fromkeys(kurallar)
+    if kok is None:
+        return sonuc
+
+    for sinif in {kural.etiket_sinifi for kural in kurallar.values()}:
+        bekleyenler = {kural.etiket: ad for ad, kural in kurallar.items()
+                       if kural.etiket_sinifi == sinif and sonuc[ad] is None}
+        for etiket_div in _SINIFLI_DIVLER(kok, sinif=sinif):
+            ad = bekleyenler.pop("".join(etiket_div.itertext()), None)
+            if ad is None:
+                continue
+            kural = kurallar[ad]
+            deger_divleri = _SONRAKI_SINIFLI_DIV(etiket_div, sinif=kural.deger_sinifi)
+            if deger_divleri:
+                metin = "".join(parca.strip() for parca in deger_divleri[0].itertext())
+                sonuc[ad] = _deger_ayikla(kural, metin)
+            if not bekleyenler:
+                break
+    return sonuc
+
+
+def _alanlar_soup(html, kurallar: Dict[str, AlanKurali]) -> Dict[str, Any]:
+    """lxml yoksa: SoupStrainer ile yalnızca etiket / değer div'lerinden oluşan küçük bir ağaç kurar"""
+    siniflar = sorted({s for kural in kurallar.values() for s in (kural.etiket_sinifi, kural.deger_sinifi)})
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("div", class_=siniflar))
+    sonuc = dict.fromkeys(kurallar)
+    for ad, kural in kurallar.items():
+        baslik_div = soup.find("div", class_=kural.etiket_sinifi, string=kural.etiket)
+        if baslik_div:
+            deger_div = baslik_div.find_next("div", class_=kural.deger_sinifi)
+            if deger_div:
+                sonuc[ad] = _deger_ayikla(kural, deger_div.get_text(strip=True))
+    return sonuc
+
+
+if etree is not None:
+    _LXML_PARSER = etree.HTMLParser(remove_comments=True, remove_pis=True, encoding="utf-8")
+    _SINIFLI_DIVLER = etree.XPath("//div[@class = $sinif]")
+    _SONRAKI_SINIFLI_DIV = etree.XPath("following::div[@class = $sinif][1]")
+
+
+def sayfa_alanlari(html, kurallar: Dict[str, AlanKurali] = LOT_KURALLARI) -> Dict[str, Any]:
+    """
+    Sayfa HTML'inden kural tablosundaki alanları çıkarır
+
+    Parametreler:
+        html: Sayfa içeriği (str veya bytes)
+        kurallar: Alan adı -> AlanKurali
+
+    Dönüş:
+        Alan adı -> değer sözlüğü (bulunamayan alanlar None)
+    """
+    if etree is not None:
+        return _alanlar_lxml(html, kurallar)
+    return _alanlar_soup(html, kurallar)
+
+
+def lotlari_ayristir(html) -> Tuple[Optional[int], Optional[int]]:
+    """Halka arz sayfasının HTML'inden (pay lot, ek pay lot) çıkarır"""
+    alanlar = sayfa_alanlari(html, LOT_KURALLARI)
+    return alanlar["pay_lot"], alanlar["ek_pay_lot"]
+
+
+def _lotlari_getir(url: str, session: requests.Session, timeout: float) -> Tuple[Optional[int], Optional[int]]:
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return lotlari_ayristir(response.text)
+
+
+def fetch_hisse_lotlari(url: str = VARSAYILAN_URL,
+                        session: Optional[requests.Session] = None) -> Tuple[Optional[int], Optional[int]]:
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "html.parser")
-        
-        # Pay Lot'u bul
-        pay_lot = None
-        pay_div = soup.find("div", class_="text-xs text-blue-gray-2", string="Pay")
-        if pay_div:
-            pay_value_div = pay_div.find_next("div", class_="text-md font-semibold text-white mt-4")
-            if pay_value_div:
-                pay_text = pay_value_div.get_text(strip=True)
-                pay_match = re.search(r'(\d{1,3}(?:\.\d{3})*)', pay_text)
-                if pay_match:
-                    pay_lot = int(pay_match.group(1).replace(".", ""))
-
-        # Ek Pay Lot'u bul
-        ek_pay_lot = None
-        ek_pay_div = soup.find("div", class_="text-xs text-blue-gray-2", string="Ek Pay")
-        if ek_pay_div:
-            ek_pay_value_div = ek_pay_div.find_next("div", class_="text-md font-semibold text-white mt-4")
-            if ek_pay_value_div:
-                ek_pay_text = ek_pay_value_div.get_text(strip=True)
-                ek_pay_match = re.search(r'(\d{1,3}(?:\.\d{3})*)', ek_pay_text)
-                if ek_pay_match:
-                    ek_pay_lot = int(ek_pay_match.group(1).replace(".", ""))
-
-        return pay_lot, ek_pay_lot
+        return _lotlari_getir(url, session or ortak_oturum(), timeout=10)
 
     except Exception as e:
         print(f"Hata oluştu: {str(e)}")
-        return None, None
\ No newline at end of file
+        return None, None
+
+
+def fetch_hisse_lotlari_toplu(
+    urls: Iterable[str],
+    max_workers: int = 16,
+    host_basina: int = HOST_BASINA_ISTEK,
+    timeout: float = 10,
+    session: Optional[requests.Session] = None,
+) -> Dict[str, LotSonucu]:
+    """
+    Birden fazla halka arz / şirket sayfasının lot bilgisini eşzamanlı çeker
+
+    İstekler sınırlı bir thread havuzunda, paylaşılan keep-alive oturumu
+    üzerinden yapılır; aynı sunucuya aynı anda en fazla host_basina istek
+    gider. Bir URL'deki hata diğerlerini etkilemez.
+
+    Parametreler:
+        urls: Çekilecek sayfa adresleri (tekrarlar bir kez çekilir)
+        max_workers: Toplam eşzamanlı istek sayısı
+        host_basina: Sunucu başına eşzamanlı istek sınırı (ortak oturumun
+            bağlantı havuzu en az bu boyuta getirilir)
+        timeout: İstek başına zaman aşımı (sn)
+        session: Kullanılacak oturum (None ise ortak_oturum()); verilen
+            oturumun havuzu host_basina'dan küçükse bağlantılar yeniden kullanılamaz
+
+    Dönüş:
+        URL -> LotSonucu(pay_lot, ek_pay_lot, hata) sözlüğü (girdi sırasıyla)
+    """
+    urls = list(dict.fromkeys(urls))
+    session = session or ortak_oturum(host_basina)
+
+    semaforlar: Dict[str, threading.BoundedSemaphore] = {}
+    semafor_kilidi = threading.Lock()
+
+    def getir(url: str) -> LotSonucu:
+        host = urlsplit(url).netloc
+        with semafor_kilidi:
+            semafor = semaforlar.setdefault(host, threading.BoundedSemaphore(host_basina))
+        try:
+            with semafor:
+                pay_lot, ek_pay_lot = _lotlari_getir(url, session, timeout)
+            return LotSonucu(pay_lot, ek_pay_lot)
+        except Exception as e:
+            return LotSonucu(None, None, f"{type(e).__name__}: {str(e)}")
+
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as havuz:
+        return dict(zip(urls, havuz.map(getir, urls)))
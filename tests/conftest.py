@@ -0,0 +1,83 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Testler depo kökünden çalıştırılmasa da modules paketi bulunur
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+VERI_DIZINI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "veri")
+
+
+def veri_dosyasi(ad: str) -> bytes:
+    with open(os.path.join(VERI_DIZINI, ad), "rb") as f:
+        return f.read()
+
+
+class YerelSunucu:
+    """
+    Testler için yerel keep-alive HTTP sunucusu
+
+    sayfalar: yol -> {"govde": bytes, "durum": 200, "etag": ..., "gecikme": sn};
+    ETag'i eşleşen koşullu isteklere 304 döner. Gelen istekler istekler
+    listesinde (yol, başlıklar, yanıt durumu) olarak tutulur.
+    """
+
+    def __init__(self):
+        self.sayfalar = {}
+        self.istekler = []
+        self.baglantilar = set()
+        self._kilit = threading.Lock()
+        sunucu = self
+
+        class Isleyici(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with sunucu._kilit:
+                    sunucu.baglantilar.add(self.client_address)
+                sayfa = sunucu.sayfalar.get(self.path)
+                if sayfa is None:
+                    durum, govde, basliklar = 404, b"yok", {}
+                else:
+                    time.sleep(sayfa.get("gecikme", 0))
+                    durum, govde, basliklar = sayfa.get("durum", 200), sayfa["govde"], {}
+                    if sayfa.get("etag"):
+                        basliklar["ETag"] = sayfa["etag"]
+                        if self.headers.get("If-None-Match") == sayfa["etag"]:
+                            durum, govde = 304, b""
+                with sunucu._kilit:
+                    sunucu.istekler.append((self.path, dict(self.headers), durum))
+                self.send_response(durum)
+                for ad, deger in basliklar.items():
+                    self.send_header(ad, deger)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(govde)))
+                self.end_headers()
+                self.wfile.write(govde)
+
+            def log_message(self, *args):
+                pass
+
+        self._sunucu = ThreadingHTTPServer(("127.0.0.1", 0), Isleyici)
+        self._sunucu.daemon_threads = True
+        self.adres = f"http://127.0.0.1:{self._sunucu.server_address[1]}"
+        self._thread = threading.Thread(target=self._sunucu.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def url(self, yol: str) -> str:
+        return self.adres + yol
+
+    def kapat(self):
+        self._sunucu.shutdown()
+        self._sunucu.server_close()
+
+
+@pytest.fixture
+def yerel_sunucu():
+    sunucu = YerelSunucu()
+    yield sunucu
+    sunucu.kapat()
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pandas as pd
+
+from modules import batch_analysis
+
+
+def test_parquet_motoru_yoksa_csv_yazilir(tmp_path, monkeypatch, capsys):
+    def motor_yok(self, *args, **kwargs):
+        raise ImportError("Unable to find a usable engine; tried using: 'pyarrow', 'fastparquet'.")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", motor_yok)
+    df = pd.DataFrame({"dosya": ["a.docx"], "firma_degeri": [1.5]})
+
+    yazilan = batch_analysis._tablo_yaz(df, str(tmp_path / "sonuclar.parquet"))
+
+    assert yazilan == str(tmp_path / "sonuclar.csv")
+    pd.testing.assert_frame_equal(pd.read_csv(yazilan), df)
+    assert "pyarrow" in capsys.readouterr().err
+    assert not (tmp_path / "sonuclar.parquet").exists()
+
+
+def test_csv_uzantisi_dogrudan_yazilir(tmp_path):
+    df = pd.DataFrame({"dosya": ["a.docx"]})
+    yol = str(tmp_path / "sonuclar.csv")
+    assert batch_analysis._tablo_yaz(df, yol) == yol
+    pd.testing.assert_frame_equal(pd.read_csv(yol), df)
+
+
+def test_sure_donem_satirlari_arasinda_birikmez(tmp_path, monkeypatch):
+    from benchmarks.sentetik import tablolari_uret, xlsx_baytlari
+
+    yol = tmp_path / "firma.xlsx"
+    yol.write_bytes(xlsx_baytlari(tablolari_uret(donem=3)))
+    ayarlar = {"wacc": 0.13, "terminal_buyume": 0.03, "fcf_buyume": 0.05, "yil_sayisi": 5, "amortisman": 0}
+
+    # Her perf_counter çağrısı saati 1 sn ilerletir
+    saat = iter(range(1000))
+    monkeypatch.setattr(batch_analysis, "time", SimpleNamespace(perf_counter=lambda: next(saat)))
+    satirlar, hata = batch_analysis.dosyayi_analiz_et(str(yol), ayarlar)
+
+    assert hata is None and len(satirlar) == 3
+    assert [satir["sure_sn"] for satir in satirlar] == [1, 1, 1]
@@ -0,0 +1,47 @@
+from modules.cache import LRUCache
+
+
+def test_giris_sayisi_asilinca_en_eski_cikarilir():
+    onbellek = LRUCache(max_entries=2, max_bytes=1000)
+    onbellek.put("a", 1)
+    onbellek.put("b", 2)
+    assert onbellek.get("a") == 1  # a en son kullanılan olur
+    onbellek.put("c", 3)
+    assert onbellek.get("b") is None
+    assert onbellek.get("a") == 1 and onbellek.get("c") == 3
+    assert onbellek.stats()["evictions"] == 1
+
+
+def test_boyut_asilinca_yer_acilana_kadar_cikarilir():
+    onbellek = LRUCache(max_entries=10, max_bytes=100)
+    onbellek.put("a", "A", size=40)
+    onbellek.put("b", "B", size=40)
+    onbellek.put("c", "C", size=50)
+    assert onbellek.get("a") is None
+    assert onbellek.get("b") == "B" and onbellek.get("c") == "C"
+    assert onbellek.stats()["bytes"] == 90
+
+    onbellek.put("d", "D", size=100)
+    assert onbellek.stats()["entries"] == 1 and onbellek.stats()["bytes"] == 100
+    assert onbellek.stats()["evictions"] == 3
+
+
+def test_sinirdan_buyuk_giris_saklanmaz_ve_eskisini_siler():
+    onbellek = LRUCache(max_entries=10, max_bytes=100)
+    onbellek.put("a", "eski", size=10)
+    onbellek.put("a", "yeni", size=101)
+    assert onbellek.get("a") is None
+    assert onbellek.stats()["bytes"] == 0
+
+
+def test_ayni_anahtar_bir_kez_hesaplanir():
+    onbellek = LRUCache()
+    cagrilar = []
+
+    def yukle():
+        cagrilar.append(1)
+        return [1, 2, 3]
+
+    assert onbellek.get_or_compute("k", yukle, size_of=len) == [1, 2, 3]
+    assert onbellek.get_or_compute("k", yukle, size_of=len) == [1, 2, 3]
+    assert len(cagrilar) == 1 and onbellek.stats()["bytes"] == 3
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from modules import charts
+from modules.cache import LRUCache
+from modules.charts import GRAFIK_ANAHTARLARI, RASTER_GRAFIKLER, grafikleri_ciz, rapor_goruntuleri
+
+ADLAR = ["carpanlar", "likidite", "fcf"]
+
+
+@pytest.fixture
+def veri():
+    veri = dict(GRAFIK_ANAHTARLARI)
+    veri.update(fk=8.5, fd_divide_favok=6.1, pd_divide_dd=1.2, cariOran=1.4, asitTestOrani=0.9,
+                besYillikfcf=[100.0, 110.0, 121.0, 133.1, 146.4])
+    return veri
+
+
+@pytest.fixture
+def cizimler(monkeypatch):
+    """Grafik önbelleğini boşaltır ve seri çizimde hangi grafiklerin çizildiğini kaydeder"""
+    monkeypatch.setattr(charts, "_grafik_onbellegi", LRUCache(max_entries=256, max_bytes=64 * 1024 * 1024))
+    cizilenler = []
+    for ad, fonksiyon in list(charts.GRAFIKLER.items()):
+        def sayan(veri, ad=ad, fonksiyon=fonksiyon):
+            cizilenler.append(ad)
+            return fonksiyon(veri)
+        monkeypatch.setitem(charts.GRAFIKLER, ad, sayan)
+    return cizilenler
+
+
+def test_ayni_girdiler_onbellekten_gelir(veri, cizimler):
+    ilk = grafikleri_ciz(ADLAR, veri, paralel=False)
+    assert sorted(cizimler) == sorted(ADLAR)
+    assert all(baytlar.startswith(b"\x89PNG") and hata is None for baytlar, hata in ilk.values())
+
+    # Aynı değerler yeni bir anlık görüntüde de (numpy skaleri dahil) isabet eder
+    kopya = dict(veri, fk=np.float64(8.5), besYillikfcf=list(veri['besYillikfcf']))
+    ikinci = grafikleri_ciz(ADLAR, kopya, paralel=False)
+    assert sorted(cizimler) == sorted(ADLAR)
+    assert ikinci == ilk
+    assert charts.grafik_onbellek_istatistikleri()["hits"] == len(ADLAR)
+
+
+@pytest.mark.parametrize("degisiklik, yeniden_cizilen", [
+    ({"veri": {"fk": 9.0}}, ["carpanlar"]),
+    ({"veri": {"besYillikfcf": [100.0, 110.0, 121.0, 133.1, 150.0]}}, ["fcf"]),
+    ({"bicim": "svg"}, ADLAR),
+    ({"dpi": 72}, ADLAR),
+    ({"stil_surumu": True}, ADLAR),
+], ids=["girdi", "liste_girdisi", "bicim", "dpi", "stil_surumu"])
+def test_degisen_ayar_onbellekte_iskalar(veri, cizimler, monkeypatch, degisiklik, yeniden_cizilen):
+    grafikleri_ciz(ADLAR, veri, paralel=False)
+    cizimler.clear()
+
+    if degisiklik.get("stil_surumu"):
+        monkeypatch.setattr(charts, "GRAFIK_STIL_SURUMU", charts.GRAFIK_STIL_SURUMU + 1)
+    sonuc = grafikleri_ciz(ADLAR, dict(veri, **degisiklik.get("veri", {})),
+                           dpi=degisiklik.get("dpi", 120), bicim=degisiklik.get("bicim", "png"), paralel=False)
+
+    assert sorted(cizimler) == sorted(yeniden_cizilen)
+    assert all(hata is None for _, hata in sonuc.values())
+    if degisiklik.get("bicim") == "svg":
+        assert all(baytlar.lstrip().startswith(b"<?xml") for baytlar, _ in sonuc.values())
+
+
+def test_hatali_grafik_digerlerini_dusurmez_ve_onbellege_alinmaz(veri, cizimler, monkeypatch):
+    def bozuk(veri):
+        cizimler.append("likidite")
+        raise ValueError("çizim başarısız")
+    monkeypatch.setitem(charts.GRAFIKLER, "likidite", bozuk)
+
+    sonuc = grafikleri_ciz(ADLAR, veri, paralel=False)
+    assert list(sonuc) == ADLAR
+    assert sonuc["likidite"] == (None, "çizim başarısız")
+    assert sonuc["carpanlar"][0].startswith(b"\x89PNG") and sonuc["fcf"][0].startswith(b"\x89PNG")
+
+    # Hata önbelleğe alınmadığından bir sonraki çalıştırmada yeniden denenir
+    cizimler.clear()
+    grafikleri_ciz(ADLAR, veri, paralel=False)
+    assert cizimler == ["likidite"]
+
+
+def test_havuzda_hatali_grafik_digerlerini_dusurmez(veri, monkeypatch):
+    monkeypatch.setattr(charts, "_grafik_onbellegi", LRUCache(max_entries=256, max_bytes=64 * 1024 * 1024))
+    monkeypatch.setattr(charts, "_havuz", None)
+    # Eksik ızgara ekseni çizim sürecinde KeyError verir
+    veri = dict(veri, duyarlilik={"wacc": [0.10, 0.12], "firma_degeri": [[1.0, 2.0], [3.0, 4.0]]})
+    try:
+        sonuc = grafikleri_ciz(["carpanlar", "duyarlilik", "fcf"], veri, paralel=True)
+    finally:
+        if charts._havuz is not None:
+            charts._havuz.shutdown()
+
+    assert sonuc["duyarlilik"] == (None, "'buyume'")
+    assert sonuc["carpanlar"][0].startswith(b"\x89PNG") and sonuc["fcf"][0].startswith(b"\x89PNG")
+
+
+DUYARLILIK = {"wacc": [0.10, 0.12, 0.14], "buyume": [0.02, 0.03],
+              "firma_degeri": [[120.0, 130.0], [100.0, 108.0], [85.0, 90.0]], "secili": (0.12, 0.03)}
+
+
+def test_rapor_goruntuleri_raster_grafikleri_png_birakir(veri, cizimler):
+    assert "duyarlilik" in RASTER_GRAFIKLER
+    veri = dict(veri, duyarlilik=DUYARLILIK)
+
+    vektorel = rapor_goruntuleri(["carpanlar", "duyarlilik"], veri, vektorel=True)
+    svg, yedek = vektorel["carpanlar"]
+    assert svg.lstrip().startswith(b"<?xml") and yedek.startswith(b"\x89PNG")
+    png, yedek = vektorel["duyarlilik"]
+    assert png.startswith(b"\x89PNG") and yedek is None
+
+    raster = rapor_goruntuleri(["carpanlar", "duyarlilik"], veri, vektorel=False)
+    assert all(goruntu.startswith(b"\x89PNG") and yedek is None for goruntu, yedek in raster.values())
+
+
+def test_rapor_goruntuleri_iki_bicimi_de_onbellekten_alir(veri, cizimler):
+    veri = dict(veri, duyarlilik=DUYARLILIK)
+    adlar = ["carpanlar", "fcf", "duyarlilik"]
+
+    ilk = rapor_goruntuleri(adlar, veri, vektorel=True)
+    # PNG üçü için, SVG raster olmayan ikisi için çizilir
+    assert sorted(cizimler) == sorted(adlar + ["carpanlar", "fcf"])
+
+    cizimler.clear()
+    assert rapor_goruntuleri(adlar, veri, vektorel=True) == ilk
+    assert rapor_goruntuleri(adlar, veri, vektorel=False) == {ad: (ilk[ad][1] or ilk[ad][0], None) for ad in adlar}
+    assert cizimler == []
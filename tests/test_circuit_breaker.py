@@ -0,0 +1,109 @@
+import pytest
+
+from modules import circuit_breaker
+from modules.circuit_breaker import ACIK, KAPALI, YARI_ACIK, DevreAcikHatasi, DevreKesici
+from modules.lot_cache import LotOnbellegi
+
+
+class _Saat:
+    def __init__(self):
+        self.simdi = 1000.0
+
+    def __call__(self):
+        return self.simdi
+
+
+@pytest.fixture
+def saat(monkeypatch):
+    s = _Saat()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", s)
+    return s
+
+
+def test_kapali_acik_yari_acik_kapali(saat):
+    kesici = DevreKesici("ornek", esik=2, ilk_bekleme=30)
+    kesici.izin_ver()
+    kesici.basarisiz(OSError("1"))
+    assert kesici.durum()["durum"] == KAPALI
+    kesici.izin_ver()
+    kesici.basarisiz(OSError("2"))
+    assert kesici.durum()["durum"] == ACIK and kesici.acik
+
+    saat.simdi += 10
+    with pytest.raises(DevreAcikHatasi) as hata:
+        kesici.izin_ver()
+    assert hata.value.kalan_sure == pytest.approx(20) and hata.value.son_hata == "2"
+
+    saat.simdi += 20
+    kesici.izin_ver()  # deneme çağrısı
+    assert kesici.durum()["durum"] == YARI_ACIK
+    kesici.basarili()
+    assert kesici.durum() == {"durum": KAPALI, "hata_sayisi": 0, "kalan_sure": 0.0, "son_hata": None}
+
+
+def test_basarisiz_deneme_beklemeyi_buyutur(saat):
+    kesici = DevreKesici("ornek", esik=1, ilk_bekleme=30, en_fazla_bekleme=100, carpan=2)
+    kesici.basarisiz()
+    for beklenen in (60, 100, 100):
+        saat.simdi += kesici.durum()["kalan_sure"]
+        kesici.izin_ver()
+        kesici.basarisiz()
+        assert kesici.durum()["durum"] == ACIK
+        assert kesici.durum()["kalan_sure"] == pytest.approx(beklenen)
+
+
+def test_deneme_surerken_bekleme_sifirdan_buyuk(saat):
+    kesici = DevreKesici("ornek", esik=1, ilk_bekleme=30, deneme_zaman_asimi=60)
+    kesici.basarisiz()
+    saat.simdi += 30
+    kesici.izin_ver()
+    saat.simdi += 5
+    with pytest.raises(DevreAcikHatasi) as hata:
+        kesici.izin_ver()
+    assert hata.value.kalan_sure == pytest.approx(55)
+    assert "55 sn" in str(hata.value)
+
+    # Sonuçlanmayan deneme zaman aşımından sonra yenisine yer açar
+    saat.simdi += 55
+    kesici.izin_ver()
+    assert kesici.durum()["durum"] == YARI_ACIK
+
+
+def test_vazgecilen_deneme_hemen_tekrarlanabilir(saat):
+    kesici = DevreKesici("ornek", esik=1, ilk_bekleme=30)
+    kesici.basarisiz()
+    saat.simdi += 30
+    kesici.izin_ver()
+    kesici.vazgec()
+    kesici.izin_ver()
+
+
+class _HataliOturum:
+    def __init__(self, hata):
+        self.hata = hata
+
+    def get(self, *args, **kwargs):
+        raise self.hata
+
+
+class _Kesinti(BaseException):
+    pass
+
+
+@pytest.mark.parametrize("hata, beklenen_hata_sayisi", [(ValueError("bozuk yanıt"), 1), (_Kesinti(), 0)])
+def test_lot_cekimi_denemeyi_her_durumda_sonuclandirir(saat, hata, beklenen_hata_sayisi):
+    sunucu = f"lot-{beklenen_hata_sayisi}.example"
+    kesici = circuit_breaker._kesiciler[sunucu] = DevreKesici(sunucu, esik=1, ilk_bekleme=30)
+    try:
+        kesici.basarisiz()
+        saat.simdi += 30
+        onbellek = LotOnbellegi(dizin=None, session=_HataliOturum(hata))
+        with pytest.raises(type(hata)):
+            onbellek._cek(f"https://{sunucu}/lot")
+        assert kesici.durum()["hata_sayisi"] == 1 + beklenen_hata_sayisi
+        if beklenen_hata_sayisi:
+            assert kesici.durum()["durum"] == ACIK
+        else:
+            kesici.izin_ver()  # kesilen deneme takılı kalmaz
+    finally:
+        circuit_breaker._kesiciler.pop(sunucu, None)
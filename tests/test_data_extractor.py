@@ -0,0 +1,107 @@
+import datetime
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from modules.data_extractor import extract_tables_from_excel, parse_numeric_table
+
+
+def _calisma_kitabi(*sayfalar) -> io.BytesIO:
+    wb = Workbook()
+    wb.remove(wb.active)
+    for ad, satirlar in sayfalar:
+        ws = wb.create_sheet(ad)
+        for satir in satirlar:
+            ws.append(satir)
+    dosya = io.BytesIO()
+    wb.save(dosya)
+    dosya.seek(0)
+    return dosya
+
+
+def test_tarih_basliklari_gun_ay_yil_metni_olur():
+    dosya = _calisma_kitabi((
+        "Bilanço",
+        [
+            ["Kalem", datetime.datetime(2023, 12, 31), datetime.datetime(2024, 12, 31)],
+            ["Dönen Varlıklar", 100.0, 150.0],
+        ],
+    ))
+    tablo = extract_tables_from_excel(dosya)[0]
+    assert tablo.columns.tolist() == ["Kalem", "31.12.2023", "31.12.2024"]
+    assert tablo.iloc[0, 2] == 150
+
+
+def test_sayi_ve_bos_basliklar_metin_olur():
+    dosya = _calisma_kitabi((
+        "Gelir",
+        [
+            ["Kalem", 2023, 2024.0, None, 2024],
+            ["Hasılat", 1, 2, 3, 4],
+        ],
+    ))
+    tablo = extract_tables_from_excel(dosya)[0]
+    assert tablo.columns.tolist() == ["Kalem", "2023", "2024", "Unnamed: 3", "2024.1"]
+    # main.py dönem sütunlarını başlık metni üzerinden arar
+    assert all(isinstance(col, str) for col in tablo.columns)
+
+
+# (hücre, beklenen değer (None = NaN), ayrıştırma hatası mı)
+HUCRELER = [
+    ("(1.234)", -1234.0, False),
+    ("(1.234,5)", -1234.5, False),
+    ("-5", -5.0, False),
+    ("1.234,56", 1234.56, False),
+    ("1.234.567", 1234567.0, False),
+    ("12,5", 12.5, False),
+    (" 7 ", 7.0, False),
+    ("0", 0.0, False),
+    ("-", None, False),
+    ("–", None, False),
+    ("—", None, False),
+    ("", None, False),
+    (None, None, False),
+    ("abc", None, True),
+    ("%12", None, True),
+    ("12a", None, True),
+    ("()", None, True),
+    ("1,2,3", None, True),
+]
+
+
+@pytest.mark.parametrize("hucre, beklenen, hatali", HUCRELER, ids=[repr(h[0]) for h in HUCRELER])
+def test_parse_numeric_table_hucre(hucre, beklenen, hatali):
+    numeric, parse_failed = parse_numeric_table(pd.DataFrame({"2024": [hucre]}))
+    deger = numeric.iloc[0, 0]
+    if beklenen is None:
+        assert np.isnan(deger)
+    else:
+        assert deger == beklenen
+    assert parse_failed.iloc[0, 0] == hatali
+
+
+def test_parse_numeric_table_tablo_bicimi_ve_maske():
+    df = pd.DataFrame(
+        [["Hasılat", "1.250.000", "(35.000)"], ["Amortisman", "-", "12,75"], ["Not", "bkz. 4", ""]],
+        columns=["Kalem", "2023", "2024"], index=[10, 11, 12],
+    )
+    numeric, parse_failed = parse_numeric_table(df)
+
+    assert numeric.dtypes.eq(np.float64).all()
+    assert numeric.index.tolist() == [10, 11, 12] and numeric.columns.equals(df.columns)
+    assert numeric[["2023", "2024"]].fillna(-1).values.tolist() == [[1250000.0, -35000.0], [-1, 12.75], [-1, -1]]
+    assert parse_failed.values.tolist() == [[True, False, False], [True, False, False], [True, True, False]]
+
+
+def test_parse_numeric_table_excel_sayilari_oldugu_gibi_kalir():
+    # Excel'den gelen sütunlarda metin ve sayı karışıktır; sayılar yeniden ayrıştırılmaz
+    df = pd.DataFrame({"Kalem": ["Hasılat", "Gider"], "2024": [1234.5, "(1.000)"], "2025": [np.nan, 7]},
+                      dtype=object)
+    numeric, parse_failed = parse_numeric_table(df)
+
+    assert numeric["2024"].tolist() == [1234.5, -1000.0]
+    assert np.isnan(numeric.loc[0, "2025"]) and numeric.loc[1, "2025"] == 7.0
+    assert parse_failed.values.tolist() == [[True, False, False], [True, False, False]]
@@ -0,0 +1,76 @@
+import math
+
+import numpy as np
+import pytest
+
+from modules.dcf_model import bes_yillik_fcf, bes_yillik_indirgeme, duyarlilik_izgarasi, terminal_degeri, toplu_dcf
+
+FAALIYET_KARI = [1000.0, 1100.0, 1210.0, 1331.0, 1464.1]
+AMORTISMAN = [100.0] * 5
+ODENEN_VERGI = [200.0, 220.0, 242.0, 266.2, 292.82]
+DELTA_NWC = [50.0, 55.0, 60.0, 65.0, 70.0]
+CAPEX = [150.0, 160.0, 170.0, 180.0, 190.0]
+INDIRGEME = [89.93, 80.88, 72.74, 65.42, 58.84]  # sayfadaki gibi % olarak
+
+
+def test_toplu_dcf_skaler_fonksiyonlarla_ayni():
+    wacc, buyume, net_borc = 0.1318, 0.025, 500.0
+    fcf_listesi = bes_yillik_fcf(FAALIYET_KARI, AMORTISMAN, ODENEN_VERGI, DELTA_NWC, CAPEX)
+    indirgenmis = bes_yillik_indirgeme(fcf_listesi, INDIRGEME)
+    terminal = terminal_degeri(fcf_listesi, buyume, wacc)
+
+    sonuc = toplu_dcf(FAALIYET_KARI, AMORTISMAN, ODENEN_VERGI, DELTA_NWC, CAPEX, wacc, buyume,
+                      indirgeme_degerleri=INDIRGEME, net_borc=net_borc)
+
+    np.testing.assert_allclose(sonuc["fcf"], fcf_listesi)
+    # bes_yillik_indirgeme kuruşa yuvarlar
+    np.testing.assert_allclose(sonuc["indirgenmis_fcf"], indirgenmis, atol=0.005)
+    assert sonuc["terminal_deger"] == pytest.approx(terminal)
+    assert sonuc["sirket_degeri"] == pytest.approx(sum(indirgenmis) + terminal, abs=0.03)
+    assert sonuc["firma_degeri"] == pytest.approx(sonuc["sirket_degeri"] - net_borc)
+
+
+def test_sirket_ve_senaryo_eksenleri():
+    # 2 şirket x 3 senaryo; senaryolar yalnızca WACC'ta farklı
+    faaliyet_kari = np.array([FAALIYET_KARI, np.multiply(FAALIYET_KARI, 2)])[:, np.newaxis, :]
+    wacc = np.array([0.10, 0.12, 0.02])
+    sonuc = toplu_dcf(faaliyet_kari, AMORTISMAN, ODENEN_VERGI, DELTA_NWC, CAPEX, wacc, 0.025)
+    assert sonuc["firma_degeri"].shape == (2, 3)
+
+    for s, kar in enumerate([FAALIYET_KARI, list(np.multiply(FAALIYET_KARI, 2))]):
+        fcf_listesi = bes_yillik_fcf(kar, AMORTISMAN, ODENEN_VERGI, DELTA_NWC, CAPEX)
+        for w in range(2):
+            katsayilar = [(1 + wacc[w]) ** -t for t in range(1, 6)]
+            beklenen = (sum(f * k for f, k in zip(fcf_listesi, katsayilar))
+                        + terminal_degeri(fcf_listesi, 0.025, wacc[w]))
+            assert sonuc["firma_degeri"][s, w] == pytest.approx(beklenen)
+
+    # WACC <= g: skaler fonksiyon hata verir, toplu hesap NaN döndürür
+    with pytest.raises(ValueError):
+        terminal_degeri(fcf_listesi, 0.025, 0.02)
+    assert math.isnan(sonuc["firma_degeri"][0, 2]) and math.isnan(sonuc["terminal_deger"][1, 2])
+
+
+def test_duyarlilik_izgarasi_hucre_hucre_toplu_dcf_ile_ayni():
+    fcf_listesi = bes_yillik_fcf(FAALIYET_KARI, AMORTISMAN, ODENEN_VERGI, DELTA_NWC, CAPEX)
+    wacc_degerleri = [0.02, 0.11, 0.13]
+    buyume_degerleri = [0.01, 0.025]
+    farklar = [-100.0, 0.0, 100.0]
+    izgara = duyarlilik_izgarasi(fcf_listesi, wacc_degerleri, buyume_degerleri, indirgeme_degerleri=INDIRGEME,
+                                 net_borc=500.0, ilk_yil_farklari=farklar)
+    assert izgara["firma_degeri"].shape == (3, 3, 2)
+
+    for k, fark in enumerate(farklar):
+        fcf_k = [fcf_listesi[0] + fark] + fcf_listesi[1:]
+        for w, wacc in enumerate(wacc_degerleri):
+            for g, buyume in enumerate(buyume_degerleri):
+                hucre = toplu_dcf(fcf_k, 0, 0, 0, 0, wacc, buyume, indirgeme_degerleri=INDIRGEME, net_borc=500.0)
+                np.testing.assert_allclose(izgara["firma_degeri"][k, w, g], hucre["firma_degeri"])
+                np.testing.assert_allclose(izgara["terminal_deger"][k, w, g], hucre["terminal_deger"])
+
+    # Farksız ızgara (W x G); yalnızca WACC 0.02 <= g 0.025 hücresi NaN
+    duz = duyarlilik_izgarasi(fcf_listesi, wacc_degerleri[:2], buyume_degerleri)
+    assert duz["firma_degeri"].shape == (2, 2)
+    np.testing.assert_array_equal(np.isnan(duz["firma_degeri"]), [[False, True], [False, False]])
+    with pytest.raises(ValueError):
+        duyarlilik_izgarasi([], wacc_degerleri, buyume_degerleri)
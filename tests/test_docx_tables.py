@@ -0,0 +1,106 @@
+import io
+
+import pandas as pd
+import pytest
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from modules.data_extractor import _extract_tables_with_python_docx, iter_tables_from_docx_bytes
+
+
+def _izgara_tablosu(doc, satir, sutun):
+    """Hücreleri 'satır sütun' metinleriyle doldurulmuş tablo"""
+    tablo = doc.add_table(rows=satir, cols=sutun)
+    for i, row in enumerate(tablo.rows):
+        for j, hucre in enumerate(row.cells):
+            hucre.text = f"{i}{j}"
+    return tablo
+
+
+def _grid_before(tablo, satir, adet):
+    """Satırın ilk adet hücresini silip yerine w:gridBefore yazar"""
+    tr = tablo.rows[satir]._tr
+    eleman = OxmlElement("w:gridBefore")
+    eleman.set(qn("w:val"), str(adet))
+    tr.get_or_add_trPr().insert(0, eleman)
+    for tc in tr.tc_lst[:adet]:
+        tr.remove(tc)
+
+
+def _kaydet(doc) -> bytes:
+    dosya = io.BytesIO()
+    doc.save(dosya)
+    return dosya.getvalue()
+
+
+def _yatay_birlesik(doc):
+    tablo = _izgara_tablosu(doc, 3, 4)
+    tablo.cell(0, 1).merge(tablo.cell(0, 2))  # gridSpan=2 başlık
+    tablo.cell(2, 0).merge(tablo.cell(2, 3))  # tüm satır tek hücre
+
+
+def _dikey_birlesik(doc):
+    tablo = _izgara_tablosu(doc, 4, 3)
+    tablo.cell(1, 0).merge(tablo.cell(3, 0))  # vMerge restart + continue
+    tablo.cell(1, 1).merge(tablo.cell(2, 2))  # gridSpan ve vMerge birlikte
+
+
+def _grid_before_ile(doc):
+    tablo = _izgara_tablosu(doc, 4, 3)
+    tablo.cell(2, 2).merge(tablo.cell(3, 2))
+    # Birleşik hücrenin ızgara konumu gridBefore'dan sonra da korunmalı
+    _grid_before(tablo, 2, 1)
+    _grid_before(tablo, 3, 2)
+
+
+def _ic_ice(doc):
+    dis = _izgara_tablosu(doc, 2, 2)
+    ic = dis.cell(1, 1).add_table(rows=2, cols=2)
+    ic.cell(0, 0).text = "iç tablo"
+    doc.add_paragraph("Tablolar arası paragraf")
+    _izgara_tablosu(doc, 2, 3)
+
+
+@pytest.mark.parametrize("kur", [_yatay_birlesik, _dikey_birlesik, _grid_before_ile, _ic_ice],
+                         ids=["gridSpan", "vMerge", "gridBefore", "ic_ice"])
+def test_python_docx_ile_ayni_tablolar(kur):
+    doc = Document()
+    doc.add_paragraph("Finansal Tablolar")
+    kur(doc)
+    dosya = _kaydet(doc)
+
+    beklenen = _extract_tables_with_python_docx(dosya)
+    tablolar = list(iter_tables_from_docx_bytes(dosya))
+
+    assert len(tablolar) == len(beklenen)
+    for tablo, referans in zip(tablolar, beklenen):
+        pd.testing.assert_frame_equal(tablo, referans)
+
+
+def test_birlesik_hucreler_ve_ic_ice_tablo_degerleri():
+    doc = Document()
+    _dikey_birlesik(doc)
+    _ic_ice(doc)
+    dikey, dis, sonraki = iter_tables_from_docx_bytes(_kaydet(doc))
+
+    assert dikey.columns.tolist() == ["00", "01", "02"]
+    assert dikey.values.tolist() == [
+        ["10\n20\n30", "11\n12\n21\n22", "11\n12\n21\n22"],
+        ["10\n20\n30", "11\n12\n21\n22", "11\n12\n21\n22"],
+        ["10\n20\n30", "31", "32"],
+    ]
+    # İç tablo ayrı tablo olarak üretilmez, metni dış hücreye karışmaz
+    assert dis.values.tolist() == [["10", "11"]]
+    assert sonraki.columns.tolist() == ["00", "01", "02"]
+
+
+def test_grid_before_sonrasi_birlesik_hucre_konumu():
+    doc = Document()
+    _grid_before_ile(doc)
+    tablo, = iter_tables_from_docx_bytes(_kaydet(doc))
+
+    # gridBefore satırlarında hücreler sola kayar; devam hücresi ızgara konumu 2'yi izler
+    assert tablo.iloc[1].tolist()[:2] == ["21", "22\n32"]
+    assert tablo.iloc[2].tolist()[0] == "22\n32"
+    assert tablo.iloc[1:, 2].isna().all()
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.data_extractor import parse_numeric_table
+from modules.financial_statement import FinancialStatement
+
+DONEMLER = ["31.12.2023", "31.12.2024"]
+
+
+@pytest.fixture
+def tablo_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Kalem": ["Nakit", "Stoklar", "Ticari Alacaklar", "Stoklar", "Diğer"],
+        "31.12.2023": ["1.234,5", "200", "(50)", "999", ""],
+        "31.12.2024": ["2.000", "250,25", "75", "999", "-"],
+    })
+
+
+def _dataframe_ile(df: pd.DataFrame, kalem: str, donem: str) -> float:
+    # Tablo taramasıyla eski erişim: ilk eşleşen satır
+    numeric, _ = parse_numeric_table(df)
+    return numeric[df.iloc[:, 0] == kalem][donem].values[0]
+
+
+def test_get_dataframe_aramasi_ile_ayni(tablo_df):
+    tablo = FinancialStatement.from_dataframe(tablo_df)
+    for kalem in ["Nakit", "Stoklar", "Ticari Alacaklar"]:
+        for donem in DONEMLER:
+            assert tablo.get(kalem, donem) == pytest.approx(_dataframe_ile(tablo_df, kalem, donem))
+    assert tablo.get("Stoklar", "31.12.2024") == pytest.approx(250.25)
+    assert tablo.get("Ticari Alacaklar", "31.12.2023") == pytest.approx(-50)
+
+
+def test_get_many_matrisi(tablo_df):
+    tablo = FinancialStatement.from_dataframe(tablo_df)
+    kalemler = ["Ticari Alacaklar", "Nakit"]
+    beklenen = [[_dataframe_ile(tablo_df, k, d) for d in reversed(DONEMLER)] for k in kalemler]
+    np.testing.assert_allclose(tablo.get_many(kalemler, list(reversed(DONEMLER))), beklenen)
+
+
+def test_bos_hucreler_doldurulur_ve_isaretlenir(tablo_df):
+    tablo = FinancialStatement.from_dataframe(tablo_df)
+    assert tablo.get("Diğer", "31.12.2023") == 0.0 and tablo.is_blank("Diğer", "31.12.2023")
+    assert not tablo.is_blank("Nakit", "31.12.2023")
+    assert math.isnan(FinancialStatement.from_dataframe(tablo_df, fill_value=None).get("Diğer", "31.12.2024"))
+
+
+def test_eksik_kalem_ve_donem(tablo_df):
+    tablo = FinancialStatement.from_dataframe(tablo_df)
+    assert tablo.missing(["Nakit", "Özkaynaklar", "Stoklar", "Krediler"]) == ["Özkaynaklar", "Krediler"]
+    assert "Nakit" in tablo and tablo.has_period("31.12.2024") and not tablo.has_period("31.12.2022")
+    with pytest.raises(KeyError, match="Kalem bulunamadı"):
+        tablo.get("Özkaynaklar", "31.12.2024")
+    with pytest.raises(KeyError, match="Dönem bulunamadı"):
+        tablo.get_many(["Nakit"], ["31.12.2022"])
@@ -0,0 +1,115 @@
+import os
+import time
+
+import pytest
+import requests
+
+from conftest import veri_dosyasi
+from modules.lot_cache import LotOnbellegi
+
+LOTLAR = (12_500_000, 2_500_000)
+BAKIM_SAYFASI = b"<html><body>Bak\xc4\xb1m \xc3\xa7al\xc4\xb1\xc5\x9fmas\xc4\xb1</body></html>"
+
+
+@pytest.fixture
+def oturum():
+    with requests.Session() as s:
+        yield s
+
+
+@pytest.fixture
+def lot_sayfasi(yerel_sunucu):
+    yerel_sunucu.sayfalar["/lot"] = {"govde": veri_dosyasi("lot_sayfasi.html"), "etag": '"v1"'}
+    return yerel_sunucu.url("/lot")
+
+
+def _yenilemeyi_bekle(onbellek: LotOnbellegi, url: str):
+    bitis = time.monotonic() + 5
+    while url in onbellek._yenilenenler:
+        assert time.monotonic() < bitis, "arka plan yenilemesi bitmedi"
+        time.sleep(0.01)
+
+
+def _eskit(onbellek: LotOnbellegi, url: str, sure: float):
+    onbellek._bellek[url]["zaman"] -= sure
+
+
+def test_taze_kayit_aga_gitmez(yerel_sunucu, lot_sayfasi, oturum, tmp_path):
+    onbellek = LotOnbellegi(dizin=str(tmp_path), ttl=60, session=oturum)
+    assert onbellek.getir(lot_sayfasi) == LOTLAR
+    assert onbellek.getir(lot_sayfasi) == LOTLAR
+    assert len(yerel_sunucu.istekler) == 1
+
+
+def test_suresi_gecen_kayit_hemen_doner_ve_304_ile_yenilenir(yerel_sunucu, lot_sayfasi, oturum):
+    onbellek = LotOnbellegi(dizin=None, ttl=60, session=oturum)
+    onbellek.getir(lot_sayfasi)
+    _eskit(onbellek, lot_sayfasi, 61)
+    eski_zaman = onbellek._bellek[lot_sayfasi]["zaman"]
+
+    assert onbellek.getir(lot_sayfasi) == LOTLAR  # beklemeden eski değer
+    _yenilemeyi_bekle(onbellek, lot_sayfasi)
+
+    yol, basliklar, durum = yerel_sunucu.istekler[-1]
+    assert basliklar.get("If-None-Match") == '"v1"' and durum == 304
+    assert onbellek._bellek[lot_sayfasi]["zaman"] > eski_zaman + 60
+    assert onbellek.getir(lot_sayfasi) == LOTLAR
+    assert len(yerel_sunucu.istekler) == 2
+
+
+def test_degisen_sayfa_arka_planda_guncellenir(yerel_sunucu, lot_sayfasi, oturum):
+    onbellek = LotOnbellegi(dizin=None, ttl=60, session=oturum)
+    onbellek.getir(lot_sayfasi)
+    yerel_sunucu.sayfalar["/lot"] = {
+        "govde": veri_dosyasi("lot_sayfasi.html").replace(b"12.500.000", b"15.000.000"), "etag": '"v2"'
+    }
+    _eskit(onbellek, lot_sayfasi, 61)
+
+    assert onbellek.getir(lot_sayfasi) == LOTLAR
+    _yenilemeyi_bekle(onbellek, lot_sayfasi)
+    assert onbellek.getir(lot_sayfasi) == (15_000_000, 2_500_000)
+    assert onbellek._bellek[lot_sayfasi]["etag"] == '"v2"'
+
+
+def test_yeni_surec_diskten_okur(yerel_sunucu, lot_sayfasi, oturum, tmp_path):
+    LotOnbellegi(dizin=str(tmp_path), ttl=60, session=oturum).getir(lot_sayfasi)
+    assert [ad for ad in os.listdir(tmp_path) if ad.endswith(".tmp")] == []
+
+    yeni = LotOnbellegi(dizin=str(tmp_path), ttl=60, session=oturum)
+    assert yeni.getir(lot_sayfasi) == LOTLAR
+    assert len(yerel_sunucu.istekler) == 1
+
+
+def test_ayristirilamayan_sayfa_kisa_sure_tutulur_ve_diske_yazilmaz(yerel_sunucu, oturum, tmp_path):
+    yerel_sunucu.sayfalar["/lot"] = {"govde": BAKIM_SAYFASI, "etag": '"bakim"'}
+    url = yerel_sunucu.url("/lot")
+    onbellek = LotOnbellegi(dizin=str(tmp_path), ttl=6 * 60 * 60, negatif_ttl=60, session=oturum)
+
+    assert onbellek.getir(url) == (None, None)
+    assert onbellek.getir(url) == (None, None)
+    assert len(yerel_sunucu.istekler) == 1
+    assert os.listdir(tmp_path) == []
+
+    # Negatif süre dolunca (TTL'den çok önce) koşulsuz yeniden denenir
+    yerel_sunucu.sayfalar["/lot"] = {"govde": veri_dosyasi("lot_sayfasi.html"), "etag": '"v1"'}
+    _eskit(onbellek, url, 61)
+    onbellek.getir(url)
+    _yenilemeyi_bekle(onbellek, url)
+    assert "If-None-Match" not in yerel_sunucu.istekler[-1][1]
+    assert onbellek.getir(url) == LOTLAR
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_ayristirilamayan_sayfa_gecerli_kaydi_ezmez(yerel_sunucu, lot_sayfasi, oturum, tmp_path):
+    onbellek = LotOnbellegi(dizin=str(tmp_path), ttl=60, negatif_ttl=30, session=oturum)
+    onbellek.getir(lot_sayfasi)
+    yerel_sunucu.sayfalar["/lot"] = {"govde": BAKIM_SAYFASI, "etag": '"bakim"'}
+    _eskit(onbellek, lot_sayfasi, 61)
+
+    onbellek.getir(lot_sayfasi)
+    _yenilemeyi_bekle(onbellek, lot_sayfasi)
+    assert onbellek.getir(lot_sayfasi) == LOTLAR
+    assert len(yerel_sunucu.istekler) == 2  # negatif süre içinde yeniden denenmez
+
+    # Diskteki geçerli kayıt korunur
+    assert LotOnbellegi(dizin=str(tmp_path), ttl=10**9, session=oturum).getir(lot_sayfasi) == LOTLAR
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from modules.dcf_model import toplu_dcf
+from modules.monte_carlo import monte_carlo_dcf
+
+FCF = [100.0, 110.0, 120.0]
+
+
+def test_sabit_dagilim_toplu_dcf_ile_ayni():
+    sonuc = monte_carlo_dcf(FCF, {"tur": "sabit", "deger": 0.12}, {"tur": "sabit", "deger": 0.03},
+                            net_borc=50.0, cekilis_sayisi=10, parca_boyutu=3)
+    beklenen = toplu_dcf(FCF, 0, 0, 0, 0, 0.12, 0.03, net_borc=50.0)["firma_degeri"]
+    np.testing.assert_allclose(sonuc["degerler"], beklenen)
+    assert sonuc["gecersiz_oran"] == 0
+    assert sonuc["piyasa_degerini_asma_olasiligi"] is None
+
+
+def test_parcalama_sonucu_degistirmez():
+    # Yalnızca WACC örneklendiğinde çekiliş dizisi parça boyutundan bağımsızdır
+    ortak = dict(wacc_dagilimi={"tur": "normal", "ortalama": 0.12, "std": 0.01},
+                 buyume_dagilimi={"tur": "sabit", "deger": 0.03}, cekilis_sayisi=1000, seed=7)
+    tek = monte_carlo_dcf(FCF, parca_boyutu=1000, **ortak)
+    parcali = monte_carlo_dcf(FCF, parca_boyutu=128, **ortak)
+    np.testing.assert_allclose(tek["degerler"], parcali["degerler"])
+
+
+def test_asma_olasiligi_tum_cekilisler_uzerinden():
+    # WACC'ın yaklaşık yarısı terminal büyümeden (0.03) küçük: bu çekilişler değerlenemez
+    sonuc = monte_carlo_dcf(FCF, {"tur": "uniform", "alt": 0.0, "ust": 0.10}, {"tur": "sabit", "deger": 0.03},
+                            piyasa_degeri=2000.0, cekilis_sayisi=10_000, seed=1)
+    degerler = sonuc["degerler"]
+    gecerli = np.isfinite(degerler)
+    asan = (degerler[gecerli] > 2000.0).sum()
+    assert 0.2 < sonuc["gecersiz_oran"] < 0.4
+    assert sonuc["gecersiz_oran"] == pytest.approx(1 - gecerli.mean())
+    assert sonuc["piyasa_degerini_asma_olasiligi"] == pytest.approx(asan / degerler.size)
+    assert sonuc["gecerli_cekilislerde_asma_olasiligi"] == pytest.approx(asan / gecerli.sum())
+    assert sonuc["piyasa_degerini_asma_olasiligi"] < sonuc["gecerli_cekilislerde_asma_olasiligi"]
+
+
+@pytest.mark.parametrize("parametre", [{"cekilis_sayisi": 0}, {"parca_boyutu": 0}, {"parca_boyutu": -5}])
+def test_gecersiz_boyutlar_reddedilir(parametre):
+    with pytest.raises(ValueError):
+        monte_carlo_dcf(FCF, {"tur": "sabit", "deger": 0.12}, {"tur": "sabit", "deger": 0.03}, **parametre)
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from modules import prefetch
+from modules.prefetch import onceden_getir, oturum_gorevi, sonucu_al
+
+
+class SahteGetirici:
+    """Çağrıları sayan, istenirse serbest bırakılana kadar bekleyen sahte istek"""
+
+    def __init__(self, sonuc=None, hata=None, bekle=False):
+        self.sonuc = sonuc
+        self.hata = hata
+        self.cagri_sayisi = 0
+        self.serbest = threading.Event()
+        if not bekle:
+            self.serbest.set()
+
+    def __call__(self):
+        self.cagri_sayisi += 1
+        self.serbest.wait(5)
+        if self.hata is not None:
+            raise self.hata
+        return self.sonuc
+
+
+def _bitmesini_bekle(future):
+    future.exception(timeout=5)
+    # Bitiş anını kaydeden geri çağırma Future tamamlandıktan sonra çalışır
+    bitis = time.monotonic() + 5
+    while future not in prefetch._bitis_zamanlari:
+        assert time.monotonic() < bitis
+        time.sleep(0.01)
+
+
+def test_ayni_adla_suren_gorev_paylasilir():
+    getir = SahteGetirici(sonuc=1, bekle=True)
+    ilk = onceden_getir("paylasim", getir)
+    ikinci = onceden_getir("paylasim", getir)
+    baska = onceden_getir("paylasim-baska", SahteGetirici(sonuc=2))
+    assert ikinci is ilk
+    assert baska is not ilk
+
+    getir.serbest.set()
+    assert sonucu_al(ilk, timeout=5) == 1
+    assert sonucu_al(baska, timeout=5) == 2
+    assert getir.cagri_sayisi == 1
+
+    # Biten görevin yerine yenisi başlatılır
+    ucuncu = onceden_getir("paylasim", getir)
+    assert ucuncu is not ilk
+    assert sonucu_al(ucuncu, timeout=5) == 1
+    assert getir.cagri_sayisi == 2
+
+
+def test_sonucu_al_hata_ve_zaman_asiminda_varsayilan_doner(capsys):
+    assert sonucu_al(None, varsayilan="yok") == "yok"
+
+    hatali = onceden_getir("hatali", SahteGetirici(hata=ConnectionError("bağlantı reddedildi")))
+    assert sonucu_al(hatali, timeout=5, varsayilan=(None, None)) == (None, None)
+    assert "bağlantı reddedildi" in capsys.readouterr().out
+
+    yavas = SahteGetirici(sonuc=3, bekle=True)
+    future = onceden_getir("yavas", yavas)
+    assert sonucu_al(future, timeout=0.05, varsayilan=(None, None)) == (None, None)
+    yavas.serbest.set()
+    assert sonucu_al(future, timeout=5) == 3
+
+
+@pytest.mark.parametrize("getir", [
+    SahteGetirici(sonuc=(None, None)),
+    SahteGetirici(hata=ConnectionError("sunucu yanıt vermedi")),
+], ids=["basarisiz_sonuc", "hata"])
+def test_basarisiz_gorev_her_yeniden_calistirmada_tekrarlanmaz(getir):
+    gorevler = {}
+    ilk = oturum_gorevi(gorevler, "lot-basarisiz", getir, basarisiz_sonuc=(None, None), yeniden_deneme=60)
+    _bitmesini_bekle(ilk)
+
+    for _ in range(5):
+        assert oturum_gorevi(gorevler, "lot-basarisiz", getir,
+                             basarisiz_sonuc=(None, None), yeniden_deneme=60) is ilk
+    assert getir.cagri_sayisi == 1
+
+    # Süre dolunca yeniden denenir
+    prefetch._bitis_zamanlari[ilk] -= 61
+    yeni = oturum_gorevi(gorevler, "lot-basarisiz", getir, basarisiz_sonuc=(None, None), yeniden_deneme=60)
+    assert yeni is not ilk and gorevler["lot-basarisiz"] is yeni
+    _bitmesini_bekle(yeni)
+    assert getir.cagri_sayisi == 2
+
+
+def test_basarili_veya_suren_gorev_korunur():
+    gorevler = {}
+    getir = SahteGetirici(sonuc=(100, 20), bekle=True)
+    ilk = oturum_gorevi(gorevler, "lot-basarili", getir, basarisiz_sonuc=(None, None), yeniden_deneme=0)
+    assert oturum_gorevi(gorevler, "lot-basarili", getir, basarisiz_sonuc=(None, None), yeniden_deneme=0) is ilk
+
+    getir.serbest.set()
+    _bitmesini_bekle(ilk)
+    assert oturum_gorevi(gorevler, "lot-basarili", getir, basarisiz_sonuc=(None, None), yeniden_deneme=0) is ilk
+    assert sonucu_al(gorevler["lot-basarili"]) == (100, 20)
+    assert getir.cagri_sayisi == 1
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from modules.dcf_model import toplu_dcf
+from modules.projection import PROJEKSIYON_KALEMLERI, Projeksiyon
+
+
+def _projeksiyon() -> Projeksiyon:
+    p = Projeksiyon.bos(3, indirgeme=0.9)
+    p.kalem("faaliyet_kari")[:] = [100.0, 110.0, 121.0]
+    p.kalem("amortisman")[:] = 10.0
+    p.kalem("odenen_vergi")[:] = 20.0
+    p.kalem("capex")[:] = 15.0
+    return p
+
+
+def test_satir_sayisi_dogrulanir():
+    with pytest.raises(ValueError):
+        Projeksiyon(np.zeros((3, 5)))
+
+
+def test_fcf_ve_degerleme_toplu_dcf_ile_ayni():
+    p = _projeksiyon()
+    np.testing.assert_allclose(p.fcf(), [75.0, 85.0, 96.0])
+    sonuc = p.degerle(0.12, 0.03, net_borc=50.0)
+    beklenen = toplu_dcf([100, 110, 121], 10, 20, 0, 15, 0.12, 0.03,
+                         indirgeme_degerleri=[0.9, 0.9, 0.9], net_borc=50.0)
+    assert sonuc["firma_degeri"] == pytest.approx(float(beklenen["firma_degeri"]))
+
+
+def test_iki_asamali_buyume_terminale_iner():
+    p = _projeksiyon().iki_asamali(5, terminal_buyume=0.02, wacc=0.1)
+    assert p.yil_sayisi == 5
+    faaliyet_kari = p.kalem("faaliyet_kari")
+    np.testing.assert_allclose(faaliyet_kari[:3], [100.0, 110.0, 121.0])
+    # Başlangıç büyümesi son iki yılın büyümesi (%10); 2 adımda %2'ye doğrusal iner
+    np.testing.assert_allclose(faaliyet_kari[3:], [121.0 * 1.06, 121.0 * 1.06 * 1.02])
+    np.testing.assert_allclose(p.kalem("indirgeme")[3:], [1.1 ** -4, 1.1 ** -5])
+    np.testing.assert_allclose(p.kalem("amortisman")[3:], [10.0 * 1.06, 10.0 * 1.06 * 1.02])
+
+
+def test_iki_asamali_kisaltma():
+    p = _projeksiyon().iki_asamali(2, terminal_buyume=0.02, wacc=0.1)
+    np.testing.assert_allclose(p.kalem("faaliyet_kari"), [100.0, 110.0])
+
+
+def test_tablo_gidis_donus():
+    p = _projeksiyon()
+    df = p.to_frame()
+    assert df.shape == (3, len(PROJEKSIYON_KALEMLERI))
+    assert df.iloc[0, -1] == pytest.approx(90.0)
+    df.iloc[1, 0] = None  # data_editor'de silinen hücre
+    geri = Projeksiyon.from_frame(df)
+    np.testing.assert_allclose(geri.kalem("indirgeme"), 0.9)
+    np.testing.assert_allclose(geri.kalem("faaliyet_kari"), [100.0, 0.0, 121.0])
@@ -0,0 +1,57 @@
+import math
+
+import pandas as pd
+
+from modules.financial_statement import FinancialStatement
+from modules.ratio_calculator import RatioEngine
+
+
+def _tablo(satirlar, donemler):
+    return FinancialStatement.from_dataframe(pd.DataFrame(satirlar, columns=["Kalem", *donemler]))
+
+
+def _motor(net_kar_2024="1.000"):
+    bilanco = ["31.12.2023", "31.12.2024"]
+    gelir = ["1 January - 31 December 2023", "1 January - 31 December 2024"]
+    varliklar = _tablo([
+        ["TOTAL CURRENT ASSETS", "4.000", "5.000"],
+        ["TOTAL NON CURRENT ASSETS", "6.000", "5.000"],
+        ["TOTAL ASSETS", "10.000", "10.000"],
+        ["Inventories", "1.000", "1.000"],
+        ["Trade receivables", "500", "500"],
+    ], bilanco)
+    kaynaklar = _tablo([
+        ["TOTAL CURRENT LIABILITIES", "2.000", "2.500"],
+        ["TOTAL NON CURRENT LIABILITIES", "3.000", "2.500"],
+        ["TOTAL EQUITY", "5.000", "5.000"],
+    ], bilanco)
+    gelir_tablosu = _tablo([
+        ["Revenue", "8.000", "10.000"],
+        ["Cost of sales (-)", "(4.000)", "(5.000)"],
+        ["Profit / (loss) for the period", "800", net_kar_2024],
+    ], gelir)
+    return RatioEngine(varliklar, kaynaklar, gelir_tablosu)
+
+
+def test_rasyolar_donem_bazinda_hesaplanir():
+    rasyolar = _motor().hesapla()
+    assert list(rasyolar.index) == ["31.12.2023", "31.12.2024"]
+    assert rasyolar.loc["31.12.2024", "Cari Oran"] == 2.0
+    assert rasyolar.loc["31.12.2024", "Net Kar Marjı (%)"] == 10.0
+    assert rasyolar.loc["31.12.2023", "Net Kar Marjı (%)"] == 10.0
+
+
+def test_bos_pay_hucresi_nan_olur():
+    # from_parsed varsayılanı boş hücreyi 0 ile doldurur; rasyo yine de 0 değil NaN olmalı
+    rasyolar = _motor(net_kar_2024="").hesapla()
+    assert math.isnan(rasyolar.loc["31.12.2024", "Net Kar Marjı (%)"])
+    assert math.isnan(rasyolar.loc["31.12.2024", "Öz Sermaye Karlılığı (%)"])
+    assert rasyolar.loc["31.12.2023", "Net Kar Marjı (%)"] == 10.0
+    assert rasyolar.loc["31.12.2024", "Cari Oran"] == 2.0
+
+
+def test_eksik_kalem_nan_olur():
+    motor = _motor()
+    motor.tablolar["gelir"] = None
+    rasyolar = motor.hesapla()
+    assert rasyolar["Net Kar Marjı (%)"].isna().all()
@@ -0,0 +1,67 @@
+import gc
+import threading
+import tracemalloc
+
+import numpy as np
+
+from modules import tracing
+from modules.tracing import baslat, olcum
+
+
+def test_kapali_izleyici_kayit_tutmaz():
+    izleyici = baslat(False)
+    with olcum("asama"):
+        pass
+    assert izleyici.bitir() == []
+    assert not tracemalloc.is_tracing()
+
+
+def test_ic_ice_asamalar_ve_bellek_tepesi():
+    izleyici = baslat(True, bellek=True)
+    with olcum("dis", etiket=1):
+        with olcum("ic"):
+            dizi = np.ones(1_000_000)
+            del dizi
+    kayitlar = {k["ad"]: k for k in izleyici.bitir()}
+    assert kayitlar["ic"]["ust"] == "dis" and kayitlar["ic"]["derinlik"] == 1
+    assert kayitlar["dis"]["etiket"] == 1
+    # 1e6 float64 ~ 7812 KiB; iç aşamanın tepesi dış aşamaya da yansır
+    assert kayitlar["ic"]["bellek_tepe_kib"] > 7000
+    assert kayitlar["dis"]["bellek_tepe_kib"] >= kayitlar["ic"]["bellek_tepe_kib"]
+    assert not tracemalloc.is_tracing()
+
+
+def test_bitirilmeyen_izleyici_yeni_baslatta_birakilir():
+    # Betik bitir()'e ulaşmadan kesildi (rerun / st.stop / hata), sonraki çalıştırma kapalı
+    baslat(True, bellek=True)
+    assert tracemalloc.is_tracing()
+    baslat(False)
+    assert not tracemalloc.is_tracing()
+    assert tracing._bellek_kullanicilari == 0
+
+
+def test_bitirilmeyen_izleyici_thread_bitince_birakilir():
+    def betik():
+        baslat(True, bellek=True)
+        with olcum("asama"):
+            pass
+
+    thread = threading.Thread(target=betik)
+    thread.start()
+    thread.join()
+    del thread
+    gc.collect()
+    assert not tracemalloc.is_tracing()
+    assert tracing._bellek_kullanicilari == 0
+
+
+def test_jsonl_kaydi(tmp_path):
+    dosya = tmp_path / "izleme.jsonl"
+    izleyici = baslat(True, dosya=str(dosya), bellek=False)
+    with olcum("a"):
+        pass
+    with olcum("b"):
+        pass
+    izleyici.bitir()
+    satirlar = dosya.read_text(encoding="utf-8").splitlines()
+    assert len(satirlar) == 2 and izleyici.calistirma in satirlar[0]
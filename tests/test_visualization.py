@@ -0,0 +1,122 @@
+import importlib
+import io
+import os
+import re
+import tempfile
+
+import fpdf
+import pytest
+from matplotlib.figure import Figure
+
+from modules import visualization
+
+# Alt küme fontları '/FontName /ABCDEF+DejaVuSansBook' olarak, font dosyasıyla birlikte gömülür
+ALT_KUME_FONTU = re.compile(rb"/FontName /[A-Z]{6}\+(DejaVuSans\w*)")
+
+
+def _sekil() -> Figure:
+    fig = Figure(figsize=(3, 2))
+    fig.add_subplot().bar(["F/K", "PD/DD"], [8.5, 1.2])
+    return fig
+
+
+def _png(fig: Figure) -> bytes:
+    tampon = io.BytesIO()
+    fig.savefig(tampon, format="png")
+    return tampon.getvalue()
+
+
+def _gorsel_sayisi(pdf: bytes) -> int:
+    # PNG'ler görüntü nesnesi olarak gömülür; SVG ise çizim komutlarına dönüşür
+    return pdf.count(b"/Subtype /Image")
+
+
+def _gomulu_fontlar(pdf: bytes):
+    assert pdf.count(b"/FontFile2") == 2
+    return sorted(ALT_KUME_FONTU.findall(pdf))
+
+
+def test_onbellekli_font_iki_raporda_da_gomulur(monkeypatch):
+    monkeypatch.setattr(visualization, "_font_onbellegi", {})
+    monkeypatch.setattr(visualization, "_FONT_KOPYALAMA", True)
+    eklenen = []
+    monkeypatch.setattr(fpdf.FPDF, "add_font", lambda self, *a, **k: eklenen.append(a))
+
+    ilk = visualization.create_pdf_report([("Çarpanlar", _sekil())])  # TTF ayrıştırılır
+    ikinci = visualization.create_pdf_report([("Çarpanlar", _sekil())])  # önbellekteki şablon kopyalanır
+
+    assert eklenen == []
+    assert len(visualization._font_onbellegi) == 2
+    for pdf in (ilk, ikinci):
+        assert pdf.startswith(b"%PDF")
+        assert _gomulu_fontlar(pdf) == [b"DejaVuSansBold", b"DejaVuSansBook"]
+    assert len(ikinci) == len(ilk)
+
+
+def test_baska_fpdf_surumunde_add_font_kullanilir(monkeypatch):
+    monkeypatch.setattr(fpdf, "FPDF_VERSION", "2.9.0")
+    try:
+        modul = importlib.reload(visualization)
+        assert modul._FONT_KOPYALAMA is False
+
+        eklenen = []
+        asil_add_font = fpdf.FPDF.add_font
+
+        def add_font(self, aile, stil="", yol=None, *args, **kwargs):
+            eklenen.append((aile, stil))
+            return asil_add_font(self, aile, stil, yol, *args, **kwargs)
+
+        monkeypatch.setattr(fpdf.FPDF, "add_font", add_font)
+        pdf = modul.create_pdf_report([("Çarpanlar", _sekil())])
+
+        assert eklenen == [("DejaVu", ""), ("DejaVu", "B")]
+        assert modul._font_onbellegi == {}
+        assert _gomulu_fontlar(pdf) == [b"DejaVuSansBold", b"DejaVuSansBook"]
+    finally:
+        monkeypatch.undo()
+        importlib.reload(visualization)
+
+
+def test_kopyalama_hatasinda_add_font_kullanilir(monkeypatch):
+    monkeypatch.setattr(visualization, "_font_onbellegi", {})
+
+    def bozuk(*args, **kwargs):
+        raise AttributeError("'TTFFont' object has no attribute 'subset'")
+
+    monkeypatch.setattr(visualization, "_font_kopyala", bozuk)
+    monkeypatch.setattr(visualization, "_FONT_KOPYALAMA", True)
+    pdf = visualization.create_pdf_report([("Çarpanlar", _sekil())])
+    assert visualization._FONT_KOPYALAMA is False
+    assert _gomulu_fontlar(pdf) == [b"DejaVuSansBold", b"DejaVuSansBook"]
+
+
+def test_rapor_gecici_dosya_kullanmadan_bellekte_uretilir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    for ad in ("mkstemp", "mkdtemp", "NamedTemporaryFile", "TemporaryFile", "SpooledTemporaryFile"):
+        monkeypatch.setattr(tempfile, ad, lambda *a, _ad=ad, **k: pytest.fail(f"tempfile.{_ad} çağrıldı"))
+
+    pdf = visualization.create_pdf_report([("Çarpanlar", _sekil()), ("Likidite", _png(_sekil()))])
+
+    assert isinstance(pdf, bytes) and pdf.startswith(b"%PDF")
+    assert pdf.rstrip().endswith(b"%%EOF")
+    assert _gorsel_sayisi(pdf) == 2
+    assert os.listdir(tmp_path) == []
+
+
+
+def test_gomulemeyen_svg_yerine_yedek_png_kullanilir(capsys):
+    svg = io.BytesIO()
+    _sekil().savefig(svg, format="svg")
+    bozuk_svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="10"><path d="M 0 0 L'
+
+    vektorel = visualization.create_pdf_report([("Çarpanlar", svg.getvalue(), _png(_sekil()))])
+    assert vektorel.startswith(b"%PDF") and _gorsel_sayisi(vektorel) == 0
+
+    yedekli = visualization.create_pdf_report([("Çarpanlar", bozuk_svg, _png(_sekil()))])
+    assert yedekli.startswith(b"%PDF") and _gorsel_sayisi(yedekli) == 1
+    assert "Çarpanlar vektörel gömülemedi, PNG kullanılıyor" in capsys.readouterr().out
+
+    # Yedek yoksa grafik atlanır, rapor yine üretilir
+    yedeksiz = visualization.create_pdf_report([("Çarpanlar", bozuk_svg)])
+    assert yedeksiz.startswith(b"%PDF") and _gorsel_sayisi(yedeksiz) == 0
@@ -0,0 +1,63 @@
+import logging
+import socket
+
+import requests
+
+from conftest import veri_dosyasi
+from modules import webScrapping
+from modules.webScrapping import fetch_hisse_lotlari, fetch_hisse_lotlari_toplu, lotlari_ayristir
+
+
+def _kapali_port_adresi() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/lot"
+
+
+def test_kayitli_sayfa_ayristirilir():
+    sayfa = veri_dosyasi("lot_sayfasi.html")
+    assert lotlari_ayristir(sayfa) == (12_500_000, 2_500_000)
+    alanlar = webScrapping._alanlar_soup(sayfa, webScrapping.LOT_KURALLARI)
+    assert (alanlar["pay_lot"], alanlar["ek_pay_lot"]) == (12_500_000, 2_500_000)
+    assert lotlari_ayristir("<html><body>bakım çalışması</body></html>") == (None, None)
+
+
+def test_toplu_cekim_basari_404_ve_reddedilen_baglanti(yerel_sunucu):
+    yerel_sunucu.sayfalar["/lot"] = {"govde": veri_dosyasi("lot_sayfasi.html")}
+    kapali = _kapali_port_adresi()
+    urls = [yerel_sunucu.url("/lot"), yerel_sunucu.url("/yok"), kapali, yerel_sunucu.url("/lot")]
+
+    with requests.Session() as oturum:
+        sonuclar = fetch_hisse_lotlari_toplu(urls, session=oturum, timeout=5)
+
+    assert list(sonuclar) == urls[:3]  # tekrarlar bir kez çekilir, sıra korunur
+    assert sonuclar[urls[0]] == (12_500_000, 2_500_000, None)
+    assert sonuclar[urls[1]].pay_lot is None and sonuclar[urls[1]].hata.startswith("HTTPError: 404")
+    assert sonuclar[kapali].pay_lot is None and sonuclar[kapali].hata.startswith("ConnectionError")
+    assert sum(yol == "/lot" for yol, _, _ in yerel_sunucu.istekler) == 1
+
+
+def test_tekli_cekim_hatada_none_doner(yerel_sunucu):
+    yerel_sunucu.sayfalar["/lot"] = {"govde": veri_dosyasi("lot_sayfasi.html")}
+    with requests.Session() as oturum:
+        assert fetch_hisse_lotlari(yerel_sunucu.url("/lot"), session=oturum) == (12_500_000, 2_500_000)
+        assert fetch_hisse_lotlari(yerel_sunucu.url("/yok"), session=oturum) == (None, None)
+    assert fetch_hisse_lotlari(_kapali_port_adresi()) == (None, None)
+
+
+def test_ortak_oturum_havuzu_host_basina_gore_buyur(yerel_sunucu, caplog):
+    # Her istek biraz beklediği için 8 bağlantı aynı anda açık kalır
+    yerel_sunucu.sayfalar.update({f"/lot{i}": {"govde": veri_dosyasi("lot_sayfasi.html"), "gecikme": 0.2}
+                                  for i in range(16)})
+    urls = [yerel_sunucu.url(f"/lot{i}") for i in range(16)]
+
+    with caplog.at_level(logging.WARNING, logger="urllib3.connectionpool"):
+        sonuclar = fetch_hisse_lotlari_toplu(urls, max_workers=8, host_basina=8, timeout=5)
+
+    assert all(sonuc.hata is None for sonuc in sonuclar.values())
+    assert "Connection pool is full" not in caplog.text
+    adaptor = webScrapping.ortak_oturum().get_adapter(yerel_sunucu.adres)
+    assert adaptor._pool_maxsize >= 8
+    # 16 istek, 8 eşzamanlı bağlantıyla karşılanır (keep-alive ile yeniden kullanılır)
+    assert len(yerel_sunucu.baglantilar) <= 8